@@ -0,0 +1,113 @@
+"""
+Startup benchmark: time and memory spent building schemas per resource.
+
+Registers synthetic resources (each with a to-one relationship to the
+first one) on an ``ApplicationBuilder`` and reports the cost of
+``add_resource`` per resource and of ``initialize``.  Run it from the
+repository root with the package importable, either through uv or with
+``src`` on the path::
+
+    uv run python benchmarks/schema_startup.py --resources 300 --fields 20
+    PYTHONPATH=src python benchmarks/schema_startup.py --resources 300 --fields 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import statistics
+import tracemalloc
+from time import perf_counter
+from typing import Annotated, Optional
+
+import django
+from django.conf import settings
+
+settings.configure(NINJA_JSONAPI={})
+django.setup()
+
+from ninja import NinjaAPI  # noqa: E402
+from pydantic import create_model  # noqa: E402
+
+from django_ninja_jsonapi.api.application_builder import ApplicationBuilder  # noqa: E402
+from django_ninja_jsonapi.generics import ViewBaseGeneric  # noqa: E402
+from django_ninja_jsonapi.schema_base import BaseModel  # noqa: E402
+from django_ninja_jsonapi.types_metadata import RelationshipInfo  # noqa: E402
+
+
+class BenchmarkView(ViewBaseGeneric):
+    pass
+
+
+def build_schemas(resources: int, fields: int) -> list[tuple[str, type[BaseModel]]]:
+    schemas = []
+    root_schema: Optional[type[BaseModel]] = None
+    for index in range(resources):
+        field_definitions = {"id": (int, ...)}
+        for field_index in range(fields):
+            field_definitions[f"field_{field_index}"] = (str if field_index % 2 else int, ...)
+        if root_schema is not None:
+            field_definitions["parent"] = (
+                Annotated[Optional[root_schema], RelationshipInfo(resource_type="resource_0")],
+                None,
+            )
+
+        schema = create_model(f"Resource{index}Schema", __base__=BaseModel, **field_definitions)
+        schemas.append((f"resource_{index}", schema))
+        root_schema = root_schema or schema
+
+    return schemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resources", type=int, default=300)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    schemas = build_schemas(args.resources, args.fields)
+    builder = ApplicationBuilder(NinjaAPI(urls_namespace="benchmark"))
+
+    gc.collect()
+    tracemalloc.start()
+    timings: list[float] = []
+    memory: list[int] = []
+    for resource_type, schema in schemas:
+        memory_before = tracemalloc.get_traced_memory()[0]
+        started_at = perf_counter()
+        builder.add_resource(
+            path=f"/{resource_type}",
+            tags=[resource_type],
+            resource_type=resource_type,
+            view=BenchmarkView,
+            model=object,
+            schema=schema,
+            schema_in_post=schema,
+            schema_in_patch=schema,
+        )
+        timings.append(perf_counter() - started_at)
+        memory.append(tracemalloc.get_traced_memory()[0] - memory_before)
+
+    started_at = perf_counter()
+    builder.initialize()
+    initialize_time = perf_counter() - started_at
+    current_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started_at = perf_counter()
+    openapi_schema = builder._api.get_openapi_schema(path_prefix="")
+    openapi_time = perf_counter() - started_at
+
+    print(f"resources: {args.resources}, attributes per resource: {args.fields}")
+    print(
+        f"add_resource: total {sum(timings):.3f}s, "
+        f"mean {statistics.mean(timings) * 1000:.2f}ms, max {max(timings) * 1000:.2f}ms per resource"
+    )
+    print(f"add_resource memory: mean {statistics.mean(memory) / 1024:.1f}KiB per resource")
+    print(f"initialize: {initialize_time:.3f}s")
+    print(f"openapi: {openapi_time:.3f}s, {len(openapi_schema['components']['schemas'])} component schemas")
+    print(f"memory: {current_memory / 1024 / 1024:.1f}MiB retained, {peak_memory / 1024 / 1024:.1f}MiB peak")
+
+
+if __name__ == "__main__":
+    main()
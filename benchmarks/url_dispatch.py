@@ -0,0 +1,123 @@
+"""
+URL dispatch benchmark: per-request cost of resolving JSON:API paths.
+
+Registers synthetic resources (each with a to-one relationship to the
+first one) and times Django's URL resolution of detail, list and
+relationship paths with the default and the ``"trie"`` dispatcher.  Run it
+from the repository root with the package importable, either through uv or
+with ``src`` on the path::
+
+    uv run python benchmarks/url_dispatch.py --resources 10 100 1000
+    PYTHONPATH=src python benchmarks/url_dispatch.py --resources 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter
+from typing import Annotated, Optional
+
+import django
+from django.conf import settings
+
+settings.configure(NINJA_JSONAPI={})
+django.setup()
+
+from django.urls.resolvers import RegexPattern, RoutePattern, URLResolver  # noqa: E402
+from ninja import NinjaAPI  # noqa: E402
+from pydantic import create_model  # noqa: E402
+
+from django_ninja_jsonapi.api.application_builder import ApplicationBuilder  # noqa: E402
+from django_ninja_jsonapi.api.dispatcher import get_trie_urls  # noqa: E402
+from django_ninja_jsonapi.generics import ViewBaseGeneric  # noqa: E402
+from django_ninja_jsonapi.schema_base import BaseModel  # noqa: E402
+from django_ninja_jsonapi.types_metadata import RelationshipInfo  # noqa: E402
+
+
+class BenchmarkView(ViewBaseGeneric):
+    pass
+
+
+def build_api(resources: int) -> NinjaAPI:
+    api = NinjaAPI(urls_namespace=f"benchmark-{resources}")
+    builder = ApplicationBuilder(api)
+    root_schema: Optional[type[BaseModel]] = None
+    for index in range(resources):
+        field_definitions = {"id": (int, ...), "name": (str, ...)}
+        if root_schema is not None:
+            field_definitions["parent"] = (
+                Annotated[Optional[root_schema], RelationshipInfo(resource_type="dispatch_0")],
+                None,
+            )
+
+        schema = create_model(f"Dispatch{index}Schema", __base__=BaseModel, **field_definitions)
+        builder.add_resource(
+            path=f"/dispatch_{index}",
+            tags=[f"dispatch_{index}"],
+            resource_type=f"dispatch_{index}",
+            view=BenchmarkView,
+            model=object,
+            schema=schema,
+            schema_in_post=schema,
+            schema_in_patch=schema,
+        )
+        root_schema = root_schema or schema
+
+    return builder.initialize()
+
+
+def build_resolver(api: NinjaAPI, url_dispatch: str) -> URLResolver:
+    patterns = get_trie_urls(api) if url_dispatch == "trie" else api._get_urls()
+    return URLResolver(RegexPattern(r"^/"), [URLResolver(RoutePattern("api/", is_endpoint=False), patterns)])
+
+
+def request_paths(resources: int, count: int) -> list[str]:
+    rng = random.Random(resources)
+    paths = []
+    for _ in range(count):
+        index = rng.randrange(1, resources) if resources > 1 else 0
+        paths.append(
+            rng.choice(
+                (
+                    f"/api/dispatch_{index}/",
+                    f"/api/dispatch_{index}/{rng.randrange(10_000)}/",
+                    f"/api/dispatch_{index}/{rng.randrange(10_000)}/relationships/parent/",
+                )
+            )
+        )
+
+    return paths
+
+
+def time_resolve(resolver: URLResolver, paths: list[str]) -> float:
+    # the first pass populates the resolver
+    for request_path in paths:
+        resolver.resolve(request_path)
+    started_at = perf_counter()
+    for request_path in paths:
+        resolver.resolve(request_path)
+    return (perf_counter() - started_at) / len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resources", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'resources':>10} {'patterns':>10} {'django':>12} {'trie':>12}")
+    for resources in args.resources:
+        paths = request_paths(resources, args.requests)
+        api = build_api(resources)
+        django_resolver = build_resolver(api, "django")
+        trie_resolver = build_resolver(api, "trie")
+        patterns = len(django_resolver.url_patterns[0].url_patterns)
+
+        django_time = time_resolve(django_resolver, paths)
+        trie_time = time_resolve(trie_resolver, paths)
+        print(f"{resources:>10} {patterns:>10} {django_time * 1e6:>10.1f}us {trie_time * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
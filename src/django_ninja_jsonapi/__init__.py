@@ -35,6 +35,7 @@ __all__ = [
     "jsonapi_resource",
     "jsonapi_response",
     "setup_jsonapi",
+    "warmup",
 ]
 
 
@@ -69,4 +70,9 @@ def __getattr__(name: str) -> Any:
 
         return setup_jsonapi
 
+    if name == "warmup":
+        from django_ninja_jsonapi.warmup import warmup
+
+        return warmup
+
     raise AttributeError(name)
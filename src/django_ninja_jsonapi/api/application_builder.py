@@ -3,12 +3,14 @@ from typing import Any, Callable, Iterable, Optional, Type
 
 from ninja import NinjaAPI, Router
 
+from django_ninja_jsonapi.api.dispatcher import get_url_dispatch, install_trie_dispatcher
 from django_ninja_jsonapi.api.endpoint_builder import EndpointsBuilder
 from django_ninja_jsonapi.api.schemas import ResourceData
 from django_ninja_jsonapi.atomic.atomic import AtomicOperations
 from django_ninja_jsonapi.data_typing import TypeModel
 from django_ninja_jsonapi.exceptions import HTTPException
 from django_ninja_jsonapi.exceptions.handlers import base_exception_handler
+from django_ninja_jsonapi.openapi import install_openapi_cache
 from django_ninja_jsonapi.renderers import JSONAPIRenderer
 from django_ninja_jsonapi.schema_base import BaseModel
 from django_ninja_jsonapi.schema_builder import SchemaBuilder
@@ -16,6 +18,8 @@ from django_ninja_jsonapi.storages.models_storage import models_storage
 from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
 from django_ninja_jsonapi.storages.views_storage import views_storage
 from django_ninja_jsonapi.views.enums import Operation
+from django_ninja_jsonapi.views.query_allowlist import get_query_allowlist
+from django_ninja_jsonapi.warmup import warmup
 
 
 class ApplicationBuilderError(Exception):
@@ -39,6 +43,7 @@ class ApplicationBuilder:
         self._exception_handler: Callable = exception_handler or base_exception_handler
         self._initialized = False
         self._api.renderer = JSONAPIRenderer()
+        install_openapi_cache(self._api)
 
     def add_resource(
         self,
@@ -118,6 +123,7 @@ class ApplicationBuilder:
         self._register_exception_handler()
 
         for resource_type, data in self._resource_data.items():
+            get_query_allowlist(data.view, data.model)
             builder = EndpointsBuilder(resource_type, data)
             router = self._routers[resource_type]
 
@@ -139,6 +145,16 @@ class ApplicationBuilder:
                     operation_id=name,
                 )(endpoint)
 
+                if operation in {Operation.GET, Operation.GET_LIST}:
+                    head_name, head_endpoint = builder.create_head_endpoint(operation)
+                    router.api_operation(
+                        ["HEAD"],
+                        path,
+                        tags=data.tags,
+                        operation_id=head_name,
+                        include_in_schema=False,
+                    )(head_endpoint)
+
             relationships_info = schemas_storage.get_relationships_info(
                 resource_type=resource_type,
                 operation_type="get",
@@ -206,6 +222,17 @@ class ApplicationBuilder:
         atomic = AtomicOperations()
         self._api.add_router("", atomic.router)
 
+        if get_url_dispatch() == "trie":
+            install_trie_dispatcher(self._api)
+
+        return self._api
+
+    def warmup(self, freeze: bool = True) -> NinjaAPI:
+        """Build lazily created state ahead of the first request; see :func:`django_ninja_jsonapi.warmup.warmup`."""
+        if not self._initialized:
+            raise ApplicationBuilderError("Can't warm up the app before initialization")
+
+        warmup(self._api, freeze=freeze)
         return self._api
 
     def _register_exception_handler(self):
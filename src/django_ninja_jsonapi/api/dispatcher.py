@@ -0,0 +1,150 @@
+"""
+Trie-based URL dispatch.
+
+ninja registers one Django URL pattern per operation, and Django's resolver
+tries them one by one, so with hundreds of resources every request pays for a
+scan of thousands of regexes.  With the ``"trie"`` dispatcher the operations of
+an API are mounted under a single resolver that walks a tree of path segments
+instead::
+
+    NINJA_JSONAPI = {
+        "URL_DISPATCH": "trie",  # default: "django"
+    }
+
+Only the few patterns found in the tree are matched with Django's own
+``URLPattern.resolve``, in registration order, so converters, url names,
+``reverse()`` and the generated OpenAPI document stay the same.
+:class:`~django_ninja_jsonapi.api.application_builder.ApplicationBuilder`
+installs the dispatcher on ``initialize()``; call
+:func:`install_trie_dispatcher` for APIs set up by hand.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import cached_property
+from typing import Any, Optional, Union
+
+from django.conf import settings
+from django.urls import URLPattern, URLResolver
+from django.urls.exceptions import Resolver404
+from django.urls.resolvers import RoutePattern
+from ninja import NinjaAPI
+from ninja.openapi.urls import get_openapi_urls, get_root_url
+
+URL_DISPATCH_MODES = ("django", "trie")
+
+
+def get_url_dispatch() -> str:
+    url_dispatch = getattr(settings, "NINJA_JSONAPI", {}).get("URL_DISPATCH", "django")
+    if url_dispatch not in URL_DISPATCH_MODES:
+        msg = f"Invalid URL_DISPATCH value: {url_dispatch!r}. Must be one of {URL_DISPATCH_MODES!r}."
+        raise ValueError(msg)
+
+    return url_dispatch
+
+
+class _TrieNode:
+    __slots__ = ("static", "dynamic", "patterns")
+
+    def __init__(self):
+        self.static: dict[str, _TrieNode] = {}
+        # any non-empty segment, the pattern itself checks the converter
+        self.dynamic: Optional[_TrieNode] = None
+        self.patterns: list[tuple[int, URLPattern]] = []
+
+
+def _is_segment_route(pattern: URLPattern) -> bool:
+    """Whether every path parameter of ``pattern`` stays within one path segment."""
+    if not isinstance(pattern.pattern, RoutePattern):
+        return False
+
+    return not any(re.fullmatch(converter.regex, "a/b") for converter in pattern.pattern.converters.values())
+
+
+class PathTrie:
+    """Finds the URL patterns that may match a path by its segments."""
+
+    def __init__(self, patterns: list[URLPattern]):
+        self.root = _TrieNode()
+        # patterns that can't be split on "/", tried for every path
+        self.fallback: list[tuple[int, URLPattern]] = []
+        for index, pattern in enumerate(patterns):
+            self.add(index, pattern)
+
+    def add(self, index: int, pattern: URLPattern):
+        if not _is_segment_route(pattern):
+            self.fallback.append((index, pattern))
+            return
+
+        route = str(pattern.pattern)
+        node = self.root
+        for segment in route.split("/"):
+            if "<" in segment:
+                node.dynamic = node.dynamic or _TrieNode()
+                node = node.dynamic
+            else:
+                node = node.static.setdefault(segment, _TrieNode())
+
+        # ninja adds one pattern per operation, the first one of a route always wins
+        if all(str(other.pattern) != route for _, other in node.patterns):
+            node.patterns.append((index, pattern))
+
+    def candidates(self, path: str) -> list[URLPattern]:
+        """Return the patterns that may match ``path``, in registration order."""
+        nodes = [self.root]
+        for segment in path.split("/"):
+            next_nodes = []
+            for node in nodes:
+                if (static_node := node.static.get(segment)) is not None:
+                    next_nodes.append(static_node)
+                if segment and node.dynamic is not None:
+                    next_nodes.append(node.dynamic)
+
+            if not next_nodes:
+                nodes = []
+                break
+            nodes = next_nodes
+
+        found = [indexed_pattern for node in nodes for indexed_pattern in node.patterns]
+        if len(found) == 1 and not self.fallback:
+            return [found[0][1]]
+
+        return [pattern for _, pattern in sorted(found + self.fallback, key=lambda item: item[0])]
+
+
+class TrieURLResolver(URLResolver):
+    """Resolver mounting ``patterns`` at its parent's prefix and resolving them through a :class:`PathTrie`."""
+
+    def __init__(self, patterns: list[URLPattern]):
+        super().__init__(RoutePattern("", is_endpoint=False), patterns)
+
+    @cached_property
+    def trie(self) -> PathTrie:
+        return PathTrie(self.url_patterns)
+
+    def resolve(self, path: Any):
+        path = str(path)
+        for pattern in self.trie.candidates(path):
+            if (match := pattern.resolve(path)) is not None:
+                return match
+
+        raise Resolver404({"tried": [], "path": path})
+
+
+def get_trie_urls(api: NinjaAPI) -> list[Union[URLResolver, URLPattern]]:
+    """URL patterns of ``api`` with all operations mounted under one :class:`TrieURLResolver`."""
+    operation_patterns: list[URLPattern] = []
+    for prefix, router in api._routers:
+        operation_patterns.extend(router.urls_paths(prefix))
+
+    return [*get_openapi_urls(api), TrieURLResolver(operation_patterns), get_root_url(api)]
+
+
+def install_trie_dispatcher(api: NinjaAPI):
+    """
+    Resolve the operations of ``api`` through a path trie.
+
+    Call it before ``api.urls`` is evaluated.
+    """
+    api._get_urls = lambda: get_trie_urls(api)  # ty: ignore[invalid-assignment]
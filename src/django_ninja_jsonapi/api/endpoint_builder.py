@@ -1,11 +1,12 @@
-import json
 from typing import Any, Awaitable, Callable
 
 from django.http import HttpRequest
+from ninja.decorators import decorate_view
 
 from django_ninja_jsonapi.api.schemas import ResourceData
 from django_ninja_jsonapi.content_negotiation import validate_accept, validate_content_type
-from django_ninja_jsonapi.exceptions import BadRequest
+from django_ninja_jsonapi.metrics import record_request_metrics
+from django_ninja_jsonapi.request_body import parse_json_body, validate_json_body
 from django_ninja_jsonapi.views.enums import Operation
 
 
@@ -23,6 +24,9 @@ class EndpointsBuilder:
             schema=self.data.source_schema,
         )
 
+    def _with_metrics(self, operation: Operation, endpoint: Callable[..., Awaitable[Any]]):
+        return decorate_view(record_request_metrics(self.resource_type, operation.name.lower()))(endpoint)
+
     @staticmethod
     def _validate_request(request: HttpRequest, has_body: bool = False) -> None:
         """Validate JSON:API content negotiation headers."""
@@ -32,11 +36,7 @@ class EndpointsBuilder:
 
     @staticmethod
     def _parse_json_body(request: HttpRequest) -> dict[str, Any]:
-        try:
-            raw = request.body.decode() if request.body else "{}"
-            return json.loads(raw)
-        except (json.JSONDecodeError, UnicodeDecodeError) as ex:
-            raise BadRequest(detail="Malformed JSON request body", parameter="body") from ex
+        return parse_json_body(request)
 
     def create_common_ninja_endpoint(self, operation: Operation) -> tuple[str, Callable[..., Awaitable[Any]]]:
         if operation == Operation.GET:
@@ -54,6 +54,28 @@ class EndpointsBuilder:
 
         raise ValueError(f"Unsupported operation {operation!r}")
 
+    def create_head_endpoint(self, operation: Operation) -> tuple[str, Callable[..., Awaitable[Any]]]:
+        """Create the ``HEAD`` endpoint of a detail or list operation: counts or checks existence, no body."""
+        if operation == Operation.GET:
+
+            async def endpoint(request: HttpRequest, obj_id: str):
+                self._validate_request(request)
+                view = self._build_view(request, Operation.GET)
+                return await view.handle_head_resource_detail(obj_id=obj_id)
+
+            return f"{self.resource_type}_head", self._with_metrics(Operation.GET, endpoint)
+
+        if operation == Operation.GET_LIST:
+
+            async def endpoint(request: HttpRequest):
+                self._validate_request(request)
+                view = self._build_view(request, Operation.GET_LIST)
+                return await view.handle_head_resource_list()
+
+            return f"{self.resource_type}_head_list", self._with_metrics(Operation.GET_LIST, endpoint)
+
+        raise ValueError(f"Unsupported HEAD operation {operation!r}")
+
     def create_relationship_endpoint(
         self,
         *,
@@ -71,7 +93,7 @@ class EndpointsBuilder:
                     parent_resource_type=parent_resource_type,
                 )
 
-            return f"{parent_resource_type}_{relationship_name}_get_list", endpoint
+            return f"{parent_resource_type}_{relationship_name}_get_list", self._with_metrics(operation, endpoint)
 
         async def endpoint(request: HttpRequest, obj_id: str):
             view = self._build_view(request, operation)
@@ -81,7 +103,7 @@ class EndpointsBuilder:
                 parent_resource_type=parent_resource_type,
             )
 
-        return f"{parent_resource_type}_{relationship_name}_get", endpoint
+        return f"{parent_resource_type}_{relationship_name}_get", self._with_metrics(operation, endpoint)
 
     def create_relationship_mutation_endpoint(
         self,
@@ -122,7 +144,7 @@ class EndpointsBuilder:
             )
 
         operation_id = f"{parent_resource_type}_{relationship_name}_{op_suffix}"
-        return operation_id, endpoint
+        return operation_id, builder._with_metrics(view_operation, endpoint)
 
     def _create_get_detail(self):
         async def endpoint(request: HttpRequest, obj_id: str):
@@ -130,7 +152,7 @@ class EndpointsBuilder:
             view = self._build_view(request, Operation.GET)
             return await view.handle_get_resource_detail(obj_id=obj_id)
 
-        return f"{self.resource_type}_get", endpoint
+        return f"{self.resource_type}_get", self._with_metrics(Operation.GET, endpoint)
 
     def _create_get_list(self):
         async def endpoint(request: HttpRequest):
@@ -138,25 +160,25 @@ class EndpointsBuilder:
             view = self._build_view(request, Operation.GET_LIST)
             return await view.handle_get_resource_list()
 
-        return f"{self.resource_type}_get_list", endpoint
+        return f"{self.resource_type}_get_list", self._with_metrics(Operation.GET_LIST, endpoint)
 
     def _create_create(self):
         async def endpoint(request: HttpRequest):
             self._validate_request(request, has_body=True)
             view = self._build_view(request, Operation.CREATE)
-            payload = self.data.schema_in_post_envelope.model_validate(self._parse_json_body(request))
+            payload = validate_json_body(request, self.data.schema_in_post_envelope)
             return await view.handle_post_resource_list(data_create=payload.data)  # ty: ignore[unresolved-attribute]
 
-        return f"{self.resource_type}_create", endpoint
+        return f"{self.resource_type}_create", self._with_metrics(Operation.CREATE, endpoint)
 
     def _create_update(self):
         async def endpoint(request: HttpRequest, obj_id: str):
             self._validate_request(request, has_body=True)
             view = self._build_view(request, Operation.UPDATE)
-            payload = self.data.schema_in_patch_envelope.model_validate(self._parse_json_body(request))
+            payload = validate_json_body(request, self.data.schema_in_patch_envelope)
             return await view.handle_update_resource(obj_id=obj_id, data_update=payload.data)  # ty: ignore[unresolved-attribute]
 
-        return f"{self.resource_type}_update", endpoint
+        return f"{self.resource_type}_update", self._with_metrics(Operation.UPDATE, endpoint)
 
     def _create_delete(self):
         async def endpoint(request: HttpRequest, obj_id: str):
@@ -165,7 +187,7 @@ class EndpointsBuilder:
             await view.handle_delete_resource(obj_id=obj_id)
             return 204, None
 
-        return f"{self.resource_type}_delete", endpoint
+        return f"{self.resource_type}_delete", self._with_metrics(Operation.DELETE, endpoint)
 
     def _create_delete_list(self):
         async def endpoint(request: HttpRequest):
@@ -173,4 +195,4 @@ class EndpointsBuilder:
             view = self._build_view(request, Operation.DELETE_LIST)
             return await view.handle_delete_resource_list()
 
-        return f"{self.resource_type}_delete_list", endpoint
+        return f"{self.resource_type}_delete_list", self._with_metrics(Operation.DELETE_LIST, endpoint)
@@ -1,11 +1,15 @@
 from http import HTTPStatus
-from typing import Optional, Type
+from typing import Annotated, Optional, Type
 
 from django.http import HttpRequest, HttpResponse
 from ninja import Router
+from ninja.decorators import decorate_view
 
 from django_ninja_jsonapi.atomic.atomic_handler import AtomicViewHandler
 from django_ninja_jsonapi.atomic.schemas import AtomicOperationRequest, AtomicResultResponse
+from django_ninja_jsonapi.diagnostics import finish_request_diagnostics
+from django_ninja_jsonapi.metrics import finish_request_metrics, record_request_metrics
+from django_ninja_jsonapi.request_body import JSONBody
 
 
 class AtomicOperations:
@@ -32,10 +36,13 @@ class AtomicOperations:
         result = await atomic_handler.handle()
         if result:
             return result
+
+        finish_request_metrics(request, status=HTTPStatus.NO_CONTENT, response_bytes=0)
+        finish_request_diagnostics(request)
         return HttpResponse(status=HTTPStatus.NO_CONTENT)
 
     def _register_view(self) -> None:
-        async def endpoint(request: HttpRequest, operations_request: AtomicOperationRequest):
+        async def endpoint(request: HttpRequest, operations_request: Annotated[AtomicOperationRequest, JSONBody(...)]):
             return await self.view_atomic(
                 request=request,
                 operations_request=operations_request,
@@ -46,4 +53,4 @@ class AtomicOperations:
             response=AtomicResultResponse,
             summary="Atomic operations",
             description="""[https://jsonapi.org/ext/atomic/](https://jsonapi.org/ext/atomic/)""",
-        )(endpoint)
+        )(decorate_view(record_request_metrics("atomic", "atomic"))(endpoint))
@@ -19,6 +19,7 @@ from django_ninja_jsonapi.atomic.schemas import (
     OperationRelationshipSchema,
 )
 from django_ninja_jsonapi.exceptions import HTTPException
+from django_ninja_jsonapi.metrics import metrics_registry, start_request_metrics
 from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
 
 if TYPE_CHECKING:
@@ -64,6 +65,7 @@ class AtomicViewHandler:
         self.request = request
         self.operations_request = operations_request
         self.local_ids_cache: LocalIdsType = defaultdict(dict)
+        self.metrics = start_request_metrics(request, resource_type="atomic", operation="atomic")
 
     async def prepare_one_operation(self, operation: AtomicOperation):
         """
@@ -105,6 +107,11 @@ class AtomicViewHandler:
         operation: OperationBase,
     ):
         operation.update_relationships_with_lid(local_ids=self.local_ids_cache)
+        if self.metrics is not None:
+            metrics_registry.inc(
+                "jsonapi_atomic_operations_total",
+                {"resource_type": operation.resource_type, "operation": operation.op_type},
+            )
         return await operation.handle(dl=dl)
 
     async def process_next_operation(
@@ -8,9 +8,15 @@ from django_ninja_jsonapi.utils.metadata_instance_search import MetadataInstance
 
 search_client_can_set_id = MetadataInstanceSearch[ClientCanSetId](ClientCanSetId)
 search_relationship_info = MetadataInstanceSearch[RelationshipInfo](RelationshipInfo)
+LIMITED_INCLUDE_ATTR_PREFIX = "jsonapi_limited_"
 
 
 def get_relationship_info_from_field_metadata(
     field: FieldInfo,
 ) -> Optional[RelationshipInfo]:
     return search_relationship_info.first(field)
+
+
+def get_limited_include_attr_name(relationship_attr_name: str) -> str:
+    """Attribute holding the per-parent limited rows of a to-many include."""
+    return f"{LIMITED_INCLUDE_ATTR_PREFIX}{relationship_attr_name}"
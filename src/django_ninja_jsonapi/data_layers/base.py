@@ -108,6 +108,18 @@ class BaseDataLayer:
         """
         raise NotImplementedError
 
+    async def check_object_exists(self, view_kwargs: dict, qs: Optional[QueryStringManager] = None):
+        """
+        Check that an object exists without retrieving it
+
+        Runs the ``get_object`` hooks; ``after_get_object`` gets ``None`` for the object.
+
+        :param view_kwargs: kwargs from the resource view
+        :param qs:
+        :raises ObjectNotFound: if the object doesn't exist
+        """
+        raise NotImplementedError
+
     async def get_collection(
         self,
         qs: QueryStringManager,
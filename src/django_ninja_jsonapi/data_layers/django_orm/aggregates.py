@@ -0,0 +1,49 @@
+"""
+``meta[aggregate]`` totals of a filtered collection.
+
+``sum``/``avg``/``min``/``max``/``count`` over fields are computed in a single
+``aggregate()`` query, every ``count_by`` in one ``values().annotate()``
+query.  Results are nested by function::
+
+    {"sum": {"amount": 1250}, "count_by": {"status": {"open": 3, "closed": 5}}}
+
+``count_by`` groups are keyed by the string value; the group of ``NULL``
+values is ``"null"``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models import Avg, Count, Max, Min, QuerySet, Sum
+
+AGGREGATE_FUNCTIONS = {"count": Count, "sum": Sum, "avg": Avg, "min": Min, "max": Max}
+COUNT_BY = "count_by"
+COUNT_BY_ALIAS = "jsonapi_count"
+
+
+def _group_key(value: Any) -> str:
+    return "null" if value is None else str(value)
+
+
+def compute_aggregates(queryset: QuerySet, aggregates: list[tuple[str, str]]) -> dict[str, dict[str, Any]]:
+    """Compute ``(function, field path)`` aggregates over ``queryset``."""
+    results: dict[str, dict[str, Any]] = {}
+    queryset = queryset.order_by()
+
+    expressions = {}
+    for index, (function, path) in enumerate(aggregates):
+        if function != COUNT_BY:
+            expressions[f"jsonapi_aggregate_{index}"] = AGGREGATE_FUNCTIONS[function](path.replace(".", "__"))
+    values = queryset.aggregate(**expressions) if expressions else {}
+
+    for index, (function, path) in enumerate(aggregates):
+        if function != COUNT_BY:
+            results.setdefault(function, {})[path] = values[f"jsonapi_aggregate_{index}"]
+            continue
+
+        field_name = path.replace(".", "__")
+        rows = queryset.values(field_name).annotate(**{COUNT_BY_ALIAS: Count("pk")}).order_by(field_name)
+        results.setdefault(function, {})[path] = {_group_key(row[field_name]): row[COUNT_BY_ALIAS] for row in rows}
+
+    return results
@@ -20,6 +20,11 @@ class BaseDjangoORM:
         except queryset.model.DoesNotExist as ex:  # ty: ignore[unresolved-attribute]
             raise ObjectNotFound(detail=f"Resource not found for lookup: {kwargs}") from ex
 
+    @staticmethod
+    def exists_or_raise(queryset: QuerySet, **kwargs: Any) -> None:
+        if not queryset.filter(**kwargs).exists():
+            raise ObjectNotFound(detail=f"Resource not found for lookup: {kwargs}")
+
     @staticmethod
     def create(model: type[Model], **kwargs: Any) -> Model:
         try:
@@ -0,0 +1,108 @@
+"""
+Compilation of large ``in``/``not_in`` filters.
+
+``__in`` sends one bind parameter per value, which hits SQLite's variable
+limit and makes PostgreSQL planning slow for lists of thousands of ids.  Lists
+longer than ``IN_LIST_THRESHOLD`` values are sent as a single parameter
+instead::
+
+    NINJA_JSONAPI = {
+        "IN_LIST_THRESHOLD": 500,  # default
+    }
+
+- PostgreSQL: ``column = ANY(%s::type[])`` with one array parameter.
+- SQLite: ``column IN (SELECT value FROM json_each(%s))`` with one JSON
+  parameter.
+- Other databases: ``IN`` lists of at most ``IN_LIST_THRESHOLD`` values,
+  combined with ``OR``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import orjson as json
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F, Lookup, Q
+
+DEFAULT_IN_LIST_THRESHOLD = 500
+
+
+def get_in_list_threshold() -> int:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("IN_LIST_THRESHOLD", DEFAULT_IN_LIST_THRESHOLD)
+
+
+class SingleParameterIn(Lookup):
+    """``lhs IN rhs`` (or ``NOT IN`` with ``negated``) with all values bound as one parameter."""
+
+    lookup_name = "single_parameter_in"
+    prepare_rhs = False
+
+    def __init__(self, lhs, rhs: list[Any], negated: bool = False):
+        self.negated = negated
+        super().__init__(lhs, rhs)
+
+    @property
+    def identity(self):
+        return (*super().identity, self.negated)
+
+    def resolve_expression(self, *args, **kwargs):
+        lookup = super().resolve_expression(*args, **kwargs)
+        # like ``__in``: invalid values fail when the filter is added, ``None`` never matches
+        lookup.rhs = [lookup.lhs.output_field.get_prep_value(value) for value in lookup.rhs if value is not None]
+        return lookup
+
+    def get_values_sql(self, connection, field, values: list[Any]) -> tuple[str, Any]:
+        raise NotImplementedError
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        field = self.lhs.output_field
+        values = [field.get_db_prep_value(value, connection, prepared=True) for value in self.rhs]
+        values_sql, values_param = self.get_values_sql(connection, field, values)
+        sql = f"{lhs_sql} {values_sql}"
+        params = (*params, values_param)
+        if not self.negated:
+            return sql, params
+
+        # ``exclude(__in=...)`` keeps the rows where the column is NULL
+        return f"(NOT ({sql}) OR {lhs_sql} IS NULL)", (*params, *params[:-1])
+
+
+class ArrayAnyIn(SingleParameterIn):
+    lookup_name = "array_any_in"
+
+    def get_values_sql(self, connection, field, values: list[Any]) -> tuple[str, Any]:
+        return f"= ANY(%s::{field.cast_db_type(connection)}[])", values
+
+
+class JSONEachIn(SingleParameterIn):
+    lookup_name = "json_each_in"
+
+    def get_values_sql(self, connection, field, values: list[Any]) -> tuple[str, Any]:
+        return "IN (SELECT value FROM json_each(%s))", json.dumps(values, default=str).decode()
+
+
+def build_in_q(field_name: str, values: list[Any], negated: bool = False, using: Optional[str] = None) -> Q:
+    """
+    Build the condition of an ``in`` (or ``not_in`` with ``negated``) filter.
+
+    :param field_name: Django lookup path of the field.
+    :param using: database alias the query runs on.
+    """
+    threshold = get_in_list_threshold()
+    if len(values) <= threshold:
+        q = Q(**{f"{field_name}__in": values})
+        return ~q if negated else q
+
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor == "postgresql":
+        return Q(ArrayAnyIn(F(field_name), values, negated=negated))
+    if connection.vendor == "sqlite" and connection.features.supports_json_field:
+        return Q(JSONEachIn(F(field_name), values, negated=negated))
+
+    q = Q()
+    for start in range(0, len(values), threshold):
+        q |= Q(**{f"{field_name}__in": values[start : start + threshold]})
+    return ~q if negated else q
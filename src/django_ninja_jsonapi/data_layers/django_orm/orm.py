@@ -1,28 +1,57 @@
 from __future__ import annotations
 
-from typing import Optional
+from time import perf_counter
+from typing import Any, Optional
 
 from asgiref.sync import sync_to_async
 from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db import transaction
+from django.db.models import Count, OuterRef, Prefetch, Subquery, Window
 
-from django_ninja_jsonapi.common import get_relationship_info_from_field_metadata
+from django_ninja_jsonapi.common import get_limited_include_attr_name, get_relationship_info_from_field_metadata
 from django_ninja_jsonapi.data_layers.base import BaseDataLayer
+from django_ninja_jsonapi.data_layers.django_orm.aggregates import compute_aggregates
 from django_ninja_jsonapi.data_layers.django_orm.base_model import BaseDjangoORM
 from django_ninja_jsonapi.data_layers.django_orm.query_building import apply_filters, apply_sorts
-from django_ninja_jsonapi.exceptions import BadRequest, InvalidInclude, RelationNotFound
-from django_ninja_jsonapi.querystring import QueryStringManager
+from django_ninja_jsonapi.data_layers.django_orm.search import FullTextSearch, annotate_search_rank
+from django_ninja_jsonapi.diagnostics import get_current_diagnostics
+from django_ninja_jsonapi.exceptions import BadRequest, InvalidAggregate, InvalidInclude, RelationNotFound
+from django_ninja_jsonapi.fragment_cache import get_version_field
+from django_ninja_jsonapi.index_advisor import record_query_usage
+from django_ninja_jsonapi.metrics import record_count_query
+from django_ninja_jsonapi.querystring import QueryStringManager, get_filter_leaves, parse_sort_field
 from django_ninja_jsonapi.schema import BaseJSONAPIItemInSchema
 from django_ninja_jsonapi.storages.models_storage import models_storage
 from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
+from django_ninja_jsonapi.storages.views_storage import views_storage
 from django_ninja_jsonapi.views.schemas import RelationshipRequestInfo
 
+COLLECTION_COUNT_STRATEGIES = ("query", "window")
+# ``COUNT(*) OVER ()`` of the ``"window"`` count strategy
+WINDOW_COUNT_ALIAS = "jsonapi_window_count"
+
 
 class DjangoORMDataLayer(BaseDataLayer):
+    # ``"query"``: ``count()`` then the page; ``"window"``: the page with ``COUNT(*) OVER ()``
+    collection_count_strategy: str = "query"
+
     def __init__(self, *args, **kwargs):
         self.select_for_includes: dict[str, list[str]] = kwargs.pop("select_for_includes", {})
         self.prefetch_for_includes: dict[str, list[str]] = kwargs.pop("prefetch_for_includes", {})
+        self.include_limits: dict[str, int] = kwargs.pop("include_limits", {})
+        self.include_ordering: dict[str, list[str]] = kwargs.pop("include_ordering", {})
+        self.values_fields: Optional[list[str]] = kwargs.pop("values_fields", None)
+        self.deferred_fields: tuple[str, ...] = kwargs.pop("deferred_fields", ())
         self.django_filterset_class = kwargs.pop("django_filterset_class", None)
+        self.full_text_search: Optional[FullTextSearch] = kwargs.pop("full_text_search", None)
+        self.computed_fields: dict[str, Any] = kwargs.pop("computed_fields", {})
+        self.collection_count_strategy = kwargs.pop("collection_count_strategy", self.collection_count_strategy)
+        if self.collection_count_strategy not in COLLECTION_COUNT_STRATEGIES:
+            msg = (
+                f"Invalid collection_count_strategy: {self.collection_count_strategy!r}. "
+                f"Must be one of {COLLECTION_COUNT_STRATEGIES!r}."
+            )
+            raise ValueError(msg)
         super().__init__(*args, **kwargs)
         self._atomic_ctx: Optional[transaction.Atomic] = None
 
@@ -113,6 +142,16 @@ class DjangoORMDataLayer(BaseDataLayer):
         await self.after_get_object(db_object, view_kwargs)
         return db_object
 
+    async def check_object_exists(self, view_kwargs: dict, qs: Optional[QueryStringManager] = None):
+        await self.before_get_object(view_kwargs)
+
+        queryset = BaseDjangoORM.queryset(self.model)  # ty: ignore[invalid-argument-type]
+        if qs is not None:
+            queryset = self._apply_querystring(queryset, qs)
+
+        await sync_to_async(BaseDjangoORM.exists_or_raise, thread_sensitive=True)(queryset, **view_kwargs)
+        await self.after_get_object(None, view_kwargs)
+
     async def get_collection(
         self,
         qs: QueryStringManager,
@@ -126,6 +165,8 @@ class DjangoORMDataLayer(BaseDataLayer):
             queryset = queryset.filter(**view_kwargs)
 
         queryset = self._apply_querystring(queryset, qs)
+        if self.deferred_fields:
+            queryset = queryset.defer(*self.deferred_fields)
 
         if relationship_request_info is not None:
             parent_model = models_storage.get_model(relationship_request_info.parent_resource_type)
@@ -158,10 +199,32 @@ class DjangoORMDataLayer(BaseDataLayer):
             else:
                 queryset = queryset.filter(pk=getattr(relationship_value, "pk", None))
 
-        is_cursor_pagination = bool(qs.pagination.cursor and qs.pagination.size)
+        if qs.aggregates:
+            try:
+                qs.aggregate_meta = await sync_to_async(compute_aggregates, thread_sensitive=True)(
+                    queryset, qs.aggregates
+                )
+            except (FieldError, ValueError, TypeError) as ex:
+                raise InvalidAggregate(detail="Invalid aggregate query parameters") from ex
+
+        is_cursor_pagination = bool(qs.pagination.cursor and qs.pagination.size) and not qs.count_only
+        use_window_count = (
+            self.collection_count_strategy == "window"
+            and not self.disable_collection_count
+            and not is_cursor_pagination
+            and not qs.count_only
+            # window rows are counted before DISTINCT
+            and not queryset.query.distinct
+        )
         count = self.default_collection_count
-        if not self.disable_collection_count and not is_cursor_pagination:
+        query_started_at = perf_counter()
+        if not self.disable_collection_count and not is_cursor_pagination and not use_window_count:
             count = await sync_to_async(queryset.count, thread_sensitive=True)()
+            record_count_query(self.request, perf_counter() - query_started_at)
+
+        if qs.count_only:
+            await self.after_get_collection([], qs, view_kwargs)
+            return count, []
 
         paged_queryset = queryset
         if is_cursor_pagination:
@@ -179,20 +242,67 @@ class DjangoORMDataLayer(BaseDataLayer):
             else:
                 qs.pagination.next_cursor = None
 
+            record_query_usage(self.model, self.resource_type, qs, perf_counter() - query_started_at)
             await self.after_get_collection(items, qs, view_kwargs)
             return None, items
 
+        if use_window_count:
+            paged_queryset = queryset.annotate(**{WINDOW_COUNT_ALIAS: Window(Count("*"))})
+
+        offset = 0
         if qs.pagination.size:
             page_number = max(1, qs.pagination.number)
             offset = (page_number - 1) * qs.pagination.size
-            paged_queryset = queryset[offset : offset + qs.pagination.size]
+            paged_queryset = paged_queryset[offset : offset + qs.pagination.size]
         elif qs.pagination.offset is not None and qs.pagination.limit is not None:
-            paged_queryset = queryset[qs.pagination.offset : qs.pagination.offset + qs.pagination.limit]
+            offset = qs.pagination.offset
+            paged_queryset = paged_queryset[offset : offset + qs.pagination.limit]
+
+        if self.values_fields and relationship_request_info is None:
+            paged_queryset = paged_queryset.values(
+                *self.values_fields, *((WINDOW_COUNT_ALIAS,) if use_window_count else ())
+            )
 
         items = await sync_to_async(list, thread_sensitive=True)(paged_queryset)
+        if use_window_count:
+            count = await self._pop_window_count(items, queryset, offset)
+        record_query_usage(self.model, self.resource_type, qs, perf_counter() - query_started_at)
+        await self._explain_collection_query(paged_queryset)
         await self.after_get_collection(items, qs, view_kwargs)
         return count, items
 
+    async def _pop_window_count(self, items: list, queryset, offset: int) -> int:
+        """Return the ``COUNT(*) OVER ()`` of a page and remove it from the rows."""
+        if not items:
+            if not offset:
+                return 0
+
+            # past the last page there are no rows to carry the count
+            query_started_at = perf_counter()
+            count = await sync_to_async(queryset.count, thread_sensitive=True)()
+            record_count_query(self.request, perf_counter() - query_started_at)
+            return count
+
+        for item in items:
+            if isinstance(item, dict):
+                count = item.pop(WINDOW_COUNT_ALIAS)
+            else:
+                count = getattr(item, WINDOW_COUNT_ALIAS)
+                delattr(item, WINDOW_COUNT_ALIAS)
+        return count
+
+    @staticmethod
+    async def _explain_collection_query(queryset):
+        diagnostics = get_current_diagnostics()
+        if diagnostics is None or not diagnostics.explain:
+            return
+
+        def explain() -> str:
+            with diagnostics.paused():
+                return queryset.explain()
+
+        diagnostics.explain_output = await sync_to_async(explain, thread_sensitive=True)()
+
     async def update_object(self, obj, data_update: BaseJSONAPIItemInSchema, view_kwargs: dict):
         await self.before_update_object(obj, data_update, view_kwargs)
 
@@ -323,23 +433,126 @@ class DjangoORMDataLayer(BaseDataLayer):
         queryset = BaseDjangoORM.queryset(related_model).filter(**{f"{related_id_field}__in": ids})
         return await sync_to_async(list, thread_sensitive=True)(queryset)
 
+    @staticmethod
+    def _get_computed_annotations(
+        resource_type: str,
+        computed_fields: dict[str, Any],
+        qs: QueryStringManager,
+    ) -> dict[str, Any]:
+        """Return the computed fields of ``resource_type`` its resource objects contain."""
+        if not computed_fields:
+            return {}
+
+        meta_fields = schemas_storage.get_meta_fields(resource_type, operation_type="get")
+        fields = qs.fields.get(resource_type)
+        if fields is None:
+            fields = schemas_storage.get_attrs_schema(resource_type, operation_type="get").model_fields
+        return {
+            name: expression for name, expression in computed_fields.items() if name in fields or name in meta_fields
+        }
+
+    @staticmethod
+    def _annotate_related_queryset(queryset, annotations: dict[str, Any]):
+        """
+        Annotate the queryset of a prefetched include.
+
+        Aggregates run in a subquery per row: the join Django adds to match
+        prefetched rows to their parents would otherwise be aggregated too.
+        """
+        expressions = {}
+        for name, expression in annotations.items():
+            if getattr(expression, "contains_aggregate", False):
+                row = BaseDjangoORM.queryset(queryset.model).filter(pk=OuterRef("pk"))
+                expression = Subquery(row.annotate(**{name: expression}).values(name)[:1])
+            expressions[name] = expression
+
+        return queryset.annotate(**expressions)
+
+    def _get_include_annotations(self, qs: QueryStringManager) -> dict[str, tuple[Any, dict[str, Any]]]:
+        """Return the model and computed fields of every included resource with computed fields, by include path."""
+        include_annotations = {}
+        for include_path in qs.include:
+            resource_type = self.resource_type
+            include_expr_parts = []
+            for relationship_name in include_path.split("."):
+                if not schemas_storage.has_resource(resource_type):
+                    break
+
+                relationship_info = schemas_storage.get_relationship_info(
+                    resource_type=resource_type,
+                    operation_type="get",
+                    field_name=relationship_name,
+                )
+                if relationship_info is None:
+                    break
+
+                include_expr_parts.append(relationship_info.model_field_name or relationship_name)
+                resource_type = relationship_info.resource_type
+                if not views_storage.has_view(resource_type):
+                    continue
+
+                computed_fields = getattr(views_storage.get_view(resource_type), "computed_fields", {})
+                if annotations := self._get_computed_annotations(resource_type, computed_fields, qs):
+                    include_annotations["__".join(include_expr_parts)] = (
+                        models_storage.get_model(resource_type),
+                        annotations,
+                    )
+
+        return include_annotations
+
+    def _apply_computed_fields(self, queryset, qs: QueryStringManager):
+        """
+        Annotate the computed fields a request reads, filters or sorts on.
+
+        Fields in the response are annotated, fields only used in filters and
+        sorts are aliased so they aren't selected.
+        """
+        if not self.computed_fields:
+            return queryset
+
+        used = {name for name, _ in get_filter_leaves(qs.filters)}
+        used.update(parse_sort_field(item["field"])[1] for item in qs.sorts)
+        used.update(path for _, path in qs.aggregates)
+
+        annotations = self._get_computed_annotations(self.resource_type, self.computed_fields, qs)
+        aliases = {
+            name: expression
+            for name, expression in self.computed_fields.items()
+            if name not in annotations and name in used
+        }
+        if aliases:
+            queryset = queryset.alias(**aliases)
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+
     def _apply_querystring(self, queryset, qs: QueryStringManager):
         queryset = self._apply_django_filterset(queryset)
         try:
-            queryset = apply_filters(queryset, qs.filters)
+            queryset = self._apply_computed_fields(queryset, qs)
+            queryset = apply_filters(queryset, qs.filters, self.full_text_search)
+            if self.full_text_search is not None:
+                queryset = annotate_search_rank(queryset, self.full_text_search, qs.filters, qs.sorts)
             queryset = apply_sorts(queryset, qs.sorts)
         except (FieldError, ValueError, TypeError) as ex:
             raise BadRequest(detail="Invalid filter or sort query parameters") from ex
 
-        include_selects, include_prefetches = self._resolve_include_optimizations(qs.include)
+        include_annotations = self._get_include_annotations(qs)
+        include_selects, include_prefetches = self._resolve_include_optimizations(
+            qs.include, annotated_exprs=frozenset(include_annotations)
+        )
         if include_selects:
             queryset = queryset.select_related(*sorted(include_selects))
         if include_prefetches:
-            queryset = queryset.prefetch_related(*sorted(include_prefetches))
+            queryset = queryset.prefetch_related(*self._build_prefetch_lookups(include_prefetches, include_annotations))
 
         fields = qs.fields.get(self.resource_type)
         if fields:
-            queryset = queryset.only(models_storage.get_model_id_field_name(self.resource_type), *fields)
+            columns = [name for name in fields if name not in self.computed_fields]
+            if version_field := get_version_field(self.resource_type):
+                # read by the fragment cache for every object
+                columns.append(version_field)
+            queryset = queryset.only(models_storage.get_model_id_field_name(self.resource_type), *columns)
 
         return queryset
 
@@ -389,7 +602,17 @@ class DjangoORMDataLayer(BaseDataLayer):
 
         return "__".join(include_expr_parts)
 
-    def _resolve_include_optimizations(self, include_paths: list[str]) -> tuple[set[str], set[str]]:
+    def _resolve_include_optimizations(
+        self,
+        include_paths: list[str],
+        annotated_exprs: frozenset[str] = frozenset(),
+    ) -> tuple[set[str], set[str]]:
+        """
+        Split the include paths into ``select_related`` and ``prefetch_related`` paths.
+
+        :param annotated_exprs: include paths of resources with computed fields;
+            ``select_related`` rows can't be annotated, so they are prefetched.
+        """
         select_paths = set(self.select_for_includes.get("__all__", []))
         prefetch_paths = set(self.prefetch_for_includes.get("__all__", []))
 
@@ -404,8 +627,97 @@ class DjangoORMDataLayer(BaseDataLayer):
             prefetch_paths.update(self.prefetch_for_includes.get(include_path, []))
 
         prefetch_paths.difference_update(select_paths)
+        for select_path in list(select_paths):
+            parts = select_path.split("__")
+            if any("__".join(parts[:idx]) in annotated_exprs for idx in range(1, len(parts) + 1)):
+                select_paths.discard(select_path)
+                prefetch_paths.add(select_path)
+
         return select_paths, prefetch_paths
 
+    def _build_prefetch_lookups(
+        self,
+        prefetch_paths: set[str],
+        include_annotations: Optional[dict[str, tuple[Any, dict[str, Any]]]] = None,
+    ) -> list[str | Prefetch]:
+        """
+        Replace limited to-many include paths with sliced ``Prefetch`` lookups.
+
+        Django compiles a sliced prefetch queryset to a
+        ``ROW_NUMBER() OVER (PARTITION BY <parent>)`` window, so every parent
+        loads at most ``limit + 1`` related rows into
+        ``jsonapi_limited_<relationship>``. The extra row lets the view detect
+        truncation.
+
+        Included resources with computed fields, from ``include_annotations``,
+        are prefetched with annotated querysets.
+        """
+        include_annotations = include_annotations or {}
+        limited_exprs = {
+            self._map_include_path_to_prefetch(include_path): (include_path, limit)
+            for include_path, limit in self.include_limits.items()
+        }
+
+        def rewrite(expr: str) -> str:
+            parts = expr.split("__")
+            return "__".join(
+                get_limited_include_attr_name(part) if "__".join(parts[:idx]) in limited_exprs else part
+                for idx, part in enumerate(parts, start=1)
+            )
+
+        lookups: dict[str, str | Prefetch] = {rewrite(path): rewrite(path) for path in prefetch_paths}
+        prefixes = {
+            "__".join(path.split("__")[:idx]) for path in prefetch_paths for idx in range(1, path.count("__") + 2)
+        }
+        for include_expr in prefixes & include_annotations.keys() - limited_exprs.keys():
+            related_model, annotations = include_annotations[include_expr]
+            lookups[rewrite(include_expr)] = Prefetch(
+                rewrite(include_expr),
+                queryset=self._annotate_related_queryset(BaseDjangoORM.queryset(related_model), annotations),
+            )
+        for include_expr, (include_path, limit) in limited_exprs.items():
+            if not any(path == include_expr or path.startswith(f"{include_expr}__") for path in prefetch_paths):
+                continue
+
+            parent_expr, _, relationship_attr_name = include_expr.rpartition("__")
+            through = f"{rewrite(parent_expr)}__{relationship_attr_name}" if parent_expr else relationship_attr_name
+            related_model = self._get_include_related_model(include_path)
+            ordering = [*self.include_ordering.get(include_path, []), "pk"]
+            related_queryset = BaseDjangoORM.queryset(related_model)
+            if include_expr in include_annotations:
+                related_queryset = self._annotate_related_queryset(
+                    related_queryset, include_annotations[include_expr][1]
+                )
+            lookups[rewrite(include_expr)] = Prefetch(
+                through,
+                queryset=related_queryset.order_by(*ordering)[: limit + 1],
+                to_attr=get_limited_include_attr_name(relationship_attr_name),
+            )
+
+        # parents must be prefetched before nested lookups traverse them
+        return [lookups[key] for key in sorted(lookups)]
+
+    def _get_include_related_model(self, include_path: str):
+        current_model = self.model
+        resource_type = self.resource_type
+
+        for relationship_name in include_path.split("."):
+            relationship_info = schemas_storage.get_relationship_info(
+                resource_type=resource_type,
+                operation_type="get",
+                field_name=relationship_name,
+            )
+            if relationship_info is None:
+                raise InvalidInclude(
+                    detail=(f"Relationship {relationship_name!r} is not available for resource type {resource_type!r}.")
+                )
+
+            relation_attr_name = relationship_info.model_field_name or relationship_name
+            current_model = models_storage.search_relationship_model(resource_type, current_model, relation_attr_name)
+            resource_type = relationship_info.resource_type
+
+        return current_model
+
     def _is_select_related_include_path(self, include_path: str) -> bool:
         current_model = self.model
         resource_type = self.resource_type
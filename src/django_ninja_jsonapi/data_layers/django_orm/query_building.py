@@ -1,39 +1,92 @@
 from __future__ import annotations
 
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
 
-from django.db.models import Q, QuerySet
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import (
+    Avg,
+    Count,
+    Exists,
+    Expression,
+    F,
+    Max,
+    Min,
+    Model,
+    OrderBy,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
+
+from django_ninja_jsonapi.data_layers.django_orm.in_lists import build_in_q
+from django_ninja_jsonapi.exceptions import InvalidSort
+from django_ninja_jsonapi.querystring import parse_sort_field
+
+if TYPE_CHECKING:
+    from django_ninja_jsonapi.data_layers.django_orm.search import FullTextSearch, SearchBackend
+
+
+SORT_AGGREGATE_FUNCTIONS = {"count": Count, "min": Min, "max": Max, "sum": Sum, "avg": Avg}
+# the positive operator a negated one is compiled from inside ``EXISTS``
+NEGATED_OPERATORS = {"ne": "eq", "not_in": "in"}
+
+
+class FilterContext(NamedTuple):
+    model: Optional[type[Model]] = None
+    search: Optional[SearchBackend] = None
+    using: Optional[str] = None
+
+
+class ToManyHop(NamedTuple):
+    # lookup of the to-many relation, e.g. ``owner__computers``
+    relation: str
+    related_model: type[Model]
+    # filter of ``related_model`` selecting the rows of the outer row
+    correlation: dict[str, OuterRef]
+    # the rest of the path, relative to ``related_model``
+    remainder: str
 
 
 def _normalize_lookup(field_name: str) -> str:
     return field_name.replace(".", "__")
 
 
-def _build_condition_q(item: dict[str, Any]) -> Q:
-    if "and" in item:
-        q = Q()
-        for child in item["and"]:
-            q &= _build_condition_q(child)
-        return q
+# keyed by client filter and sort names, so bounded
+@lru_cache(maxsize=1024)
+def get_to_many_hop(model: type[Model], path: str) -> Optional[ToManyHop]:
+    """Return the first to-many relationship ``path`` goes through, if any."""
+    parts = path.split(".")
+    current_model = model
+    for index, part in enumerate(parts):
+        try:
+            model_field = current_model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
 
-    if "or" in item:
-        q = Q()
-        children = item["or"]
-        if not children:
-            return q
+        if not model_field.is_relation or model_field.related_model is None:
+            return None
 
-        q = _build_condition_q(children[0])
-        for child in children[1:]:
-            q |= _build_condition_q(child)
-        return q
+        if model_field.many_to_many or model_field.one_to_many:
+            outer = "__".join([*parts[:index], "pk"])
+            # the name that leads back from the related model
+            back = model_field.field.name if model_field.auto_created else model_field.related_query_name()
+            return ToManyHop(
+                relation="__".join(parts[: index + 1]),
+                related_model=model_field.related_model,
+                correlation={back: OuterRef(outer)},
+                remainder="__".join(parts[index + 1 :]) or "pk",
+            )
 
-    if "not" in item:
-        return ~_build_condition_q(item["not"])
+        current_model = model_field.related_model
+
+    return None
 
-    field_name = _normalize_lookup(item["name"])
-    op = item.get("op", "eq")
-    value = item.get("val")
 
+def _build_lookup_q(field_name: str, op: str, value: Any, using: Optional[str]) -> Q:
     if op == "eq":
         return Q(**{field_name: value})
     if op == "ne":
@@ -46,12 +99,9 @@ def _build_condition_q(item: dict[str, Any]) -> Q:
         return Q(**{f"{field_name}__gt": value})
     if op == "ge":
         return Q(**{f"{field_name}__gte": value})
-    if op == "in":
+    if op in ("in", "not_in"):
         values = value if isinstance(value, list) else [value]
-        return Q(**{f"{field_name}__in": values})
-    if op == "not_in":
-        values = value if isinstance(value, list) else [value]
-        return ~Q(**{f"{field_name}__in": values})
+        return build_in_q(field_name, values, negated=op == "not_in", using=using)
     if op == "like":
         return Q(**{f"{field_name}__contains": value})
     if op == "ilike":
@@ -59,26 +109,177 @@ def _build_condition_q(item: dict[str, Any]) -> Q:
     if op == "is_null":
         return Q(**{f"{field_name}__isnull": bool(value)})
 
+    if op == "search":
+        raise ValueError("Full-text search is not enabled for this resource")
+
     raise ValueError(f"Unknown filter operator: {op}")
 
 
-def apply_filters(queryset: QuerySet, filters: list[dict[str, Any]]) -> QuerySet:
+def _get_exists_hop(item: dict[str, Any], context: FilterContext) -> Optional[ToManyHop]:
+    """The to-many hop of a condition compiled to ``EXISTS``; ``is_null`` keeps its outer join semantics."""
+    if context.model is None or getattr(context.model, "_meta", None) is None or "name" not in item:
+        return None
+    if item.get("op", "eq") == "is_null" or (
+        context.search is not None and context.search.search.is_search_condition(item)
+    ):
+        return None
+
+    return get_to_many_hop(context.model, item["name"])
+
+
+def _build_exists_q(hop: ToManyHop, items: list[dict[str, Any]], context: FilterContext) -> Q:
+    """
+    Match the rows with a related row meeting all conditions of ``items``.
+
+    A ``ne``/``not_in`` condition comes alone and becomes ``NOT EXISTS`` of the positive condition.
+    """
+    condition = Q()
+    for item in items:
+        op = item.get("op", "eq")
+        condition &= _build_lookup_q(hop.remainder, NEGATED_OPERATORS.get(op, op), item.get("val"), context.using)
+
+    q = Q(Exists(hop.related_model._default_manager.filter(**hop.correlation).filter(condition)))
+    return ~q if items[0].get("op", "eq") in NEGATED_OPERATORS else q
+
+
+def _build_and_q(children: list[dict[str, Any]], context: FilterContext) -> Q:
+    q = Q()
+    # positive conditions on the same to-many relationship must hold for the same related row
+    grouped: dict[str, tuple[ToManyHop, list[dict[str, Any]]]] = {}
+    for child in children:
+        hop = _get_exists_hop(child, context)
+        if hop is None or child.get("op", "eq") in NEGATED_OPERATORS:
+            q &= _build_condition_q(child, context)
+        else:
+            grouped.setdefault(hop.relation, (hop, []))[1].append(child)
+
+    for hop, items in grouped.values():
+        q &= _build_exists_q(hop, items, context)
+    return q
+
+
+def _build_condition_q(item: dict[str, Any], context: FilterContext) -> Q:
+    if "and" in item:
+        return _build_and_q(item["and"], context)
+
+    if "or" in item:
+        q = Q()
+        children = item["or"]
+        if not children:
+            return q
+
+        q = _build_condition_q(children[0], context)
+        for child in children[1:]:
+            q |= _build_condition_q(child, context)
+        return q
+
+    if "not" in item:
+        return ~_build_condition_q(item["not"], context)
+
+    if context.search is not None and context.search.search.is_search_condition(item):
+        return context.search.condition(item.get("val"), item["name"])
+
+    if (hop := _get_exists_hop(item, context)) is not None:
+        return _build_exists_q(hop, [item], context)
+
+    return _build_lookup_q(_normalize_lookup(item["name"]), item.get("op", "eq"), item.get("val"), context.using)
+
+
+def apply_filters(
+    queryset: QuerySet,
+    filters: list[dict[str, Any]],
+    search: Optional[FullTextSearch] = None,
+) -> QuerySet:
+    """
+    Filter ``queryset`` by a JSON:API filter tree.
+
+    Conditions across to-many relationships compile to ``EXISTS`` subqueries,
+    so parent rows are never duplicated and need no ``DISTINCT``.
+    """
+    context = FilterContext(
+        model=getattr(queryset, "model", None),
+        search=search.get_backend(queryset) if search is not None and filters else None,
+        using=getattr(queryset, "db", None),
+    )
     for item in filters:
-        queryset = queryset.filter(_build_condition_q(item))
+        queryset = queryset.filter(_build_condition_q(item, context))
 
     return queryset
 
 
+def _is_model(model: Optional[type[Model]]) -> bool:
+    return model is not None and getattr(model, "_meta", None) is not None
+
+
+def _build_aggregate_sort(model: type[Model], aggregate: str, path: str) -> Expression:
+    """Correlated subquery computing ``aggregate`` over the to-many relationship of ``path``."""
+    hop = get_to_many_hop(model, path)
+    if hop is None:
+        msg = f"Sorting by the {aggregate} of {path!r} needs a to-many relationship"
+        raise InvalidSort(msg)
+
+    (back,) = hop.correlation
+    related = hop.related_model._default_manager.filter(**hop.correlation).order_by().values(back)
+    value = Subquery(related.annotate(value=SORT_AGGREGATE_FUNCTIONS[aggregate](hop.remainder)).values("value"))
+    # no related rows: a count of 0, other aggregates stay NULL
+    return Coalesce(value, 0) if aggregate == "count" else value
+
+
+def _is_unique_sort(model: type[Model], aggregate: Optional[str], path: str) -> bool:
+    if aggregate is not None or "." in path:
+        return False
+    if path == "pk":
+        return True
+
+    try:
+        model_field = model._meta.get_field(path)
+    except FieldDoesNotExist:
+        return False
+    return bool(model_field.concrete and (model_field.primary_key or model_field.unique))
+
+
 def apply_sorts(queryset: QuerySet, sorts: list[dict[str, Any]]) -> QuerySet:
+    """
+    Order ``queryset`` by JSON:API sort fields.
+
+    To-one paths order by the joined column.  To-many paths need an aggregate
+    (``comments.count``, ``max:comments.created_at``) computed in a correlated
+    subquery, so rows aren't multiplied.  The primary key is appended unless a
+    unique field is sorted on already, so pages are stable.
+    """
     if not sorts:
         return queryset
 
-    order_by: list[str] = []
+    model = getattr(queryset, "model", None)
+    aliases: dict[str, Expression] = {}
+    order_by: list[Union[str, OrderBy]] = []
+    is_unique = False
     for item in sorts:
-        field_name = _normalize_lookup(item["field"])
-        if item.get("order", "asc") == "desc":
-            field_name = f"-{field_name}"
+        descending = item.get("order", "asc") == "desc"
+        aggregate, path = parse_sort_field(item["field"])
+        if _is_model(model):
+            is_unique = is_unique or _is_unique_sort(model, aggregate, path)
+
+        if aggregate is not None:
+            if not _is_model(model):
+                msg = f"Sorting by the {aggregate} of {path!r} is not supported"
+                raise InvalidSort(msg)
+
+            alias = f"jsonapi_sort_{len(aliases)}"
+            aliases[alias] = _build_aggregate_sort(model, aggregate, path)
+            order_by.append(F(alias).desc(nulls_last=True) if descending else F(alias).asc(nulls_last=True))
+            continue
+
+        if _is_model(model) and get_to_many_hop(model, path) is not None:
+            msg = f"Sorting by {path!r} needs an aggregate, e.g. 'max:{path}' or '{path.rsplit('.', 1)[0]}.count'"
+            raise InvalidSort(msg)
+
+        field_name = _normalize_lookup(path)
+        order_by.append(f"-{field_name}" if descending else field_name)
 
-        order_by.append(field_name)
+    if _is_model(model) and not is_unique:
+        order_by.append("pk")
+    if aliases:
+        queryset = queryset.alias(**aliases)
 
     return queryset.order_by(*order_by)
@@ -0,0 +1,243 @@
+"""
+Full-text ``search`` filter of the Django ORM data layer.
+
+Declare the searchable fields on the view::
+
+    class ArticleView(ViewBaseGeneric):
+        full_text_search = FullTextSearch(
+            fields=("title", "body"),
+            # PostgreSQL: a GIN-indexed ``SearchVectorField`` kept up to date
+            vector_field="search_vector",
+            # SQLite: an FTS5 table created with ``create_fts5_table``
+            fts_table="blog_article_fts",
+        )
+
+and clients search with ``filter[search]=...``, the ``search`` operator on
+the ``search`` name or on one of the fields, and sort by relevance with
+``sort=-rank``.  PostgreSQL matches ``SearchVector``/``SearchQuery`` (web
+search syntax), SQLite matches the FTS5 table.  Other backends, and SQLite
+without ``fts_table``, fall back to case-insensitive containment of every
+term and can't sort by rank.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Type
+
+from django.db import connections
+from django.db.migrations import RunSQL
+from django.db.models import Expression, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from django_ninja_jsonapi.data_typing import TypeModel
+from django_ninja_jsonapi.exceptions import InvalidSort
+
+SEARCH_NAME = "search"
+SEARCH_OPERATOR = "search"
+RANK_FIELD = "rank"
+
+
+@dataclass(frozen=True)
+class FullTextSearch:
+    fields: tuple[str, ...]
+    # PostgreSQL: ``SearchVectorField`` searched instead of a vector built per query
+    vector_field: Optional[str] = None
+    # PostgreSQL: text search configuration, e.g. ``"english"``
+    config: Optional[str] = None
+    # SQLite: FTS5 table whose rowid is the primary key
+    fts_table: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "fields", tuple(self.fields))
+
+    def is_search_condition(self, item: dict[str, Any]) -> bool:
+        operator = item.get("op", "eq")
+        return operator == SEARCH_OPERATOR or (item["name"] == SEARCH_NAME and operator == "eq")
+
+    def get_backend(self, queryset: QuerySet) -> SearchBackend:
+        vendor = connections[queryset.db].vendor
+        if vendor == "postgresql":
+            return PostgresSearchBackend(self, queryset.model)
+        if vendor == "sqlite" and self.fts_table:
+            return SQLiteSearchBackend(self, queryset.model)
+        return ContainsSearchBackend(self, queryset.model)
+
+
+def get_search_terms(value: Any) -> list[str]:
+    return str(value).split() if value is not None else []
+
+
+def get_search_values(search: FullTextSearch, filters: Iterable[dict[str, Any]]) -> list[Any]:
+    """Return the values of the search conditions in a filter tree."""
+    values = []
+    for item in filters:
+        if "and" in item or "or" in item:
+            values.extend(get_search_values(search, item.get("and") or item.get("or") or []))
+        elif "not" in item:
+            values.extend(get_search_values(search, [item["not"]]))
+        elif "name" in item and search.is_search_condition(item):
+            values.append(item.get("val"))
+
+    return values
+
+
+class SearchBackend:
+    supports_rank = False
+
+    def __init__(self, search: FullTextSearch, model: Type[TypeModel]):
+        self.search = search
+        self.model = model
+
+    def _get_fields(self, field_name: Optional[str]) -> tuple[str, ...]:
+        if field_name is None or field_name == SEARCH_NAME:
+            return self.search.fields
+        if field_name not in self.search.fields:
+            msg = f"Field {field_name!r} is not searchable"
+            raise ValueError(msg)
+        return (field_name,)
+
+    def condition(self, value: Any, field_name: Optional[str] = None) -> Q:
+        raise NotImplementedError
+
+    def rank(self, values: list[Any]) -> Expression:
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(SearchBackend):
+    supports_rank = True
+
+    def _query(self, value: Any):
+        from django.contrib.postgres.search import SearchQuery
+
+        return SearchQuery(str(value), search_type="websearch", config=self.search.config)
+
+    def _vector(self, field_name: Optional[str] = None):
+        from django.contrib.postgres.search import SearchVector
+        from django.db.models import F
+
+        fields = self._get_fields(field_name)
+        if self.search.vector_field and fields == self.search.fields:
+            return F(self.search.vector_field)
+        return SearchVector(*(path.replace(".", "__") for path in fields), config=self.search.config)
+
+    def condition(self, value: Any, field_name: Optional[str] = None) -> Q:
+        from django.contrib.postgres.search import SearchVectorExact
+
+        if not get_search_terms(value):
+            return Q()
+
+        return Q(SearchVectorExact(self._vector(field_name), self._query(value)))
+
+    def rank(self, values: list[Any]) -> Expression:
+        from django.contrib.postgres.search import SearchRank
+
+        return SearchRank(self._vector(), self._query(" ".join(str(value) for value in values)))
+
+
+class SQLiteSearchBackend(SearchBackend):
+    supports_rank = True
+
+    def _column(self, path: str) -> str:
+        if "." in path:
+            msg = f"FTS5 can't search the related field {path!r}"
+            raise ValueError(msg)
+        return self.model._meta.get_field(path).column
+
+    def _match(self, value: Any, field_name: Optional[str] = None) -> str:
+        # every term is a quoted string, so FTS5 query syntax in the value is matched literally
+        terms = " ".join('"{}"'.format(term.replace('"', '""')) for term in get_search_terms(value))
+        if field_name is None or field_name == SEARCH_NAME:
+            return terms
+        return f"{self._column(self._get_fields(field_name)[0])} : ({terms})"
+
+    def condition(self, value: Any, field_name: Optional[str] = None) -> Q:
+        if not get_search_terms(value):
+            return Q()
+
+        table = self.search.fts_table
+        return Q(
+            pk__in=RawSQL(f'SELECT rowid FROM "{table}" WHERE "{table}" MATCH %s', [self._match(value, field_name)])
+        )
+
+    def rank(self, values: list[Any]) -> Expression:
+        table = self.search.fts_table
+        opts = self.model._meta
+        # bm25() is lower for better matches
+        return RawSQL(
+            f'SELECT -bm25("{table}") FROM "{table}" WHERE "{table}" MATCH %s'
+            f' AND rowid = "{opts.db_table}"."{opts.pk.column}"',
+            [self._match(" ".join(str(value) for value in values))],
+        )
+
+
+class ContainsSearchBackend(SearchBackend):
+    def condition(self, value: Any, field_name: Optional[str] = None) -> Q:
+        fields = self._get_fields(field_name)
+        q = Q()
+        for term in get_search_terms(value):
+            term_q = Q()
+            for path in fields:
+                term_q |= Q(**{f"{path.replace('.', '__')}__icontains": term})
+            q &= term_q
+        return q
+
+
+def annotate_search_rank(
+    queryset: QuerySet,
+    search: FullTextSearch,
+    filters: list[dict[str, Any]],
+    sorts: list[dict[str, Any]],
+) -> QuerySet:
+    """
+    Annotate ``rank`` when the request sorts by relevance.
+
+    :raises InvalidSort: if there is no search condition or the backend can't rank.
+    """
+    if all(item["field"] != RANK_FIELD for item in sorts):
+        return queryset
+
+    values = get_search_values(search, filters)
+    if not values:
+        msg = f"Sorting by {RANK_FIELD!r} requires a search filter"
+        raise InvalidSort(msg)
+
+    backend = search.get_backend(queryset)
+    if not backend.supports_rank:
+        msg = f"Sorting by {RANK_FIELD!r} is not supported by the {connections[queryset.db].vendor} backend"
+        raise InvalidSort(msg)
+
+    return queryset.annotate(**{RANK_FIELD: backend.rank(values)})
+
+
+def create_fts5_table(fts_table: str, db_table: str, columns: Iterable[str], pk_column: str = "id") -> RunSQL:
+    """
+    Migration operation creating an external-content FTS5 table for ``db_table``.
+
+    Triggers keep the table in sync with inserts, updates and deletes.
+    """
+    columns = list(columns)
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    new_values = ", ".join(f'new."{column}"' for column in columns)
+    old_values = ", ".join(f'old."{column}"' for column in columns)
+    insert_new = f'INSERT INTO "{fts_table}"(rowid, {column_list}) VALUES (new."{pk_column}", {new_values});'
+    delete_old = (
+        f'INSERT INTO "{fts_table}"("{fts_table}", rowid, {column_list})'
+        f" VALUES ('delete', old.\"{pk_column}\", {old_values});"
+    )
+    return RunSQL(
+        sql=[
+            f'CREATE VIRTUAL TABLE "{fts_table}" USING fts5({column_list},'
+            f" content='{db_table}', content_rowid='{pk_column}')",
+            f'CREATE TRIGGER "{fts_table}_ai" AFTER INSERT ON "{db_table}" BEGIN {insert_new} END',
+            f'CREATE TRIGGER "{fts_table}_ad" AFTER DELETE ON "{db_table}" BEGIN {delete_old} END',
+            f'CREATE TRIGGER "{fts_table}_au" AFTER UPDATE ON "{db_table}" BEGIN {delete_old} {insert_new} END',
+            f'INSERT INTO "{fts_table}"("{fts_table}") VALUES (\'rebuild\')',
+        ],
+        reverse_sql=[
+            f'DROP TRIGGER "{fts_table}_au"',
+            f'DROP TRIGGER "{fts_table}_ad"',
+            f'DROP TRIGGER "{fts_table}_ai"',
+            f'DROP TABLE "{fts_table}"',
+        ],
+    )
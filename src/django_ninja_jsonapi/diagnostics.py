@@ -0,0 +1,312 @@
+"""
+Per-request performance diagnostics.
+
+Records the time spent in each request stage (querystring parsing, dependency
+handling, data-layer calls, include processing, serialization, rendering)
+together with the SQL query count and total DB time.  Enable it via the Django
+``NINJA_JSONAPI`` setting::
+
+    NINJA_JSONAPI = {
+        "DIAGNOSTICS": {
+            "ENABLED": True,
+            "SQL_IN_META": True,
+            "EXPLAIN": True,
+            "SLOW_REQUEST_THRESHOLD_MS": 500,
+        },
+        "DEBUG_META": True,
+    }
+
+Add :class:`JSONAPIDiagnosticsMiddleware` to ``MIDDLEWARE`` to emit the
+``Server-Timing`` header and log slow requests.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Optional
+from urllib.parse import unquote
+
+import orjson as json
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DIAGNOSTICS_ATTR = "_jsonapi_diagnostics"
+REQUEST_DIAGNOSTICS_TOKEN_ATTR = "_jsonapi_diagnostics_token"
+DATA_LAYER_METHODS = (
+    "get_object",
+    "check_object_exists",
+    "get_collection",
+    "create_object",
+    "update_object",
+    "delete_object",
+    "delete_objects",
+    "create_relationship",
+    "get_relationship",
+    "update_relationship",
+    "delete_relationship",
+)
+# timed as ``hook_<name>`` stages, nested in the ``dl_<method>`` stage that runs them
+DATA_LAYER_HOOKS = tuple(
+    f"{when}_{method}"
+    for method in DATA_LAYER_METHODS
+    if method != "check_object_exists"
+    for when in ("before", "after")
+)
+
+current_diagnostics: ContextVar[Optional["RequestDiagnostics"]] = ContextVar("current_diagnostics", default=None)
+
+
+def get_diagnostics_config() -> dict[str, Any]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("DIAGNOSTICS", {})
+
+
+class RequestDiagnostics:
+    """Timings and SQL statistics collected for one request."""
+
+    def __init__(self, sql_in_meta: bool = False, explain: bool = False):
+        self.sql_in_meta = sql_in_meta
+        self.explain = explain
+        self.started_at = perf_counter()
+        self.timings: dict[str, float] = {}
+        self.queries: list[dict[str, Any]] = []
+        self.db_time = 0.0
+        self.explain_output: Optional[str] = None
+        self._paused = False
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RequestDiagnostics:
+        return cls(
+            sql_in_meta=config.get("SQL_IN_META", False),
+            explain=config.get("EXPLAIN", False),
+        )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + perf_counter() - started_at
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Don't record queries issued by the diagnostics themselves (e.g. ``EXPLAIN``)."""
+        self._paused = True
+        try:
+            yield
+        finally:
+            self._paused = False
+
+    def record_query(self, sql: str, duration: float):
+        if self._paused:
+            return
+
+        self.db_time += duration
+        self.queries.append({"sql": sql, "time": round(duration * 1000, 3)})
+
+    @property
+    def total_time(self) -> float:
+        return perf_counter() - self.started_at
+
+    def server_timing_header(self) -> str:
+        entries = [f"{name};dur={duration * 1000:.3f}" for name, duration in self.timings.items()]
+        entries.append(f'db;dur={self.db_time * 1000:.3f};desc="{len(self.queries)} queries"')
+        entries.append(f"total;dur={self.total_time * 1000:.3f}")
+        return ", ".join(entries)
+
+    def as_debug_meta(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "timings": {name: round(duration * 1000, 3) for name, duration in self.timings.items()},
+            "queryCount": len(self.queries),
+            "dbTime": round(self.db_time * 1000, 3),
+        }
+        if self.sql_in_meta:
+            result["queries"] = self.queries
+        if self.explain_output is not None:
+            result["explain"] = self.explain_output
+
+        return result
+
+
+def start_request_diagnostics(request: HttpRequest) -> Optional[RequestDiagnostics]:
+    """
+    Return the diagnostics of the current request, creating them if enabled.
+
+    The diagnostics are stored on the request (for the renderer and middleware)
+    and in a context variable (for the SQL recorder running in worker threads)
+    until :func:`finish_request_diagnostics`.
+    """
+    diagnostics = getattr(request, REQUEST_DIAGNOSTICS_ATTR, None)
+    if diagnostics is None:
+        config = get_diagnostics_config()
+        if config.get("ENABLED", False):
+            diagnostics = RequestDiagnostics.from_config(config)
+            setattr(request, REQUEST_DIAGNOSTICS_ATTR, diagnostics)
+
+    token = current_diagnostics.set(diagnostics)
+    if not hasattr(request, REQUEST_DIAGNOSTICS_TOKEN_ATTR):
+        # nested views (e.g. the operations of an atomic request) restore the value of the outer one
+        setattr(request, REQUEST_DIAGNOSTICS_TOKEN_ATTR, token)
+    return diagnostics
+
+
+def finish_request_diagnostics(request: HttpRequest):
+    """Restore the context variable set by :func:`start_request_diagnostics`."""
+    token = getattr(request, REQUEST_DIAGNOSTICS_TOKEN_ATTR, None)
+    if token is None:
+        return
+
+    delattr(request, REQUEST_DIAGNOSTICS_TOKEN_ATTR)
+    try:
+        current_diagnostics.reset(token)
+    except ValueError:
+        # finished outside the context of the view, whose changes don't leak into it
+        pass
+
+
+def get_current_diagnostics() -> Optional[RequestDiagnostics]:
+    return current_diagnostics.get()
+
+
+@contextmanager
+def diagnostics_stage(name: str, diagnostics: Optional[RequestDiagnostics]) -> Iterator[None]:
+    if diagnostics is None:
+        yield
+        return
+
+    with diagnostics.stage(name):
+        yield
+
+
+def _record_query(execute: Callable, sql: str, params: Any, many: bool, context: dict):
+    diagnostics = current_diagnostics.get()
+    if diagnostics is None:
+        return execute(sql, params, many, context)
+
+    started_at = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        diagnostics.record_query(sql, perf_counter() - started_at)
+
+
+def install_query_recorder():
+    """
+    Attach the SQL recorder to the database connections of the calling thread.
+
+    Run it through ``sync_to_async(..., thread_sensitive=True)`` so it lands on
+    the thread that executes the ORM calls.  The recorder is a no-op for
+    requests without diagnostics.
+    """
+    for connection in connections.all():
+        if _record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_record_query)
+
+
+def instrument_data_layer(data_layer: Any, diagnostics: RequestDiagnostics):
+    """Time every public data-layer call as a ``dl_<method>`` stage and every hook as a ``hook_<name>`` stage."""
+
+    def timed(stage_name: str, method: Callable):
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            with diagnostics.stage(stage_name):
+                return await method(*args, **kwargs)
+
+        return wrapper
+
+    for prefix, names in (("dl", DATA_LAYER_METHODS), ("hook", DATA_LAYER_HOOKS)):
+        for name in names:
+            method = getattr(data_layer, name, None)
+            if method is not None:
+                setattr(data_layer, name, timed(f"{prefix}_{name}", method))
+
+
+def normalize_querystring(request: HttpRequest) -> str:
+    """Return the querystring with filter values and page positions replaced by ``?``."""
+
+    def strip_values(item: Any) -> Any:
+        if isinstance(item, list):
+            return [strip_values(child) for child in item]
+        if isinstance(item, dict):
+            return {key: "?" if key == "val" else strip_values(value) for key, value in item.items()}
+        return item
+
+    parts = []
+    for raw_key in sorted(request.GET.keys()):
+        key = unquote(raw_key)
+        value = request.GET.get(raw_key)
+        if key == "filter":
+            try:
+                value = json.dumps(strip_values(json.loads(value))).decode()
+            except (ValueError, TypeError):
+                value = "?"
+        elif key.startswith("filter[") or key in {"page[number]", "page[offset]", "page[cursor]"}:
+            value = "?"
+        parts.append(f"{key}={value}")
+
+    return "&".join(parts)
+
+
+def log_slow_request(request: HttpRequest, diagnostics: RequestDiagnostics):
+    threshold = get_diagnostics_config().get("SLOW_REQUEST_THRESHOLD_MS")
+    total_ms = diagnostics.total_time * 1000
+    if threshold is None or total_ms < threshold:
+        return
+
+    logger.warning(
+        "Slow JSON:API request %s %s?%s took %.1fms (%d queries, %.1fms in DB)",
+        request.method,
+        request.path,
+        normalize_querystring(request),
+        total_ms,
+        len(diagnostics.queries),
+        diagnostics.db_time * 1000,
+    )
+
+
+class JSONAPIDiagnosticsMiddleware:
+    """Emit ``Server-Timing`` for JSON:API requests and log slow ones."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        self._start(request)
+        return self._finish(request, self.get_response(request))
+
+    async def __acall__(self, request: HttpRequest):
+        self._start(request)
+        return self._finish(request, await self.get_response(request))
+
+    @staticmethod
+    def _start(request: HttpRequest):
+        if get_diagnostics_config().get("ENABLED", False):
+            setattr(request, REQUEST_DIAGNOSTICS_ATTR, RequestDiagnostics.from_config(get_diagnostics_config()))
+
+    @staticmethod
+    def _finish(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        finish_request_diagnostics(request)
+        diagnostics: Optional[RequestDiagnostics] = getattr(request, REQUEST_DIAGNOSTICS_ATTR, None)
+        if diagnostics is None or not diagnostics.timings:
+            return response
+
+        response["Server-Timing"] = diagnostics.server_timing_header()
+        log_slow_request(request, diagnostics)
+        return response
@@ -10,6 +10,7 @@ from .json_api import (
     Forbidden,
     HTTPException,
     InternalServerError,
+    InvalidAggregate,
     InvalidField,
     InvalidFilters,
     InvalidInclude,
@@ -17,8 +18,10 @@ from .json_api import (
     InvalidType,
     NotAcceptable,
     ObjectNotFound,
+    QueryCostExceeded,
     RelatedObjectNotFound,
     RelationNotFound,
+    RequestEntityTooLarge,
     UnsupportedMediaType,
 )
 
@@ -30,6 +33,7 @@ __all__ = [
     "Forbidden",
     "HTTPException",
     "InternalServerError",
+    "InvalidAggregate",
     "InvalidField",
     "InvalidFilters",
     "InvalidInclude",
@@ -37,7 +41,9 @@ __all__ = [
     "InvalidType",
     "NotAcceptable",
     "ObjectNotFound",
+    "QueryCostExceeded",
     "RelatedObjectNotFound",
     "RelationNotFound",
+    "RequestEntityTooLarge",
     "UnsupportedMediaType",
 ]
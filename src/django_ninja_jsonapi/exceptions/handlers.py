@@ -1,12 +1,17 @@
 from django.http import HttpRequest, JsonResponse
 
+from django_ninja_jsonapi.diagnostics import finish_request_diagnostics
 from django_ninja_jsonapi.exceptions import HTTPException
+from django_ninja_jsonapi.metrics import finish_request_metrics
 from django_ninja_jsonapi.renderers import JSONAPI_MEDIA_TYPE
 
 
 def base_exception_handler(request: HttpRequest, exc: HTTPException):
-    return JsonResponse(
+    response = JsonResponse(
         status=exc.status_code,
         data={"errors": [exc.as_dict]},
         content_type=JSONAPI_MEDIA_TYPE,
     )
+    finish_request_metrics(request, status=response.status_code, response_bytes=len(response.content))
+    finish_request_diagnostics(request)
+    return response
@@ -118,6 +118,13 @@ class InvalidFilters(BadRequest):
     parameter: str = "filters"
 
 
+class InvalidAggregate(BadRequest):
+    """Customized Exception for invalid aggregates."""
+
+    title = "Invalid aggregate querystring parameter."
+    parameter: str = "meta[aggregate]"
+
+
 class InvalidField(BadRequest):
     """
     Customized Exception for invalid field.
@@ -140,6 +147,12 @@ class InvalidInclude(BadRequest):
     parameter: str = "include"
 
 
+class QueryCostExceeded(BadRequest):
+    """Customized Exception for queries over the configured cost budget."""
+
+    title = "Query cost budget exceeded."
+
+
 class InvalidType(HTTPException):
     """
     Error to warn that there is a conflit between resource types
@@ -189,6 +202,14 @@ class Forbidden(HTTPException):
     status_code = HTTPStatus.FORBIDDEN
 
 
+class RequestEntityTooLarge(HTTPException):
+    """413 Content Too Large — request body exceeds ``MAX_BODY_SIZE``."""
+
+    title = "Content Too Large"
+    status_code = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    parameter = "body"
+
+
 class UnsupportedMediaType(HTTPException):
     """415 Unsupported Media Type — Content-Type has unsupported parameters."""
 
@@ -0,0 +1,202 @@
+"""
+Cache of prepared resource objects for hot resources.
+
+Resource objects of ``ApplicationBuilder`` views (id, type, attributes and
+meta; links and relationships are built per request) are cached JSON-ready in
+a Django cache, keyed by resource type, id, sparse fieldset and a version
+token.  Primary data and included resources are looked up in one batch.
+Resource types whose view declares ``computed_fields`` are never cached,
+their values change without the object being written.  Enable it per
+resource type via the Django ``NINJA_JSONAPI`` setting::
+
+    NINJA_JSONAPI = {
+        "FRAGMENT_CACHE": {
+            "ENABLED": True,
+            "CACHE_ALIAS": "default",
+            "TIMEOUT": 300,
+            "RESOURCES": {
+                # version token read from a column
+                "author": {"VERSION_FIELD": "updated_at"},
+                # version token bumped by post_save / post_delete signals
+                "category": {},
+            },
+        },
+    }
+
+Writes that neither update ``VERSION_FIELD`` nor send signals
+(``QuerySet.update()``, ``bulk_update()``, raw SQL) leave fragments stale
+until ``TIMEOUT``; call ``invalidate_fragments`` after them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db.models.signals import post_delete, post_save
+
+from django_ninja_jsonapi.data_typing import TypeModel
+from django_ninja_jsonapi.renderers import JSONAPIRenderer
+from django_ninja_jsonapi.storages.models_storage import models_storage
+from django_ninja_jsonapi.storages.views_storage import views_storage
+
+FRAGMENT_KEY_PREFIX = "jsonapi:fragment"
+VERSION_KEY_PREFIX = "jsonapi:fragment-version"
+ALL_FIELDS_KEY = "*"
+
+# (resource type, object id, fieldset key)
+FragmentLookup = tuple[str, str, str]
+
+
+def get_fragment_cache_config() -> dict[str, Any]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("FRAGMENT_CACHE", {})
+
+
+def get_version_field(resource_type: str) -> Optional[str]:
+    """Return the column the version token of a fragment-cached resource type is read from."""
+    config = get_fragment_cache_config()
+    if not config.get("ENABLED", False):
+        return None
+
+    return config.get("RESOURCES", {}).get(resource_type, {}).get("VERSION_FIELD")
+
+
+def _short_hash(value: str) -> str:
+    return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def get_fieldset_key(field_names: Optional[Iterable[str]]) -> str:
+    if not field_names:
+        return ALL_FIELDS_KEY
+
+    return _short_hash(",".join(sorted(field_names)))
+
+
+def get_version_key(resource_type: str, object_id: str) -> str:
+    return f"{VERSION_KEY_PREFIX}:{resource_type}:{object_id}"
+
+
+def _bump_versions(cache: BaseCache, resource_type: str, object_ids: Iterable[Any]):
+    version = uuid4().hex
+    cache.set_many({get_version_key(resource_type, str(object_id)): version for object_id in object_ids}, timeout=None)
+
+
+def invalidate_fragments(resource_type: str, object_ids: Iterable[Any]):
+    """
+    Drop the cached fragments of objects changed without ``post_save`` / ``post_delete`` signals.
+
+    For resource types with a ``VERSION_FIELD``, update that column in the same write instead.
+    """
+    config = get_fragment_cache_config()
+    if config.get("ENABLED", False) and resource_type in config.get("RESOURCES", {}):
+        _bump_versions(caches[config.get("CACHE_ALIAS", "default")], resource_type, object_ids)
+
+
+def encode_fragment(item_data: dict[str, Any]) -> dict[str, Any]:
+    """The JSON-ready fragment of a prepared resource object, as the renderer would encode it."""
+    fragment = {key: value for key, value in item_data.items() if key != "links"}
+    return json.loads(json.dumps(fragment, cls=JSONAPIRenderer.encoder_class))
+
+
+def connect_version_signals(resource_type: str, cache_alias: str):
+    """Bump the version token of an object whenever it is saved or deleted."""
+    model = models_storage.get_model(resource_type)
+    id_field_name = models_storage.get_model_id_field_name(resource_type)
+
+    def bump_version(sender, instance: TypeModel, **kwargs):
+        _bump_versions(caches[cache_alias], resource_type, [getattr(instance, id_field_name)])
+
+    for signal in (post_save, post_delete):
+        signal.connect(
+            bump_version,
+            sender=model,
+            weak=False,
+            dispatch_uid=f"jsonapi-fragment-{cache_alias}-{resource_type}",
+        )
+
+
+class FragmentCache:
+    """
+    Fragment store of the configured resource types.
+
+    All methods do blocking cache I/O; call them through ``sync_to_async``
+    from async code.
+    """
+
+    def __init__(self, config: dict[str, Any]):
+        self.cache_alias: str = config.get("CACHE_ALIAS", "default")
+        self.timeout: Optional[int] = config.get("TIMEOUT", 300)
+        self.resources: dict[str, dict[str, Any]] = config.get("RESOURCES", {})
+        for resource_type, resource_config in self.resources.items():
+            if not resource_config.get("VERSION_FIELD"):
+                connect_version_signals(resource_type, self.cache_alias)
+
+    @classmethod
+    def from_settings(cls) -> Optional[FragmentCache]:
+        global _fragment_cache
+
+        config = get_fragment_cache_config()
+        if not config.get("ENABLED", False):
+            return None
+
+        if _fragment_cache is None or _fragment_cache[0] is not config:
+            _fragment_cache = (config, cls(config))
+
+        return _fragment_cache[1]
+
+    @property
+    def cache(self) -> BaseCache:
+        # cache handlers are per thread
+        return caches[self.cache_alias]
+
+    def is_cached(self, resource_type: str) -> bool:
+        if resource_type not in self.resources:
+            return False
+
+        # computed fields change without the object being written
+        return not (
+            views_storage.has_view(resource_type)
+            and getattr(views_storage.get_view(resource_type), "computed_fields", None)
+        )
+
+    def _get_versions(self, lookups: dict[FragmentLookup, TypeModel]) -> dict[FragmentLookup, str]:
+        versions: dict[FragmentLookup, str] = {}
+        version_keys: dict[FragmentLookup, str] = {}
+        for lookup, db_item in lookups.items():
+            resource_type, object_id, _ = lookup
+            if version_field := self.resources[resource_type].get("VERSION_FIELD"):
+                versions[lookup] = str(getattr(db_item, version_field))
+            else:
+                version_keys[lookup] = get_version_key(resource_type, object_id)
+
+        stored_versions = self.cache.get_many(set(version_keys.values())) if version_keys else {}
+        for lookup, version_key in version_keys.items():
+            if (version := stored_versions.get(version_key)) is None:
+                # Never reuse fragments cached before the version token was lost.
+                self.cache.add(version_key, uuid4().hex, timeout=None)
+                version = stored_versions[version_key] = self.cache.get(version_key)
+            versions[lookup] = version
+
+        return versions
+
+    def get_keys(self, lookups: dict[FragmentLookup, TypeModel]) -> dict[FragmentLookup, str]:
+        """Return the cache key of every lookup, resolving version tokens in one batch."""
+        return {
+            lookup: f"{FRAGMENT_KEY_PREFIX}:{':'.join(lookup)}:{_short_hash(version)}"
+            for lookup, version in self._get_versions(lookups).items()
+        }
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict]:
+        return self.cache.get_many(list(keys))
+
+    def set_many(self, fragments: dict[str, dict]):
+        if fragments:
+            self.cache.set_many(fragments, timeout=self.timeout)
+
+
+_fragment_cache: Optional[tuple[dict[str, Any], FragmentCache]] = None
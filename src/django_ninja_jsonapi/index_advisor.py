@@ -0,0 +1,348 @@
+"""
+Index advisor.
+
+Records which filters and sorts clients actually use on collection endpoints
+and how long the queries take, and proposes the database indexes that are
+missing for them.  Enable recording via the Django ``NINJA_JSONAPI`` setting::
+
+    NINJA_JSONAPI = {
+        "INDEX_ADVISOR": {
+            "ENABLED": True,
+            # share usage between worker processes and the management command
+            "DIR": "/var/lib/jsonapi-index-usage",
+            "FLUSH_INTERVAL": 5.0,
+        },
+    }
+
+and read the proposals with ``manage.py jsonapi_index_advice`` (add
+``"django_ninja_jsonapi"`` to ``INSTALLED_APPS``) or :func:`get_index_suggestions`.
+
+A proposal puts the columns compared for equality first, then the sort
+columns, or a single range column when there is no sort.  It is dropped when
+an existing index (``Meta.indexes``, unique constraints, ``db_index``,
+``unique``, primary and foreign keys) starts with the same columns.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Optional
+
+import orjson as json
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.migrations import AddIndex
+
+from django_ninja_jsonapi.querystring import get_filter_leaves
+
+if TYPE_CHECKING:
+    from django_ninja_jsonapi.querystring import QueryStringManager
+
+USAGE_FILE_PREFIX = "jsonapi-index-usage-"
+EQUALITY_OPERATORS = frozenset(("eq", "in", "is_null"))
+RANGE_OPERATORS = frozenset(("lt", "le", "gt", "ge"))
+MAX_INDEX_COLUMNS = 4
+
+# (model label, resource type, ((field, operator), ...), ((field, order), ...))
+ShapeType = tuple[str, str, tuple[tuple[str, str], ...], tuple[tuple[str, str], ...]]
+
+
+def get_index_advisor_config() -> dict[str, Any]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("INDEX_ADVISOR", {})
+
+
+@dataclass
+class QueryUsage:
+    requests: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def add(self, requests: int, total_seconds: float, max_seconds: float):
+        self.requests += requests
+        self.total_seconds += total_seconds
+        self.max_seconds = max(self.max_seconds, max_seconds)
+
+
+class IndexUsageRecorder:
+    """
+    Thread-safe aggregate of collection query shapes.
+
+    With ``DIR`` configured every process periodically writes its usage to its
+    own file in that directory and :meth:`collect` merges all files.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usage: dict[ShapeType, QueryUsage] = {}
+        self._last_flush = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._usage.clear()
+
+    def record(
+        self,
+        model: type[models.Model],
+        resource_type: str,
+        filters: list[dict[str, Any]],
+        sorts: list[dict[str, Any]],
+        duration: float,
+    ):
+        shape: ShapeType = (
+            model._meta.label,
+            resource_type,
+            tuple(sorted(set(get_filter_leaves(filters)))),
+            tuple((item["field"], item.get("order", "asc")) for item in sorts),
+        )
+        with self._lock:
+            usage = self._usage.get(shape)
+            if usage is None:
+                usage = self._usage[shape] = QueryUsage()
+            usage.add(1, duration, duration)
+        self._maybe_flush()
+
+    def snapshot(self) -> list[list]:
+        with self._lock:
+            return [
+                [*shape, usage.requests, usage.total_seconds, usage.max_seconds] for shape, usage in self._usage.items()
+            ]
+
+    def _maybe_flush(self):
+        config = get_index_advisor_config()
+        if not config.get("DIR"):
+            return
+
+        if monotonic() - self._last_flush >= config.get("FLUSH_INTERVAL", 5.0):
+            self.flush()
+
+    def flush(self, directory: Optional[str] = None):
+        """Write this process' usage to the usage directory, if configured."""
+        directory = directory or get_index_advisor_config().get("DIR")
+        if not directory:
+            return
+
+        self._last_flush = monotonic()
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(json.dumps(self.snapshot()))
+        os.replace(tmp_path, Path(directory) / f"{USAGE_FILE_PREFIX}{os.getpid()}.json")
+
+    def collect(self, directory: Optional[str] = None) -> dict[ShapeType, QueryUsage]:
+        """Return the usage of this process, or of every process when a usage directory is configured."""
+        directory = directory or get_index_advisor_config().get("DIR")
+        if not directory:
+            snapshots = [self.snapshot()]
+        else:
+            if self._usage:
+                self.flush(directory)
+            snapshots = [json.loads(path.read_bytes()) for path in Path(directory).glob(f"{USAGE_FILE_PREFIX}*")]
+
+        merged: dict[ShapeType, QueryUsage] = {}
+        for snapshot in snapshots:
+            for model_label, resource_type, leaves, sorts, requests, total_seconds, max_seconds in snapshot:
+                shape: ShapeType = (
+                    model_label,
+                    resource_type,
+                    tuple(tuple(leaf) for leaf in leaves),
+                    tuple(tuple(sort) for sort in sorts),
+                )
+                merged.setdefault(shape, QueryUsage()).add(requests, total_seconds, max_seconds)
+
+        return merged
+
+
+index_usage_recorder = IndexUsageRecorder()
+
+
+def record_query_usage(model: type[models.Model], resource_type: str, qs: QueryStringManager, duration: float):
+    """Record the filters and sorts of a collection query, if the index advisor is enabled."""
+    if not get_index_advisor_config().get("ENABLED", False):
+        return
+
+    filters, sorts = qs.filters, qs.sorts
+    if filters or sorts:
+        index_usage_recorder.record(model, resource_type, filters, sorts, duration)
+
+
+def get_existing_indexes(model: type[models.Model]) -> list[tuple[str, ...]]:
+    """Return the column lists (by field name) of the indexes ``model`` already has."""
+    opts = model._meta
+    indexes: list[tuple[str, ...]] = []
+    for model_field in opts.concrete_fields:
+        if model_field.primary_key or model_field.unique or model_field.db_index:
+            indexes.append((model_field.name,))
+
+    for index in opts.indexes:
+        if index.fields and not index.condition:
+            indexes.append(tuple(field_name.removeprefix("-") for field_name in index.fields))
+
+    for constraint in opts.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields and not constraint.condition:
+            indexes.append(tuple(constraint.fields))
+
+    indexes.extend(tuple(fields) for fields in opts.unique_together)
+    return indexes
+
+
+def resolve_field_path(model: type[models.Model], path: str) -> Optional[tuple[type[models.Model], str]]:
+    """Return the model and concrete field name a filter or sort path ends at."""
+    parts = path.replace("__", ".").split(".")
+    for index, part in enumerate(parts):
+        try:
+            model_field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+
+        if index == len(parts) - 1:
+            return (model, model_field.name) if model_field.concrete else None
+
+        if not model_field.is_relation or model_field.related_model is None:
+            # a lookup or transform such as ``created__year``
+            return (model, model_field.name) if model_field.concrete else None
+        model = model_field.related_model
+
+    return None
+
+
+@dataclass(frozen=True)
+class IndexSuggestion:
+    model: type[models.Model]
+    fields: tuple[str, ...]
+    requests: int
+    total_seconds: float
+    max_seconds: float
+    resource_types: tuple[str, ...]
+
+    @property
+    def index(self) -> models.Index:
+        index = models.Index(fields=list(self.fields))
+        index.set_name_with_model(self.model)
+        return index
+
+    def as_operation(self) -> AddIndex:
+        """Return the migration operation creating the proposed index."""
+        return AddIndex(model_name=self.model._meta.model_name, index=self.index)
+
+
+def _shape_columns(
+    model: type[models.Model],
+    leaves: tuple[tuple[str, str], ...],
+    sorts: tuple[tuple[str, str], ...],
+) -> dict[type[models.Model], list[str]]:
+    """Return the columns worth indexing for one query shape, per model."""
+    local_equality: list[str] = []
+    local_range: list[str] = []
+    columns: dict[type[models.Model], list[str]] = {}
+    for path, operator in leaves:
+        if operator not in EQUALITY_OPERATORS and operator not in RANGE_OPERATORS:
+            # ``ne``, ``not_in`` and pattern matching can't seek a B-tree index
+            continue
+
+        resolved = resolve_field_path(model, path)
+        if resolved is None:
+            continue
+
+        target_model, field_name = resolved
+        if target_model is not model:
+            # condition on a joined table, indexed on its own
+            columns.setdefault(target_model, [field_name])
+        elif operator in EQUALITY_OPERATORS:
+            local_equality.append(field_name)
+        else:
+            local_range.append(field_name)
+
+    local_sorts: list[tuple[str, str]] = []
+    for path, order in sorts:
+        resolved = resolve_field_path(model, path)
+        if resolved is None or resolved[0] is not model:
+            break
+        local_sorts.append((resolved[1], order))
+
+    local_columns = list(dict.fromkeys(local_equality))
+    if local_sorts:
+        mixed_orders = len({order for _, order in local_sorts}) > 1
+        for field_name, order in local_sorts:
+            column = f"-{field_name}" if mixed_orders and order == "desc" else field_name
+            if field_name not in local_columns:
+                local_columns.append(column)
+    elif local_range:
+        local_columns.append(local_range[0])
+
+    if local_columns:
+        columns[model] = local_columns[:MAX_INDEX_COLUMNS]
+
+    return columns
+
+
+def _is_covered(fields: tuple[str, ...], existing_indexes: list[tuple[str, ...]]) -> bool:
+    names = tuple(field_name.removeprefix("-") for field_name in fields)
+    return any(existing[: len(names)] == names for existing in existing_indexes)
+
+
+def get_index_suggestions(
+    usage: Optional[dict[ShapeType, QueryUsage]] = None,
+    min_requests: int = 1,
+) -> list[IndexSuggestion]:
+    """
+    Return the indexes missing for the recorded filter and sort usage, most expensive first.
+
+    :param usage: recorded usage, defaults to :meth:`IndexUsageRecorder.collect`.
+    :param min_requests: ignore proposals used by fewer requests.
+    """
+    if usage is None:
+        usage = index_usage_recorder.collect()
+
+    proposals: dict[tuple[type[models.Model], tuple[str, ...]], tuple[QueryUsage, set[str]]] = {}
+    for (model_label, resource_type, leaves, sorts), shape_usage in usage.items():
+        try:
+            model = apps.get_model(model_label)
+        except LookupError:
+            continue
+
+        for target_model, columns in _shape_columns(model, leaves, sorts).items():
+            proposal_usage, resource_types = proposals.setdefault((target_model, tuple(columns)), (QueryUsage(), set()))
+            proposal_usage.add(shape_usage.requests, shape_usage.total_seconds, shape_usage.max_seconds)
+            resource_types.add(resource_type)
+
+    # an index on (a, b) also serves queries on (a)
+    for model, fields in sorted(proposals, key=lambda key: -len(key[1])):
+        if (model, fields) not in proposals:
+            continue
+        for other_model, other_fields in list(proposals):
+            if other_model is model and len(other_fields) < len(fields) and fields[: len(other_fields)] == other_fields:
+                other_usage, other_resource_types = proposals.pop((other_model, other_fields))
+                proposals[(model, fields)][0].add(
+                    other_usage.requests,
+                    other_usage.total_seconds,
+                    other_usage.max_seconds,
+                )
+                proposals[(model, fields)][1].update(other_resource_types)
+
+    suggestions = []
+    existing_indexes: dict[type[models.Model], list[tuple[str, ...]]] = {}
+    for (model, fields), (proposal_usage, resource_types) in proposals.items():
+        if model not in existing_indexes:
+            existing_indexes[model] = get_existing_indexes(model)
+        if proposal_usage.requests < min_requests or _is_covered(fields, existing_indexes[model]):
+            continue
+
+        suggestions.append(
+            IndexSuggestion(
+                model=model,
+                fields=fields,
+                requests=proposal_usage.requests,
+                total_seconds=proposal_usage.total_seconds,
+                max_seconds=proposal_usage.max_seconds,
+                resource_types=tuple(sorted(resource_types)),
+            )
+        )
+
+    return sorted(suggestions, key=lambda suggestion: -suggestion.total_seconds)
@@ -11,14 +11,25 @@ When enabled the transformer is applied to serialised attribute keys so that
 Python-side ``first_name`` becomes ``first-name`` (dasherize) or
 ``firstName`` (camelize) in the JSON:API document.  The inverse function
 (``underscore``) is exposed for use on incoming payloads.
+
+The active formatter is resolved once and reset on Django's
+``setting_changed`` signal; inflected names are memoized, and the names of
+every attributes schema are precomputed in a :class:`KeyMap`.
 """
 
 from __future__ import annotations
 
 import re
-from typing import Callable, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from pydantic import BaseModel
+
+INFLECTION_CACHE_SIZE = 4096
 
 _UPPER_FOLLOWED_BY_LOWER = re.compile(r"([A-Z]+)([A-Z][a-z])")
 _LOWER_OR_DIGIT_FOLLOWED_BY_UPPER = re.compile(r"([a-z\d])([A-Z])")
@@ -57,14 +68,66 @@ def underscore(value: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def format_keys(data: dict, formatter: Callable[[str], str]) -> dict:
-    """Return a *shallow* copy of *data* with every key passed through *formatter*."""
+def _format_nested(value: Any, formatter: Callable[[str], str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            formatter(key) if isinstance(key, str) else key: _format_nested(item, formatter)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_format_nested(item, formatter) for item in value]
+    return value
+
+
+def format_keys(data: dict, formatter: Callable[[str], str], nested: bool = False) -> dict:
+    """
+    Return a copy of *data* with every key passed through *formatter*.
+
+    The copy is shallow unless *nested* is set, in which case keys of nested
+    dicts (for example JSON attributes) are formatted as well.
+    """
+    if nested:
+        return _format_nested(data, formatter)
+
     return {formatter(key): value for key, value in data.items()}
 
 
 def unformat_keys(data: dict) -> dict:
     """Reverse inflection on dict keys (always uses ``underscore``)."""
-    return {underscore(key): value for key, value in data.items()}
+    return {cached_underscore(key): value for key, value in data.items()}
+
+
+# ---------------------------------------------------------------------------
+# Memoized transformers and per-schema key maps
+# ---------------------------------------------------------------------------
+
+cached_underscore = lru_cache(maxsize=INFLECTION_CACHE_SIZE)(underscore)
+cached_formatters: dict[str, Callable[[str], str]] = {
+    "dasherize": lru_cache(maxsize=INFLECTION_CACHE_SIZE)(dasherize),
+    "camelize": lru_cache(maxsize=INFLECTION_CACHE_SIZE)(camelize),
+}
+
+
+@dataclass(frozen=True)
+class KeyMap:
+    """Field names of a schema by their inflected names."""
+
+    reverse: dict[str, str]
+    formatter: Optional[Callable[[str], str]]
+
+    def unformat(self, key: str) -> str:
+        if self.formatter is None:
+            return key
+        return self.reverse.get(key) or cached_underscore(key)
+
+
+@lru_cache(maxsize=1024)
+def get_key_map(schema: type[BaseModel], formatter: Optional[Callable[[str], str]]) -> KeyMap:
+    """Return the key map of *schema* for *formatter* (see :func:`get_formatter`)."""
+    if formatter is None:
+        return KeyMap(reverse={}, formatter=None)
+
+    return KeyMap(reverse={formatter(name): name for name in schema.model_fields}, formatter=formatter)
 
 
 # ---------------------------------------------------------------------------
@@ -77,17 +140,50 @@ _FORMATTERS: dict[str, Callable[[str], str]] = {
 }
 
 
+_UNSET: Any = object()
+_active_formatter: Any = _UNSET
+_active_nested: Any = _UNSET
+
+
+def _get_inflection_name() -> Optional[str]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("INFLECTION")
+
+
 def get_formatter() -> Optional[Callable[[str], str]]:
-    """Return the active inflection formatter, or ``None`` if disabled."""
-    ninja_jsonapi = getattr(settings, "NINJA_JSONAPI", {})
-    name = ninja_jsonapi.get("INFLECTION")
+    """Return the active (memoized) inflection formatter, or ``None`` if disabled."""
+    global _active_formatter
+
+    if _active_formatter is not _UNSET:
+        return _active_formatter
+
+    name = _get_inflection_name()
     if name is None:
+        _active_formatter = None
         return None
-    formatter = _FORMATTERS.get(name)
+    formatter = cached_formatters.get(name)
     if formatter is None:
         msg = (
             f"NINJA_JSONAPI['INFLECTION'] = {name!r} is not a recognised inflection. "
             f"Choose from: {', '.join(sorted(_FORMATTERS))} or None."
         )
         raise ValueError(msg)
+    _active_formatter = formatter
     return formatter
+
+
+def get_nested_inflection() -> bool:
+    """Whether keys of nested dicts in attribute values are inflected too (``INFLECTION_NESTED``)."""
+    global _active_nested
+
+    if _active_nested is _UNSET:
+        _active_nested = bool(getattr(settings, "NINJA_JSONAPI", {}).get("INFLECTION_NESTED", False))
+    return _active_nested
+
+
+@receiver(setting_changed)
+def _reset_active_inflection(setting: str, **kwargs):
+    global _active_formatter, _active_nested
+
+    if setting == "NINJA_JSONAPI":
+        _active_formatter = _UNSET
+        _active_nested = _UNSET
@@ -0,0 +1,93 @@
+"""
+Link generation for JSON:API documents.
+
+One :class:`LinkBuilder` is created per request and shared by the view and the
+renderer: the scheme and host prefix and the parsed query string are computed
+once instead of for every link.  Configure it via the Django ``NINJA_JSONAPI``
+setting::
+
+    NINJA_JSONAPI = {
+        "LINKS": {
+            # "/api/articles/1/" instead of "https://example.com/api/articles/1/"
+            "RELATIVE": True,
+            # omit "links" of relationship objects
+            "RELATIONSHIP_LINKS": False,
+        },
+    }
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlencode
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.encoding import escape_uri_path, iri_to_uri
+
+REQUEST_LINK_BUILDER_ATTR = "_jsonapi_link_builder"
+
+
+def get_links_config() -> dict[str, Any]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("LINKS", {})
+
+
+class LinkBuilder:
+    """Builds the links of one request."""
+
+    def __init__(self, request: HttpRequest, relative: bool = False, relationship_links: bool = True):
+        self.request = request
+        self.relative = relative
+        self.relationship_links = relationship_links
+        self.base_url = "" if relative else f"{request.scheme}://{request.get_host()}"
+        self._query: Optional[dict[str, list[str]]] = None
+
+    @classmethod
+    def for_request(cls, request: HttpRequest) -> LinkBuilder:
+        """Return the link builder of ``request``, creating it on first use."""
+        link_builder = getattr(request, REQUEST_LINK_BUILDER_ATTR, None)
+        if link_builder is None:
+            config = get_links_config()
+            link_builder = cls(
+                request,
+                relative=config.get("RELATIVE", False),
+                relationship_links=config.get("RELATIONSHIP_LINKS", True),
+            )
+            setattr(request, REQUEST_LINK_BUILDER_ATTR, link_builder)
+
+        return link_builder
+
+    def url(self, path: str) -> str:
+        """Return the link to an absolute ``path`` (starting with ``/``)."""
+        return iri_to_uri(f"{self.base_url}{path}")
+
+    @property
+    def self_url(self) -> str:
+        return self.url(self.request.get_full_path())
+
+    def relationship_urls(self, detail_path: str, relationship_name: str) -> Optional[dict[str, str]]:
+        """Return the ``self`` and ``related`` links of a relationship, or ``None`` if disabled."""
+        if not self.relationship_links:
+            return None
+
+        detail_path = detail_path.rstrip("/")
+        return {
+            "self": self.url(f"{detail_path}/relationships/{relationship_name}/"),
+            "related": self.url(f"{detail_path}/{relationship_name}/"),
+        }
+
+    def page_url(self, params: dict[str, Optional[Any]]) -> str:
+        """Return the URL of the current request with ``params`` replaced (``None`` removes a parameter)."""
+        if self._query is None:
+            self._query = parse_qs(self.request.META.get("QUERY_STRING", ""), keep_blank_values=True)
+
+        query = dict(self._query)
+        for key, value in params.items():
+            if value is None:
+                query.pop(key, None)
+                continue
+            query[key] = [str(value)]
+
+        path = self.url(escape_uri_path(self.request.path))
+        encoded = urlencode(query, doseq=True)
+        return f"{path}?{encoded}" if encoded else path
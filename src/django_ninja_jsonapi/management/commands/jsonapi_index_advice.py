@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.migrations.writer import OperationWriter
+
+from django_ninja_jsonapi.index_advisor import get_index_suggestions, index_usage_recorder
+
+
+class Command(BaseCommand):
+    help = "Propose database indexes for the filters and sorts recorded by the JSON:API index advisor."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            help="Usage directory to read, defaults to NINJA_JSONAPI['INDEX_ADVISOR']['DIR'].",
+        )
+        parser.add_argument(
+            "--min-requests",
+            type=int,
+            default=1,
+            help="Ignore proposals used by fewer requests.",
+        )
+        parser.add_argument(
+            "--operations",
+            action="store_true",
+            help="Print the proposals as migration operations.",
+        )
+
+    def handle(self, *args, **options):
+        usage = index_usage_recorder.collect(options["dir"])
+        suggestions = get_index_suggestions(usage, min_requests=options["min_requests"])
+        if not suggestions:
+            self.stdout.write("No missing indexes found.")
+            return
+
+        if options["operations"]:
+            self.stdout.write("operations = [")
+            for suggestion in suggestions:
+                operation, _ = OperationWriter(suggestion.as_operation(), indentation=1).serialize()
+                self.stdout.write(operation)
+            self.stdout.write("]")
+            return
+
+        for suggestion in suggestions:
+            fields = ", ".join(repr(field_name) for field_name in suggestion.fields)
+            self.stdout.write(
+                f"{suggestion.model._meta.label} ({fields}): {suggestion.requests} requests, "
+                f"{suggestion.total_seconds * 1000:.1f}ms total, {suggestion.max_seconds * 1000:.1f}ms max "
+                f"[{', '.join(suggestion.resource_types)}]"
+            )
+            self.stdout.write(f"    models.Index(fields=[{fields}], name={suggestion.index.name!r})")
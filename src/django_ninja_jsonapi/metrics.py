@@ -0,0 +1,308 @@
+"""
+In-process metrics for JSON:API endpoints, exposed in the Prometheus text format.
+
+Latency, rows, included objects, response size, count-query time and errors are
+recorded per resource type and operation.  Enable it via the Django
+``NINJA_JSONAPI`` setting::
+
+    NINJA_JSONAPI = {
+        "METRICS": {
+            "ENABLED": True,
+            # share metrics between worker processes (optional)
+            "MULTIPROCESS_DIR": "/run/jsonapi-metrics",
+            "FLUSH_INTERVAL": 1.0,
+        },
+    }
+
+and register the scrape endpoint with :func:`register_metrics_endpoint`.  The
+configuration is read once and reset on Django's ``setting_changed`` signal.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from functools import wraps
+from http import HTTPStatus
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Any, Callable, Optional
+
+import orjson as json
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+
+REQUEST_METRICS_ATTR = "_jsonapi_metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MULTIPROCESS_FILE_PREFIX = "jsonapi-metrics-"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name -> (type, help, buckets)
+METRICS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    "jsonapi_requests_total": ("counter", "JSON:API requests.", ()),
+    "jsonapi_errors_total": ("counter", "JSON:API error responses.", ()),
+    "jsonapi_atomic_operations_total": ("counter", "Operations processed in atomic requests.", ()),
+    "jsonapi_request_duration_seconds": ("histogram", "JSON:API request latency.", LATENCY_BUCKETS),
+    "jsonapi_count_query_duration_seconds": ("histogram", "Collection count query latency.", LATENCY_BUCKETS),
+    "jsonapi_rows": ("histogram", "Primary resource objects per response.", COUNT_BUCKETS),
+    "jsonapi_included_objects": ("histogram", "Included resource objects per response.", COUNT_BUCKETS),
+    "jsonapi_response_bytes": ("histogram", "Rendered response size.", BYTES_BUCKETS),
+}
+
+LabelsType = tuple[tuple[str, str], ...]
+
+
+_metrics_config: Optional[dict[str, Any]] = None
+
+
+def get_metrics_config() -> dict[str, Any]:
+    global _metrics_config
+
+    if _metrics_config is None:
+        _metrics_config = getattr(settings, "NINJA_JSONAPI", {}).get("METRICS", {})
+    return _metrics_config
+
+
+@receiver(setting_changed)
+def _reset_metrics_config(setting: str, **kwargs):
+    global _metrics_config
+
+    if setting == "NINJA_JSONAPI":
+        _metrics_config = None
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: LabelsType) -> str:
+    if not labels:
+        return ""
+
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms.
+
+    With ``MULTIPROCESS_DIR`` configured every process periodically writes its
+    samples to its own file in that directory and a scrape merges all files.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, LabelsType], float] = {}
+        # [bucket counts..., +Inf bucket count, sum, count]
+        self._histograms: dict[tuple[str, LabelsType], list[float]] = {}
+        self._last_flush = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def inc(self, name: str, labels: dict[str, str], value: float = 1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name: str, labels: dict[str, str], value: float):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            samples = self._histograms.get(key)
+            if samples is None:
+                samples = self._histograms[key] = [0] * (len(buckets) + 3)
+            samples[bisect_left(buckets, value)] += 1
+            samples[-2] += value
+            samples[-1] += 1
+        self._maybe_flush()
+
+    def snapshot(self) -> dict[str, list]:
+        with self._lock:
+            return {
+                "counters": [[name, labels, value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, labels, list(samples)] for (name, labels), samples in self._histograms.items()],
+            }
+
+    def _maybe_flush(self):
+        config = get_metrics_config()
+        if not config.get("MULTIPROCESS_DIR"):
+            return
+
+        if monotonic() - self._last_flush >= config.get("FLUSH_INTERVAL", 1.0):
+            self.flush()
+
+    def flush(self):
+        """Write this process' samples to the multiprocess directory, if configured."""
+        directory = get_metrics_config().get("MULTIPROCESS_DIR")
+        if not directory:
+            return
+
+        self._last_flush = monotonic()
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(json.dumps(self.snapshot()))
+        os.replace(tmp_path, Path(directory) / f"{MULTIPROCESS_FILE_PREFIX}{os.getpid()}.json")
+
+    def _collect(self) -> tuple[dict[tuple[str, LabelsType], float], dict[tuple[str, LabelsType], list[float]]]:
+        directory = get_metrics_config().get("MULTIPROCESS_DIR")
+        if not directory:
+            snapshots = [self.snapshot()]
+        else:
+            self.flush()
+            snapshots = [json.loads(path.read_bytes()) for path in Path(directory).glob(f"{MULTIPROCESS_FILE_PREFIX}*")]
+
+        counters: dict[tuple[str, LabelsType], float] = {}
+        histograms: dict[tuple[str, LabelsType], list[float]] = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, samples in snapshot["histograms"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                if key in histograms:
+                    histograms[key] = [left + right for left, right in zip(histograms[key], samples, strict=True)]
+                else:
+                    histograms[key] = list(samples)
+
+        return counters, histograms
+
+    def render(self) -> str:
+        """Render all samples in the Prometheus text exposition format."""
+        counters, histograms = self._collect()
+        lines: list[str] = []
+        for name, (metric_type, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "counter":
+                for (sample_name, labels), value in sorted(counters.items()):
+                    if sample_name == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+
+            for (sample_name, labels), samples in sorted(histograms.items()):
+                if sample_name != name:
+                    continue
+
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, float("inf")), samples[:-2], strict=True):
+                    cumulative += bucket_count
+                    bucket_labels = (*labels, ("le", _format_value(float(bound))))
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(samples[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_format_value(samples[-1])}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+class RequestMetrics:
+    """Samples collected while one JSON:API request is processed."""
+
+    def __init__(self, resource_type: str, operation: str):
+        self.labels = {"resource_type": resource_type, "operation": operation}
+        self.started_at = perf_counter()
+        self.rows: Optional[int] = None
+        self.included: Optional[int] = None
+        self.finished = False
+
+
+def start_request_metrics(request: HttpRequest, resource_type: str, operation: str) -> Optional[RequestMetrics]:
+    """
+    Return the metrics of the current request, creating them if enabled.
+
+    Nested views (e.g. the operations of an atomic request) reuse the metrics
+    of the outer request.
+    """
+    request_metrics = getattr(request, REQUEST_METRICS_ATTR, None)
+    if request_metrics is None and get_metrics_config().get("ENABLED", False):
+        request_metrics = RequestMetrics(resource_type=resource_type, operation=operation)
+        setattr(request, REQUEST_METRICS_ATTR, request_metrics)
+
+    return request_metrics
+
+
+def record_count_query(request: HttpRequest, duration: float):
+    request_metrics: Optional[RequestMetrics] = getattr(request, REQUEST_METRICS_ATTR, None)
+    if request_metrics is not None:
+        metrics_registry.observe("jsonapi_count_query_duration_seconds", request_metrics.labels, duration)
+
+
+def finish_request_metrics(request: HttpRequest, status: int, response_bytes: int):
+    request_metrics: Optional[RequestMetrics] = getattr(request, REQUEST_METRICS_ATTR, None)
+    if request_metrics is None or request_metrics.finished:
+        return
+
+    request_metrics.finished = True
+    labels = request_metrics.labels
+    metrics_registry.inc("jsonapi_requests_total", labels)
+    metrics_registry.observe("jsonapi_request_duration_seconds", labels, perf_counter() - request_metrics.started_at)
+    metrics_registry.observe("jsonapi_response_bytes", labels, response_bytes)
+    if status >= 400:
+        metrics_registry.inc("jsonapi_errors_total", {**labels, "status": str(status)})
+        return
+
+    if request_metrics.rows is not None:
+        metrics_registry.observe("jsonapi_rows", labels, request_metrics.rows)
+    if request_metrics.included is not None:
+        metrics_registry.observe("jsonapi_included_objects", labels, request_metrics.included)
+
+
+def record_request_metrics(resource_type: str, operation: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator for the ``run`` of an async ninja operation, see ``ninja.decorators.decorate_view``.
+
+    The metrics start before ninja validates the request, so ``422`` responses
+    are recorded too, and responses that aren't rendered (e.g. unhandled
+    errors) finish them.
+    """
+
+    def decorator(run: Callable) -> Callable:
+        @wraps(run)
+        async def wrapper(request: HttpRequest, *args, **kwargs):
+            start_request_metrics(request, resource_type=resource_type, operation=operation)
+            try:
+                response = await run(request, *args, **kwargs)
+            except Exception:
+                finish_request_metrics(request, status=HTTPStatus.INTERNAL_SERVER_ERROR, response_bytes=0)
+                raise
+
+            response_bytes = 0 if response.streaming else len(response.content)
+            finish_request_metrics(request, status=response.status_code, response_bytes=response_bytes)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(metrics_registry.render(), content_type=CONTENT_TYPE)
+
+
+def register_metrics_endpoint(api: Any, path: str = "/metrics", **kwargs) -> Callable[[HttpRequest], HttpResponse]:
+    """
+    Register the scrape endpoint on a ``NinjaAPI`` (or ``Router``).
+
+    Extra keyword arguments (e.g. ``auth``) are passed to ``api.get``.
+    """
+    kwargs.setdefault("include_in_schema", False)
+    return api.get(path, **kwargs)(metrics_view)
@@ -0,0 +1,200 @@
+"""
+Cached OpenAPI document.
+
+Generating the OpenAPI document of an API with many resources takes seconds,
+and ninja repeats it on every request to the schema endpoint.  The document is
+generated once per process (or once per deployment with a cache directory),
+serialized once, and served with an ``ETag``::
+
+    NINJA_JSONAPI = {
+        "OPENAPI": {
+            # share the serialized document between processes and restarts (optional)
+            "CACHE_DIR": "/var/cache/jsonapi-openapi",
+            # change it to invalidate the cached document, e.g. per deployment (optional)
+            "CACHE_KEY": "2024-05-01",
+        },
+    }
+
+:class:`~django_ninja_jsonapi.api.application_builder.ApplicationBuilder`
+installs the cache on its ``NinjaAPI``; call :func:`install_openapi_cache` for
+APIs set up by hand.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import ninja
+import pydantic
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from ninja import NinjaAPI
+from ninja.openapi.views import openapi_json
+from ninja.responses import NinjaJSONEncoder
+
+import django_ninja_jsonapi
+from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
+from django_ninja_jsonapi.storages.views_storage import views_storage
+
+OPENAPI_CACHE_ATTR = "_jsonapi_openapi_documents"
+CACHE_FILE_PREFIX = "openapi-"
+
+
+def get_openapi_config() -> dict[str, Any]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("OPENAPI", {})
+
+
+@dataclass(frozen=True)
+class OpenAPIDocument:
+    schema: dict[str, Any]
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: bytes) -> OpenAPIDocument:
+        return cls(
+            schema=json.loads(content),
+            content=content,
+            etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+        )
+
+
+def _get_source_hash(module_name: str, hashes: dict[str, str]) -> str:
+    if module_name not in hashes:
+        path = getattr(sys.modules.get(module_name), "__file__", None)
+        try:
+            hashes[module_name] = hashlib.sha256(Path(path).read_bytes()).hexdigest() if path else ""
+        except OSError:
+            hashes[module_name] = ""
+
+    return hashes[module_name]
+
+
+def _describe_class(cls: Any, hashes: dict[str, str]) -> str:
+    """Qualified name of ``cls`` and the source hashes of the modules it (and its bases) are defined in."""
+    if not isinstance(cls, type):
+        return repr(cls)
+
+    modules = dict.fromkeys(base.__module__ for base in cls.__mro__)
+    sources = " ".join(f"{module}:{_get_source_hash(module, hashes)}" for module in modules)
+    return f"{cls.__module__}.{cls.__qualname__} {sources}"
+
+
+def get_api_fingerprint(api: NinjaAPI, path_prefix: str) -> str:
+    """
+    Cheap hash of what the document is generated from, the key of the disk cache.
+
+    Covers the route table (paths, methods, ids, summaries, descriptions,
+    tags, auth), the names and source file hashes of the registered schemas
+    and of the operations' models, the ``CACHE_KEY`` setting and the library
+    versions.  Model JSON schemas aren't rendered, that would cost as much as
+    generating the document.
+    """
+    parts: list[str] = [
+        path_prefix,
+        str(get_openapi_config().get("CACHE_KEY", "")),
+        repr((api.title, api.version, api.description, api.openapi_extra)),
+        django_ninja_jsonapi.__version__,
+        ninja.__version__,
+        pydantic.VERSION,
+    ]
+    hashes: dict[str, str] = {}
+    for prefix, router in api._routers:
+        for path, path_view in router.path_operations.items():
+            for operation in path_view.operations:
+                auth = [type(callback).__name__ for callback in operation.auth_callbacks]
+                parts.append(
+                    f"{prefix}{path} {sorted(operation.methods)} {operation.operation_id} "
+                    f"{operation.summary!r} {operation.description!r} {operation.tags!r} {operation.deprecated!r} "
+                    f"{operation.include_in_schema!r} {operation.openapi_extra!r} {operation.by_alias!r} {auth!r}"
+                )
+                parts.extend(_describe_class(model, hashes) for model in operation.models)
+                parts.extend(
+                    f"{status} {_describe_class(model, hashes)}" for status, model in operation.response_models.items()
+                )
+
+    for resource_type in views_storage.get_resource_types():
+        parts.extend(
+            f"{resource_type} {_describe_class(schema, hashes)}"
+            for schema in schemas_storage.get_source_schemas(resource_type)
+        )
+
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+
+def _read_cached_content(cache_dir: str, fingerprint: str) -> Optional[bytes]:
+    try:
+        return (Path(cache_dir) / f"{CACHE_FILE_PREFIX}{fingerprint}.json").read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write_cached_content(cache_dir: str, fingerprint: str, content: bytes):
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as tmp_file:
+        tmp_file.write(content)
+    os.replace(tmp_path, Path(cache_dir) / f"{CACHE_FILE_PREFIX}{fingerprint}.json")
+
+
+def get_openapi_document(api: NinjaAPI, path_params: Optional[dict[str, Any]] = None) -> OpenAPIDocument:
+    """Return the OpenAPI document of ``api``, generating it on first use."""
+    path_prefix = api.get_root_path(path_params or {})
+    documents: dict[str, OpenAPIDocument] = api.__dict__.setdefault(OPENAPI_CACHE_ATTR, {})
+    if (document := documents.get(path_prefix)) is not None:
+        return document
+
+    cache_dir = get_openapi_config().get("CACHE_DIR")
+    fingerprint = get_api_fingerprint(api, path_prefix) if cache_dir else ""
+    content = _read_cached_content(cache_dir, fingerprint) if cache_dir else None
+    if content is None:
+        schema = api.get_openapi_schema(path_prefix=path_prefix)
+        content = json.dumps(schema, cls=NinjaJSONEncoder).encode()
+        if cache_dir:
+            _write_cached_content(cache_dir, fingerprint, content)
+
+    document = documents[path_prefix] = OpenAPIDocument.from_content(content)
+    return document
+
+
+def clear_openapi_cache(api: NinjaAPI):
+    api.__dict__.pop(OPENAPI_CACHE_ATTR, None)
+
+
+def cached_openapi_view(request: HttpRequest, api: NinjaAPI, **kwargs: Any) -> HttpResponse:
+    document = get_openapi_document(api, path_params=kwargs)
+    if document.etag in (tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")):
+        response: HttpResponse = HttpResponseNotModified()
+    else:
+        response = HttpResponse(document.content, content_type="application/json")
+
+    response["ETag"] = document.etag
+    return response
+
+
+def install_openapi_cache(api: NinjaAPI):
+    """
+    Serve the ``openapi_url`` of ``api`` from the cached document.
+
+    Call it before ``api.urls`` is evaluated.  A ``docs_decorator`` already set
+    on the API is still applied.
+    """
+    docs_decorator: Optional[Callable] = api.docs_decorator
+    if getattr(docs_decorator, "installs_openapi_cache", False):
+        return
+
+    def decorator(view: Callable) -> Callable:
+        if isinstance(view, partial) and view.func is openapi_json:
+            view = partial(cached_openapi_view, *view.args, **view.keywords)
+        return docs_decorator(view) if docs_decorator is not None else view
+
+    decorator.installs_openapi_cache = True  # ty: ignore[unresolved-attribute]
+    api.docs_decorator = decorator
@@ -0,0 +1,282 @@
+"""
+Query cost estimation and admission control for JSON:API querystrings.
+
+Every parsed query is scored from its include paths, filter tree, sorts and
+page size.  Relationship hops are weighted by cardinality: to-one hops are
+cheap joins, to-many hops multiply rows.  Enable it via the Django
+``NINJA_JSONAPI`` setting::
+
+    NINJA_JSONAPI = {
+        "QUERY_COST": {
+            "BUDGET": 2000,
+            "MODE": "reject",  # or "degrade"
+        },
+    }
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional, Type
+
+from django.core.exceptions import FieldDoesNotExist
+
+from django_ninja_jsonapi.data_typing import TypeModel
+from django_ninja_jsonapi.exceptions import InvalidFilters, InvalidInclude, InvalidSort, QueryCostExceeded
+from django_ninja_jsonapi.querystring import QueryStringManager, parse_sort_field
+from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
+
+DEFAULT_WEIGHTS: dict[str, float] = {
+    "row": 1,
+    "included": 1,
+    "include_path": 10,
+    "filter": 5,
+    "sort": 5,
+    "to_many_join": 25,
+}
+
+DEFAULT_CONFIG: dict[str, Any] = {
+    "BUDGET": None,
+    "MODE": "reject",
+    "MAX_INCLUDE_PATHS": None,
+    "MAX_FILTER_NODES": None,
+    "MAX_FILTER_DEPTH": None,
+    "MAX_SORT_FIELDS": None,
+    "TO_MANY_ESTIMATE": 10,
+    "UNPAGINATED_ROWS": 1000,
+    "WEIGHTS": {},
+}
+
+
+@dataclass(frozen=True)
+class QueryCost:
+    rows: int
+    include_paths: int
+    estimated_included: int
+    filter_nodes: int
+    filter_depth: int
+    sorts: int
+    to_many_joins: int
+    total: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "includePaths": self.include_paths,
+            "estimatedIncluded": self.estimated_included,
+            "filterNodes": self.filter_nodes,
+            "filterDepth": self.filter_depth,
+            "sorts": self.sorts,
+            "toManyJoins": self.to_many_joins,
+            "total": self.total,
+        }
+
+
+def get_query_cost_config(query_params: QueryStringManager) -> dict[str, Any]:
+    config = {**DEFAULT_CONFIG, **query_params.config.get("QUERY_COST", {})}
+    config["WEIGHTS"] = {**DEFAULT_WEIGHTS, **config["WEIGHTS"]}
+    return config
+
+
+class QueryCostEstimator:
+    """Score a parsed querystring against a resource and enforce the configured budget."""
+
+    def __init__(
+        self,
+        query_params: QueryStringManager,
+        resource_type: str,
+        model: Type[TypeModel],
+        is_collection: bool,
+        include_limits: Optional[dict[str, int]] = None,
+    ):
+        self.query_params = query_params
+        self.resource_type = resource_type
+        self.model = model
+        self.is_collection = is_collection
+        self.include_limits = include_limits or {}
+        self.config = get_query_cost_config(query_params)
+        self.weights: dict[str, float] = self.config["WEIGHTS"]
+
+    def _count_rows(self) -> int:
+        if not self.is_collection:
+            return 1
+
+        pagination = self.query_params.pagination
+        if self.query_params.count_only:
+            return 1
+        if pagination.size:
+            return pagination.size
+        if pagination.limit:
+            return pagination.limit
+        return self.config["UNPAGINATED_ROWS"]
+
+    def _count_to_many_hops(self, field_path: str) -> int:
+        """Count to-many hops in a dotted field path using the model metadata."""
+        current_model = self.model
+        to_many_hops = 0
+        for part in field_path.split(".")[:-1]:
+            meta = getattr(current_model, "_meta", None)
+            if meta is None:
+                break
+
+            try:
+                field = meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+
+            if field.many_to_many or field.one_to_many:
+                to_many_hops += 1
+
+            current_model = field.related_model
+
+        return to_many_hops
+
+    def _count_sort_to_many_hops(self, field: str) -> int:
+        aggregate, path = parse_sort_field(field)
+        if aggregate is not None:
+            # the aggregated to-many relationship is joined once
+            return 1
+
+        return self._count_to_many_hops(path)
+
+    def _walk_filters(self, items: list[Any], depth: int = 1) -> tuple[int, int, int]:
+        """Return ``(nodes, max depth, to-many joins)`` of a filter tree."""
+        nodes, max_depth, to_many_joins = 0, 0, 0
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+
+            nodes += 1
+            max_depth = max(max_depth, depth)
+            children = []
+            for operator in ("and", "or"):
+                if isinstance(item.get(operator), list):
+                    children.extend(item[operator])
+            if isinstance(item.get("not"), dict):
+                children.append(item["not"])
+
+            if children:
+                child_nodes, child_depth, child_joins = self._walk_filters(children, depth + 1)
+                nodes += child_nodes
+                max_depth = max(max_depth, child_depth)
+                to_many_joins += child_joins
+            elif isinstance(item.get("name"), str):
+                to_many_joins += self._count_to_many_hops(item["name"])
+
+        return nodes, max_depth, to_many_joins
+
+    def _estimate_included(self, rows: int) -> int:
+        estimated = 0
+        seen: set[str] = set()
+        to_many_estimate = self.config["TO_MANY_ESTIMATE"]
+        for include_path in self.query_params.include:
+            resource_type = self.resource_type
+            multiplier = rows
+            parts = include_path.split(".")
+            for depth, relationship_name in enumerate(parts, start=1):
+                if not schemas_storage.has_resource(resource_type):
+                    break
+
+                info = schemas_storage.get_relationship_info(
+                    resource_type=resource_type,
+                    operation_type="get",
+                    field_name=relationship_name,
+                )
+                if info is None:
+                    break
+
+                path = ".".join(parts[:depth])
+                if info.many:
+                    multiplier *= self.include_limits.get(path, to_many_estimate)
+                if path not in seen:
+                    seen.add(path)
+                    estimated += multiplier
+
+                resource_type = info.resource_type
+
+        return estimated
+
+    def estimate(self) -> QueryCost:
+        rows = self._count_rows()
+        filter_nodes, filter_depth, filter_joins = self._walk_filters(self.query_params.filters)
+        sorts = self.query_params.sorts
+        sort_joins = sum(self._count_sort_to_many_hops(item["field"]) for item in sorts)
+        include_paths = len(self.query_params.include)
+        estimated_included = self._estimate_included(rows)
+        to_many_joins = filter_joins + sort_joins
+
+        total = (
+            rows * self.weights["row"]
+            + estimated_included * self.weights["included"]
+            + include_paths * self.weights["include_path"]
+            + filter_nodes * self.weights["filter"]
+            + len(sorts) * self.weights["sort"]
+            + to_many_joins * self.weights["to_many_join"]
+        )
+        return QueryCost(
+            rows=rows,
+            include_paths=include_paths,
+            estimated_included=estimated_included,
+            filter_nodes=filter_nodes,
+            filter_depth=filter_depth,
+            sorts=len(sorts),
+            to_many_joins=to_many_joins,
+            total=total,
+        )
+
+    def _check_limits(self, cost: QueryCost):
+        if (max_paths := self.config["MAX_INCLUDE_PATHS"]) is not None and cost.include_paths > max_paths:
+            msg = f"You can't include more than {max_paths} relationship paths"
+            raise InvalidInclude(msg)
+
+        if (max_nodes := self.config["MAX_FILTER_NODES"]) is not None and cost.filter_nodes > max_nodes:
+            msg = f"You can't use more than {max_nodes} filter conditions"
+            raise InvalidFilters(msg)
+
+        if (max_depth := self.config["MAX_FILTER_DEPTH"]) is not None and cost.filter_depth > max_depth:
+            msg = f"You can't nest filters deeper than {max_depth} levels"
+            raise InvalidFilters(msg)
+
+        if (max_sorts := self.config["MAX_SORT_FIELDS"]) is not None and cost.sorts > max_sorts:
+            msg = f"You can't sort by more than {max_sorts} fields"
+            raise InvalidSort(msg)
+
+    def _degrade(self, cost: QueryCost, budget: float) -> Optional[QueryCost]:
+        """Shrink the page size until the query fits the budget, if possible."""
+        pagination = self.query_params.pagination
+        if not self.is_collection or cost.rows <= 1 or not (pagination.size or pagination.limit):
+            return None
+
+        per_row = self.weights["row"] + self.weights["included"] * cost.estimated_included / cost.rows
+        fixed = cost.total - cost.rows * per_row
+        rows = int((budget - fixed) // per_row)
+        if rows < 1:
+            return None
+
+        if pagination.size:
+            pagination.size = rows
+        else:
+            pagination.limit = rows
+
+        return self.estimate()
+
+    def enforce(self) -> QueryCost:
+        """
+        Estimate the query cost and apply the configured limits and budget.
+
+        :raises QueryCostExceeded: if the cost is over budget and can't be degraded.
+        """
+        cost = self.estimate()
+        self._check_limits(cost)
+
+        budget = self.config["BUDGET"]
+        if budget is None or cost.total <= budget:
+            return cost
+
+        if self.config["MODE"] == "degrade" and (degraded := self._degrade(cost, budget)) is not None:
+            return degraded
+
+        raise QueryCostExceeded(
+            detail=f"Query cost {cost.total:g} exceeds the budget of {budget:g}",
+            meta={"queryCost": cost.as_dict(), "budget": budget},
+        )
@@ -3,7 +3,7 @@
 import re
 from collections import defaultdict
 from functools import cached_property
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 from urllib.parse import unquote
 
 import orjson as json
@@ -13,13 +13,72 @@ from pydantic import BaseModel, Field, ValidationError
 
 from django_ninja_jsonapi.exceptions import (
     BadRequest,
+    InvalidAggregate,
     InvalidField,
     InvalidFilters,
     InvalidInclude,
+    InvalidSort,
     InvalidType,
 )
+from django_ninja_jsonapi.inflection import get_formatter as get_inflection_formatter
+from django_ninja_jsonapi.inflection import get_key_map
 from django_ninja_jsonapi.storages import schemas_storage
 
+SORT_AGGREGATES = ("count", "min", "max", "sum", "avg")
+# methods ``page[size]=0`` reads only the count with
+READ_METHODS = ("GET", "HEAD")
+META_AGGREGATES = ("count", "sum", "avg", "min", "max", "count_by")
+
+
+def parse_sort_field(field: str) -> tuple[Optional[str], str]:
+    """
+    Split a sort field into its aggregate and field path.
+
+    ``max:comments.created_at`` is ``("max", "comments.created_at")``,
+    ``comments.count`` is ``("count", "comments")`` and ``author.name`` is
+    ``(None, "author.name")``.
+
+    :raises InvalidSort: if the aggregate is unknown.
+    """
+    if ":" in field:
+        aggregate, path = field.split(":", 1)
+        if aggregate not in SORT_AGGREGATES:
+            msg = f"Unknown sort aggregate {aggregate!r}. Must be one of {SORT_AGGREGATES!r}."
+            raise InvalidSort(msg)
+        return aggregate, path
+
+    path, _, last = field.rpartition(".")
+    if path and last == "count":
+        return "count", path
+
+    return None, field
+
+
+def get_filter_leaves(filters: Iterable[dict[str, Any]]) -> list[tuple[str, str]]:
+    """
+    Return the ``(field, operator)`` conditions of a filter tree.
+
+    :raises InvalidFilters: if a node isn't an object or ``and``/``or`` isn't a list.
+    """
+    leaves = []
+    for item in filters:
+        if not isinstance(item, dict):
+            msg = f"Incorrect filter format, expected an object but got {type(item).__name__}"
+            raise InvalidFilters(msg)
+
+        if "and" in item or "or" in item:
+            children = item["and"] if "and" in item else item["or"]
+            if not isinstance(children, list):
+                msg = f"Incorrect filter format, expected a list of conditions but got {type(children).__name__}"
+                raise InvalidFilters(msg)
+            leaves.extend(get_filter_leaves(children))
+        elif "not" in item:
+            leaves.extend(get_filter_leaves([item["not"]]))
+        elif "name" in item:
+            leaves.append((item["name"], item.get("op", "eq")))
+
+    return leaves
+
 
 class PaginationQueryStringManager(BaseModel):
     """
@@ -55,8 +114,11 @@ class HeadersQueryStringManager(BaseModel):
 class QueryStringManager:
     """Querystring parser according to jsonapi reference."""
 
-    managed_keys = ("filter", "page", "fields", "sort", "include")
-    jsonapi_query_regex = re.compile(r"^(sort|include)$|^(?P<type>filter|fields|page)(\[[\w\.\-]+\])?$")
+    managed_keys = ("filter", "page", "fields", "sort", "include", "meta")
+    include_limit_prefix = "include."
+    jsonapi_query_regex = re.compile(
+        r"^(sort|include|meta\[aggregate\])$|^(?P<type>filter|fields|page)(\[[\w\.\-]+\])?$"
+    )
 
     def __init__(self, request: HttpRequest) -> None:
         """
@@ -68,9 +130,13 @@ class QueryStringManager:
         self.qs = request.GET
         self.config: dict[str, Any] = getattr(settings, "NINJA_JSONAPI", {})
         self.ALLOW_DISABLE_PAGINATION: bool = self.config.get("ALLOW_DISABLE_PAGINATION", False)
+        self.ALLOW_COUNT_ONLY: bool = self.config.get("ALLOW_COUNT_ONLY", False)
         self.MAX_PAGE_SIZE: int = self.config.get("MAX_PAGE_SIZE", 20)
         self.MAX_INCLUDE_DEPTH: int = self.config.get("MAX_INCLUDE_DEPTH", 3)
+        self.MAX_INCLUDE_LIMIT: Optional[int] = self.config.get("MAX_INCLUDE_LIMIT", 100)
         self.headers: HeadersQueryStringManager = HeadersQueryStringManager(**dict(self.request.headers))
+        # results of ``meta[aggregate]``, set by the data layer
+        self.aggregate_meta: Optional[dict[str, Any]] = None
         self._validate_query_params()
 
     def _validate_query_params(self):
@@ -239,6 +305,10 @@ class QueryStringManager:
                 pagination.limit = self.MAX_PAGE_SIZE
             return pagination
 
+        if pagination.size == 0 and self.request.method in READ_METHODS and (self.ALLOW_COUNT_ONLY or self.aggregates):
+            # only the count and aggregates, no rows
+            return pagination
+
         if pagination.size is not None and pagination.size <= 0:
             if pagination.size == 0 and self.ALLOW_DISABLE_PAGINATION:
                 pagination.size = None
@@ -266,6 +336,7 @@ class QueryStringManager:
         :raises InvalidField: if result field not in schema.
         """
         fields = self._get_multiple_key_values("fields")
+        result: dict[str, set] = {}
         for resource_type, field_names in fields.items():
             if not schemas_storage.has_resource(resource_type):
                 msg = f"Application has no resource with type {resource_type!r}"
@@ -274,7 +345,10 @@ class QueryStringManager:
             schema = schemas_storage.get_attrs_schema(resource_type, "get")
             assert schema is not None
 
-            for field_name in field_names:
+            # inflected names (e.g. ``first-name``) map back to schema fields
+            key_map = get_key_map(schema, get_inflection_formatter())
+            result[resource_type] = {key_map.unformat(field_name) for field_name in field_names}
+            for field_name in result[resource_type]:
                 if field_name == "":
                     continue
 
@@ -282,7 +356,37 @@ class QueryStringManager:
                     msg = f"{schema.__name__} has no attribute {field_name}"
                     raise InvalidField(msg)
 
-        return {resource_type: set(field_names) for resource_type, field_names in fields.items()}
+        return result
+
+    @property
+    def count_only(self) -> bool:
+        """Whether the request only reads the count of a collection: ``HEAD`` or a zero page size."""
+        return self.request.method == "HEAD" or self.pagination.size == 0
+
+    @cached_property
+    def aggregates(self) -> list[tuple[str, str]]:
+        """
+        Return the aggregates requested with ``meta[aggregate]``.
+
+        ``meta[aggregate]=sum:amount,count_by:status`` is
+        ``[("sum", "amount"), ("count_by", "status")]``.
+
+        :raises InvalidAggregate: if an aggregate is malformed or unknown.
+        """
+        results: list[tuple[str, str]] = []
+        aggregate_param = self.qs.get("meta[aggregate]")
+        for item in aggregate_param.split(",") if aggregate_param else []:
+            function, _, path = item.partition(":")
+            if not path:
+                msg = f"Aggregate {item!r} must be '<function>:<field>'"
+                raise InvalidAggregate(msg)
+            if function not in META_AGGREGATES:
+                msg = f"Unknown aggregate {function!r}. Must be one of {META_AGGREGATES!r}."
+                raise InvalidAggregate(msg)
+            if (function, path) not in results:
+                results.append((function, path))
+
+        return results
 
     @property
     def include(self) -> list[str]:
@@ -301,3 +405,36 @@ class QueryStringManager:
                     msg = f"You can't use include through more than {self.MAX_INCLUDE_DEPTH} relationships"
                     raise InvalidInclude(msg)
         return includes
+
+    @property
+    def include_limits(self) -> dict[str, int]:
+        """
+        Return per-parent limits requested for to-many include paths.
+
+        Limits are passed as ``page[include.<include path>]``, for example
+        ``page[include.comments]=5`` keeps at most five comments per parent.
+
+        :return: a dict mapping include paths to their limit.
+        :raises BadRequest: if a limit is not a positive integer.
+        """
+        results = {}
+        for key, value in self._get_unique_key_values("page").items():
+            if not key.startswith(self.include_limit_prefix):
+                continue
+
+            include_path = key.removeprefix(self.include_limit_prefix)
+            parameter = f"page[{key}]"
+            try:
+                limit = int(value)
+            except ValueError as ex:
+                raise BadRequest(detail=f"Invalid include limit for {include_path!r}", parameter=parameter) from ex
+
+            if limit <= 0:
+                raise BadRequest(detail=f"Include limit for {include_path!r} must be positive", parameter=parameter)
+
+            if self.MAX_INCLUDE_LIMIT and limit > self.MAX_INCLUDE_LIMIT:
+                limit = self.MAX_INCLUDE_LIMIT
+
+            results[include_path] = limit
+
+        return results
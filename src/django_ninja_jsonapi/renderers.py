@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
 from ninja.renderers import JSONRenderer
 
-from django_ninja_jsonapi.inflection import format_keys
+from django_ninja_jsonapi.diagnostics import REQUEST_DIAGNOSTICS_ATTR, diagnostics_stage, finish_request_diagnostics
+from django_ninja_jsonapi.inflection import format_keys, get_nested_inflection
 from django_ninja_jsonapi.inflection import get_formatter as get_inflection_formatter
+from django_ninja_jsonapi.links import LinkBuilder
+from django_ninja_jsonapi.metrics import finish_request_metrics
 
 JSONAPI_MEDIA_TYPE = "application/vnd.api+json"
 
@@ -58,21 +62,62 @@ def normalize_relationships(
     return normalized
 
 
+# (item key, attribute name of the model instance, is a foreign key)
+ModelAccessorsType = tuple[tuple[str, str, bool], ...]
+
+
+_model_accessors: dict[type, ModelAccessorsType] = {}
+
+
+def get_model_accessors(item: Any) -> ModelAccessorsType:
+    """Return how to read the fields of a Django model instance into an item dict, cached per model class."""
+    if (accessors := _model_accessors.get(type(item))) is not None:
+        return accessors
+
+    from django.db import models as django_models
+
+    field_accessors = []
+    for model_field in item._meta.get_fields():
+        if not hasattr(model_field, "attname"):
+            continue
+        if isinstance(model_field, django_models.ForeignKey):
+            field_accessors.append((model_field.name, model_field.attname, True))
+        else:
+            field_accessors.append((model_field.attname, model_field.attname, False))
+
+    accessors = _model_accessors[type(item)] = tuple(field_accessors)
+    return accessors
+
+
+@lru_cache(maxsize=1024)
+def get_attribute_keys(
+    item_keys: tuple[str, ...],
+    excluded_keys: frozenset[str],
+    inflection: Optional[Callable[[str], str]],
+) -> tuple[tuple[str, str], ...]:
+    """Return ``(item key, attribute key)`` pairs for items with the given keys."""
+    return tuple((key, inflection(key) if inflection else key) for key in item_keys if key not in excluded_keys)
+
+
 class JSONAPIRenderer(JSONRenderer):
     media_type = JSONAPI_MEDIA_TYPE
 
     def render(self, request, data, *, response_status):
-        resource_config = getattr(request, REQUEST_JSONAPI_CONFIG_ATTR, None)
-        if resource_config is None:
-            return super().render(request, data, response_status=response_status)
+        with diagnostics_stage("render", getattr(request, REQUEST_DIAGNOSTICS_ATTR, None)):
+            resource_config = getattr(request, REQUEST_JSONAPI_CONFIG_ATTR, None)
+            if resource_config is not None:
+                data = self._build_document(request=request, data=data, resource_config=resource_config)
+            content = super().render(request, data, response_status=response_status)
 
-        wrapped_data = self._build_document(request=request, data=data, resource_config=resource_config)
-        return super().render(request, wrapped_data, response_status=response_status)
+        finish_request_metrics(request, status=response_status, response_bytes=len(content))
+        finish_request_diagnostics(request)
+        return content
 
     def _build_document(self, request, data: Any, resource_config: JSONAPIResourceConfig) -> dict[str, Any]:
         if self._is_jsonapi_document(data):
             return data
 
+        inflection = get_inflection_formatter()
         is_collection = isinstance(data, list)
         if is_collection:
             primary_data = [
@@ -81,6 +126,7 @@ class JSONAPIRenderer(JSONRenderer):
                     resource_config=resource_config,
                     request=request,
                     is_collection=True,
+                    inflection=inflection,
                 )
                 for item in data
             ]
@@ -90,9 +136,10 @@ class JSONAPIRenderer(JSONRenderer):
                 resource_config=resource_config,
                 request=request,
                 is_collection=False,
+                inflection=inflection,
             )
 
-        links = {"self": request.build_absolute_uri(request.get_full_path())}
+        links = {"self": LinkBuilder.for_request(request).self_url}
         links.update(getattr(request, REQUEST_JSONAPI_LINKS_ATTR, {}) or {})
 
         response: dict[str, Any] = {
@@ -106,13 +153,17 @@ class JSONAPIRenderer(JSONRenderer):
         if resource_config.include_jsonapi_object:
             response["jsonapi"] = {"version": resource_config.jsonapi_version}
 
-        included = self._build_included(request)
+        included = self._build_included(request, inflection)
         if included:
             response["included"] = included
 
         return response
 
-    def _build_included(self, request) -> list[dict[str, Any]]:
+    def _build_included(
+        self,
+        request,
+        inflection: Optional[Callable[[str], str]] = None,
+    ) -> list[dict[str, Any]]:
         included_entries = getattr(request, REQUEST_JSONAPI_INCLUDED_ATTR, None) or []
         result: list[dict[str, Any]] = []
         dedupe: set[tuple[str, str]] = set()
@@ -130,6 +181,7 @@ class JSONAPIRenderer(JSONRenderer):
                     request=request,
                     is_collection=True,
                     use_resource_type_path=True,
+                    inflection=inflection,
                 )
                 if object_data is None:
                     continue
@@ -151,6 +203,7 @@ class JSONAPIRenderer(JSONRenderer):
         request,
         is_collection: bool,
         use_resource_type_path: bool = False,
+        inflection: Optional[Callable[[str], str]] = None,
     ) -> Optional[dict[str, Any]]:
         if item is None:
             return None
@@ -167,16 +220,14 @@ class JSONAPIRenderer(JSONRenderer):
 
         item_id = str(item_id_value)
 
-        relationship_keys = set(resource_config.relationships.keys())
-        attributes = {
-            key: value
-            for key, value in item.items()
-            if key not in relationship_keys and key != resource_config.id_field
-        }
-
-        inflection = get_inflection_formatter()
-        if inflection:
-            attributes = format_keys(attributes, inflection)
+        attribute_keys = get_attribute_keys(
+            tuple(item),
+            frozenset((*resource_config.relationships, resource_config.id_field)),
+            inflection,
+        )
+        attributes = {attribute_key: item[key] for key, attribute_key in attribute_keys}
+        if inflection and get_nested_inflection():
+            attributes = format_keys(attributes, inflection, nested=True)
 
         response_item: dict[str, Any] = {
             "id": item_id,
@@ -193,6 +244,7 @@ class JSONAPIRenderer(JSONRenderer):
             },
         }
 
+        link_builder = LinkBuilder.for_request(request)
         relationships: dict[str, Any] = {}
         for relationship_name, relationship_config in resource_config.relationships.items():
             relationship_value = item.get(relationship_name)
@@ -205,14 +257,9 @@ class JSONAPIRenderer(JSONRenderer):
                 relationship_base = f"/{resource_config.resource_type}/{item_id}/"
             else:
                 relationship_base = self._build_item_path(request.path, item_id) if is_collection else request.path
-            relationship_base = relationship_base.rstrip("/")
-            relationships[relationship_name] = {
-                "data": relationship_data,
-                "links": {
-                    "self": request.build_absolute_uri(relationship_base + f"/relationships/{relationship_name}/"),
-                    "related": request.build_absolute_uri(relationship_base + f"/{relationship_name}/"),
-                },
-            }
+            relationships[relationship_name] = {"data": relationship_data}
+            if relationship_links := link_builder.relationship_urls(relationship_base, relationship_name):
+                relationships[relationship_name]["links"] = relationship_links
 
         if relationships:
             response_item["relationships"] = relationships
@@ -279,8 +326,9 @@ class JSONAPIRenderer(JSONRenderer):
         is_collection: bool,
         use_resource_type_path: bool,
     ) -> str:
+        link_builder = LinkBuilder.for_request(request)
         if use_resource_type_path:
-            return request.build_absolute_uri(f"/{resource_type}/{item_id}/")
+            return link_builder.url(f"/{resource_type}/{item_id}/")
 
         request_path = request.path
         if is_collection:
@@ -288,7 +336,7 @@ class JSONAPIRenderer(JSONRenderer):
         else:
             item_path = request_path if request_path.endswith("/") else f"{request_path}/"
 
-        return request.build_absolute_uri(item_path)
+        return link_builder.url(item_path)
 
     @staticmethod
     def _coerce_to_dict(item: Any) -> dict[str, Any]:
@@ -308,16 +356,13 @@ class JSONAPIRenderer(JSONRenderer):
 
             if isinstance(item, django_models.Model):
                 data: dict[str, Any] = {}
-                for field in item._meta.get_fields():
-                    if not hasattr(field, "attname"):
-                        continue
-                    if isinstance(field, django_models.ForeignKey):
+                for key, attname, is_foreign_key in get_model_accessors(item):
+                    value = getattr(item, attname, None)
+                    if is_foreign_key:
                         # Store FK as {"id": value} so it's compatible with
                         # JSON:API relationship handling.
-                        fk_val = getattr(item, field.attname, None)
-                        data[field.name] = {"id": fk_val} if fk_val is not None else None
-                    else:
-                        data[field.attname] = getattr(item, field.attname, None)
+                        value = {"id": value} if value is not None else None
+                    data[key] = value
                 return data
         except ImportError:  # pragma: no cover
             pass
@@ -0,0 +1,128 @@
+"""
+Request body parsing.
+
+Bodies are validated straight from the raw bytes with pydantic's
+``model_validate_json`` instead of being decoded, loaded into a dict and then
+walked a second time by ``model_validate``.  Where handlers need a plain dict
+the body is loaded with orjson.  Bodies larger than ``MAX_BODY_SIZE`` bytes
+are rejected with ``413`` before anything is parsed::
+
+    NINJA_JSONAPI = {
+        "MAX_BODY_SIZE": 1024 * 1024,  # default: None (no limit)
+    }
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional, Type, TypeVar
+
+import orjson
+from django.conf import settings
+from django.http import HttpRequest
+from ninja.errors import HttpError
+from ninja.params.models import Body, BodyModel
+from pydantic import BaseModel, ValidationError
+
+from django_ninja_jsonapi.exceptions import BadRequest, RequestEntityTooLarge
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+
+def get_max_body_size() -> Optional[int]:
+    return getattr(settings, "NINJA_JSONAPI", {}).get("MAX_BODY_SIZE")
+
+
+def read_body(request: HttpRequest) -> bytes:
+    """
+    Return the raw request body.
+
+    :raises RequestEntityTooLarge: if the body is larger than ``MAX_BODY_SIZE``.
+    """
+    max_body_size = get_max_body_size()
+    if max_body_size is None:
+        return request.body
+
+    detail = f"Request body exceeds the limit of {max_body_size} bytes"
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        content_length = 0
+    # checked before the body is read from the stream
+    if content_length > max_body_size:
+        raise RequestEntityTooLarge(detail=detail)
+
+    body = request.body
+    if len(body) > max_body_size:
+        raise RequestEntityTooLarge(detail=detail)
+
+    return body
+
+
+def parse_json_body(request: HttpRequest) -> dict[str, Any]:
+    """
+    Load the request body into a dict; an empty body is an empty dict.
+
+    :raises BadRequest: if the body is not valid JSON.
+    """
+    body = read_body(request)
+    if not body:
+        return {}
+
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as ex:
+        raise BadRequest(detail="Malformed JSON request body", parameter="body") from ex
+
+
+def validate_json_body(request: HttpRequest, schema: Type[TModel]) -> TModel:
+    """
+    Validate the request body against ``schema`` without building an intermediate dict.
+
+    :raises BadRequest: if the body is not valid JSON.
+    :raises pydantic.ValidationError: if the body doesn't match ``schema``.
+    """
+    body = read_body(request) or b"{}"
+    try:
+        return schema.model_validate_json(body)
+    except ValidationError as ex:
+        if any(error["type"] == "json_invalid" for error in ex.errors(include_url=False)):
+            raise BadRequest(detail="Malformed JSON request body", parameter="body") from ex
+        raise
+
+
+class JSONBodyModel(BodyModel):
+    @classmethod
+    def get_request_data(cls, request: HttpRequest, api, path_params) -> Optional[dict[str, Any]]:
+        varname = getattr(cls, "__read_from_single_attr__", None)
+        schema = cls.model_fields[varname].annotation if varname else None
+        body = read_body(request)
+        if not body or not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+            return super().get_request_data(request, api, path_params)
+
+        try:
+            # a validated instance is not validated again by ``cls``
+            return {varname: schema.model_validate_json(body)}
+        except ValidationError:
+            pass
+
+        # let ninja report the errors the same way as for any other body
+        try:
+            return {varname: orjson.loads(body)}
+        except orjson.JSONDecodeError as ex:
+            raise HttpError(400, "Cannot parse request body") from ex
+
+
+class JSONBody(Body):
+    """
+    ``Body`` parameter validated straight from the request bytes.
+
+    Use it for a single pydantic model parameter::
+
+        async def endpoint(request, payload: Annotated[Payload, JSONBody(...)]): ...
+    """
+
+    _model = JSONBodyModel
+
+    @classmethod
+    def _param_source(cls) -> str:
+        return "body"
@@ -7,6 +7,7 @@ from urllib.parse import urlencode
 from django.conf import settings
 from django.http import HttpRequest
 
+from django_ninja_jsonapi.links import LinkBuilder
 from django_ninja_jsonapi.renderers import (
     REQUEST_JSONAPI_INCLUDED_ATTR,
     REQUEST_JSONAPI_LINKS_ATTR,
@@ -174,7 +175,7 @@ def _build_page_url(request: HttpRequest, page_params: dict[str, str]) -> str:
     qs = urlencode(merged, doseq=True)
     # JSON:API convention: keep brackets unencoded in query strings
     qs = qs.replace("%5B", "[").replace("%5D", "]")
-    base = request.build_absolute_uri(request.path)
+    base = LinkBuilder.for_request(request).url(request.path)
     return f"{base}?{qs}" if qs else base
 
 
@@ -7,7 +7,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from inspect import isclass
 from types import GenericAlias
-from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, Type, Union, get_args
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, Sequence, Type, Union, get_args
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -36,11 +36,13 @@ class BaseJSONAPIRelationshipSchema(BaseModel):
 class BaseJSONAPIRelationshipDataToOneSchema(BaseModel):
     data: BaseJSONAPIRelationshipSchema
     links: Optional[dict[str, Any]] = None
+    meta: Optional[dict[str, Any]] = None
 
 
 class BaseJSONAPIRelationshipDataToManySchema(BaseModel):
     data: list[BaseJSONAPIRelationshipSchema]
     links: Optional[dict[str, Any]] = None
+    meta: Optional[dict[str, Any]] = None
 
 
 class BaseJSONAPIItemSchema(BaseModel):
@@ -79,12 +81,12 @@ class JSONAPIResultListMetaSchema(BaseModel):
     """JSON:API list meta schema."""
 
     model_config = ConfigDict(
-        extra="forbid",
+        extra="allow",
         populate_by_name=True,
     )
 
-    count: Optional[int]
-    total_pages: Optional[int] = Field(alias="totalPages")
+    count: Optional[int] = None
+    total_pages: Optional[int] = Field(default=None, alias="totalPages")
 
 
 class JSONAPIDocumentObjectSchema(BaseModel):
@@ -184,7 +186,7 @@ class SchemasInfoDTO:
 
     relationships_info: dict[str, tuple[RelationshipInfo, Any]]
 
-    field_schemas: dict[str, Type[BaseModel]]
+    field_schemas: Mapping[str, Type[BaseModel]]
 
     model_validators: dict
 
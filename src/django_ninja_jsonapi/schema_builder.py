@@ -1,8 +1,11 @@
 """JSON API schemas builder class."""
 
 import logging
+import re
+from collections.abc import Iterator, Mapping
 from typing import Annotated, Any, Callable, Literal, Optional, Type, TypeVar, Union
 
+from django.core.exceptions import FieldDoesNotExist
 from pydantic import AfterValidator, BeforeValidator, ConfigDict, PlainValidator, WrapValidator, create_model
 from pydantic import BaseModel as PydanticBaseModel
 
@@ -10,6 +13,7 @@ from pydantic import BaseModel as PydanticBaseModel
 from pydantic.fields import FieldInfo
 
 from django_ninja_jsonapi.common import get_relationship_info_from_field_metadata, search_client_can_set_id
+from django_ninja_jsonapi.data_typing import TypeModel
 from django_ninja_jsonapi.inflection import get_formatter as get_inflection_formatter
 from django_ninja_jsonapi.schema import (
     BaseJSONAPIDataInSchema,
@@ -28,13 +32,75 @@ from django_ninja_jsonapi.schema import (
     get_schema_from_field_annotation,
 )
 from django_ninja_jsonapi.schema_base import BaseModel, Field, registry
+from django_ninja_jsonapi.storages.models_storage import models_storage
 from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
 from django_ninja_jsonapi.types_metadata import RelationshipInfo
 from django_ninja_jsonapi.validation_utils import extract_validators
+from django_ninja_jsonapi.views.heavy_fields import (
+    OMIT_UNSET_SERIALIZER,
+    create_omit_unset_serializer,
+    get_omittable_attributes,
+)
 
 log = logging.getLogger(__name__)
 JSONAPIObjectSchemaType = TypeVar("JSONAPIObjectSchemaType", bound=PydanticBaseModel)
 
+# Field schemas without validators, shared by every resource and operation
+# with the same field definition.
+_field_schemas_cache: dict[tuple, Type[PydanticBaseModel]] = {}
+# Relationship data schemas, shared by every relationship to the same resource type.
+_relationship_data_schemas_cache: dict[tuple, RelationshipInfoSchema] = {}
+
+
+class LazyFieldSchemas(Mapping):
+    """
+    Per-attribute schemas used for sparse fieldsets, built on first access.
+
+    Most attributes are never requested through ``fields[...]``, so creating
+    one model per attribute and operation at startup is wasted work.
+    """
+
+    def __init__(self, base_name: str, schema: Type[BaseModel], fields: dict[str, tuple], model_config: ConfigDict):
+        self._base_name = base_name
+        self._schema = schema
+        self._fields = fields
+        self._model_config = model_config
+        self._built: dict[str, Type[PydanticBaseModel]] = {}
+
+    def __getitem__(self, field_name: str) -> Type[PydanticBaseModel]:
+        if (field_schema := self._built.get(field_name)) is not None:
+            return field_schema
+
+        field = self._fields[field_name]
+        field_validators, _ = extract_validators(self._schema, include_for_field_names={field_name})
+        cache_key = None
+        if not field_validators:
+            cache_key = (field_name, *field, *sorted(self._model_config.items()))
+            try:
+                field_schema = _field_schemas_cache.get(cache_key)
+            except TypeError:
+                # unhashable annotation or default
+                cache_key = None
+
+        if field_schema is None:
+            field_schema = create_model(
+                f"{self._base_name}{field_name.title()}AttributeJSONAPI",
+                **{field_name: field},
+                __config__=self._model_config,
+                __validators__=field_validators,
+            )
+            if cache_key is not None:
+                _field_schemas_cache[cache_key] = field_schema
+
+        self._built[field_name] = field_schema
+        return field_schema
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
 
 class SchemaBuilder:
     def __init__(
@@ -218,6 +284,7 @@ class SchemaBuilder:
         schema: Type[BaseModel],
         operation_type: Literal["create", "update", "get"],
         non_optional_relationships: bool = False,
+        model: Optional[Type[TypeModel]] = None,
     ) -> SchemasInfoDTO:
         attributes_schema_fields = {}
         relationships_schema_fields = {}
@@ -283,25 +350,32 @@ class SchemaBuilder:
         )
 
         field_validators, model_validators = extract_validators(schema, exclude_for_field_names={"id"})
+        schema_validators = {**field_validators, **model_validators}
+        if operation_type == "get":
+            # heavy fields are left out of list responses, see ``views/heavy_fields.py``
+            attribute_fields = {name: schema.model_fields[name] for name in attributes_schema_fields}
+            omittable = tuple(
+                name for name in get_omittable_attributes(schema, attribute_fields, model) if name not in meta_fields
+            )
+            for name in omittable:
+                if attribute_fields[name].is_required():
+                    attributes_schema_fields[name] = (attributes_schema_fields[name][0], None)
+            if omittable:
+                schema_validators[OMIT_UNSET_SERIALIZER] = create_omit_unset_serializer(omittable)
+
         attributes_schema = create_model(  # ty: ignore[no-matching-overload]
             f"{base_name}AttributesJSONAPI",
             **attributes_schema_fields,
             __config__=model_config,
-            __validators__={**field_validators, **model_validators},
+            __validators__=schema_validators,
         )
 
-        field_schemas = {}
-        for field_name, field in attributes_schema_fields.items():
-            field_validators, _ = extract_validators(
-                schema,
-                include_for_field_names={field_name},
-            )
-            field_schemas[field_name] = create_model(
-                f"{base_name}{field_name.title()}AttributeJSONAPI",
-                **{field_name: field},
-                __config__=model_config,
-                __validators__=field_validators,
-            )
+        field_schemas = LazyFieldSchemas(
+            base_name=base_name,
+            schema=schema,
+            fields=attributes_schema_fields,
+            model_config=model_config,
+        )
 
         relationships_schema = create_model(
             f"{base_name}RelationshipsJSONAPI",
@@ -321,6 +395,53 @@ class SchemaBuilder:
             meta_fields=meta_fields,
         )
 
+    @classmethod
+    def get_shared_relationship_data_schema(
+        cls,
+        relationship_info: RelationshipInfo,
+        required: bool,
+    ) -> RelationshipInfoSchema:
+        """
+        Return the relationship data schema pointing at a resource type.
+
+        The schema only depends on the target resource type, so it's shared by
+        every relationship to that type and appears once in the OpenAPI components.
+        """
+        cache_key = (
+            relationship_info.resource_type,
+            relationship_info.resource_id_example,
+            relationship_info.many,
+            required,
+        )
+        if (relationship_data_schema := _relationship_data_schemas_cache.get(cache_key)) is not None:
+            return relationship_data_schema
+
+        schema_name = "".join(part.title() for part in re.split(r"[^0-9a-zA-Z]+", relationship_info.resource_type))
+        relationship_schema = cls.create_relationship_schema(
+            name=f"{schema_name}Identifier",
+            relationship_info=relationship_info,
+        )
+        base = BaseJSONAPIRelationshipDataToOneSchema
+        cardinality = "ToOne"
+        if relationship_info.many:
+            relationship_schema = list[relationship_schema]  # ty: ignore[invalid-type-form]
+            base = BaseJSONAPIRelationshipDataToManySchema
+            cardinality = "ToMany"
+        elif not required:
+            relationship_schema = Optional[relationship_schema]  # ty: ignore[invalid-type-form]
+            cardinality = "OptionalToOne"
+
+        relationship_data_schema = create_model(
+            f"{schema_name}{cardinality}RelationshipDataJSONAPI",
+            # Note: on create (post request) the relationship may be required,
+            # while on fetch it's always optional. Currently using field.is_required()
+            # for both — acceptable for pragmatic use.
+            data=(relationship_schema, Field(... if required else None)),
+            __base__=base,
+        )
+        _relationship_data_schemas_cache[cache_key] = relationship_data_schema
+        return relationship_data_schema
+
     @classmethod
     def create_relationship_schema(
         cls,
@@ -367,26 +488,9 @@ class SchemaBuilder:
         ):
             return relationship_schema
 
-        base_name = base_name.removesuffix("Schema")
-        schema_name = f"{base_name}{field_name.title()}"
-        relationship_schema = self.create_relationship_schema(
-            name=schema_name,
+        relationship_data_schema = self.get_shared_relationship_data_schema(
             relationship_info=relationship_info,
-        )
-        base = BaseJSONAPIRelationshipDataToOneSchema
-        if relationship_info.many:
-            relationship_schema = list[relationship_schema]  # ty: ignore[invalid-type-form]
-            base = BaseJSONAPIRelationshipDataToManySchema
-        elif not field.is_required():
-            relationship_schema = Optional[relationship_schema]  # ty: ignore[invalid-type-form]
-
-        relationship_data_schema = create_model(
-            f"{schema_name}RelationshipDataJSONAPI",
-            # Note: on create (post request) the relationship may be required,
-            # while on fetch it's always optional. Currently using field.is_required()
-            # for both — acceptable for pragmatic use.
-            data=(relationship_schema, Field(... if field.is_required() else None)),
-            __base__=base,
+            required=field.is_required(),
         )
 
         schemas_storage.add_relationship(
@@ -444,14 +548,31 @@ class SchemaBuilder:
     def find_all_included_schemas(
         self,
         included_schemas: list[tuple[str, Type[BaseModel], str]],
+        model: Optional[Type[TypeModel]] = None,
+        relationships_info: Optional[dict[str, tuple[RelationshipInfo, Any]]] = None,
     ) -> dict[str, Type[JSONAPIObjectSchema]]:
-        return {
-            name: self.create_jsonapi_object_schemas(
+        result = {}
+        for name, included_schema, resource_type in included_schemas:
+            included_model = None
+            if not models_storage.has_model(resource_type) and model is not None and relationships_info:
+                # the included resource type may be registered later, find its model through the relationship
+                relationship_info = relationships_info[name][0]
+                included_model = self._get_related_model(model, relationship_info.model_field_name or name)
+
+            result[name] = self.create_jsonapi_object_schemas(
                 included_schema,
                 resource_type=resource_type,
+                model=included_model,
             ).object_jsonapi_schema
-            for (name, included_schema, resource_type) in included_schemas
-        }
+
+        return result
+
+    @staticmethod
+    def _get_related_model(model: Type[TypeModel], field_name: str) -> Optional[Type[TypeModel]]:
+        try:
+            return model._meta.get_field(field_name).related_model  # ty: ignore[unresolved-attribute]
+        except (AttributeError, FieldDoesNotExist):
+            return None
 
     def create_jsonapi_object_schemas(
         self,
@@ -459,7 +580,15 @@ class SchemaBuilder:
         resource_type: Optional[str] = None,
         base_name: str = "",
         compute_included_schemas: bool = False,
+        model: Optional[Type[TypeModel]] = None,
     ) -> JSONAPIObjectSchemas:
+        """
+        Build the ``get`` object schemas of a resource type.
+
+        :param model: the Django model of the resource type, looked up in the
+            models storage when not given; heavy attributes are resolved
+            against it.
+        """
         resource_type = resource_type or self._resource_type
 
         if object_schema := schemas_storage.get_jsonapi_object_schema(
@@ -469,11 +598,14 @@ class SchemaBuilder:
             return object_schema
 
         base_name = base_name or schema.__name__
+        if model is None and models_storage.has_model(resource_type):
+            model = models_storage.get_model(resource_type)
 
         dto = self.get_info_from_schema_for_building(
             base_name=base_name,
             operation_type="get",
             schema=schema,
+            model=model,
         )
 
         object_jsonapi_schema = self.build_jsonapi_object(
@@ -503,7 +635,11 @@ class SchemaBuilder:
 
         can_be_included_schemas = {}
         if compute_included_schemas:
-            can_be_included_schemas = self.find_all_included_schemas(included_schemas=dto.included_schemas)  # ty: ignore[invalid-argument-type]
+            can_be_included_schemas = self.find_all_included_schemas(
+                included_schemas=dto.included_schemas,  # ty: ignore[invalid-argument-type]
+                model=model,
+                relationships_info=dto.relationships_info,
+            )
 
         result = JSONAPIObjectSchemas(
             attributes_schema=dto.attributes_schema,
@@ -20,6 +20,9 @@ class ModelsStorage:
         self._id_field_names[resource_type] = id_field_name
         self._resource_paths[resource_type] = resource_path
 
+    def has_model(self, resource_type: str) -> bool:
+        return resource_type in self._models
+
     def get_model(self, resource_type: str) -> Type[TypeModel]:
         try:
             return self._models[resource_type]
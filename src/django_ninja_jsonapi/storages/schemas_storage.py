@@ -1,4 +1,5 @@
 from collections import defaultdict
+from collections.abc import Mapping
 from typing import Any, Literal, Optional, Type
 
 from django_ninja_jsonapi.data_typing import TypeSchema
@@ -59,7 +60,7 @@ class SchemasStorage:
         source_schema: Type[TypeSchema],
         data_schema: Type[TypeSchema],
         attributes_schema: Type[TypeSchema],
-        field_schemas: dict[str, Type[TypeSchema]],
+        field_schemas: Mapping[str, Type[TypeSchema]],
         relationships_info: dict[str, tuple[RelationshipInfo, Any]],
         model_validators: dict,
         meta_fields: Optional[list[str]] = None,
@@ -78,6 +79,7 @@ class SchemasStorage:
 
         self._source_schemas[resource_type] = source_schema
         self._data[resource_type][operation_type] = {
+            "source_schema": source_schema,
             "attrs_schema": attributes_schema,
             "field_schemas": field_schemas,
             "data_schema": data_schema,
@@ -100,6 +102,15 @@ class SchemasStorage:
         except KeyError as ex:
             raise InternalServerError(detail=f"Not found source schema for resource type {resource_type!r}") from ex
 
+    def get_source_schemas(self, resource_type: str) -> list[Type[TypeSchema]]:
+        """Return the source schemas of every operation of a resource type."""
+        operations = self._data.get(resource_type, {})
+        return [
+            operations[operation_type]["source_schema"]
+            for operation_type in ("get", "create", "update")
+            if operation_type in operations
+        ]
+
     def get_source_relationship_pydantic_field(
         self,
         resource_type: str,
@@ -130,6 +141,13 @@ class SchemasStorage:
     ) -> Optional[TypeSchema]:
         return self._data[resource_type][operation_type]["field_schemas"].get(field_name)
 
+    def get_field_schemas(
+        self,
+        resource_type: str,
+        operation_type: Literal["create", "update", "get"],
+    ) -> Mapping[str, Type[TypeSchema]]:
+        return self._data[resource_type][operation_type]["field_schemas"]
+
     def get_schema_in(
         self,
         resource_type: str,
@@ -26,5 +26,8 @@ class ViewStorage:
     def has_view(self, resource_type: str) -> bool:
         return resource_type in self._views
 
+    def get_resource_types(self) -> list[str]:
+        return list(self._views)
+
 
 views_storage = ViewStorage()
@@ -4,6 +4,7 @@ from django_ninja_jsonapi.views.schemas import OperationConfig, RelationshipRequ
 __all__ = [
     "Operation",
     "OperationConfig",
+    "QueryField",
     "RelationshipRequestInfo",
     "ViewBase",
 ]
@@ -15,5 +16,10 @@ def __getattr__(name: str):
 
         return ViewBase
 
+    if name == "QueryField":
+        from django_ninja_jsonapi.views.query_allowlist import QueryField
+
+        return QueryField
+
     msg = f"module {__name__!r} has no attribute {name!r}"
     raise AttributeError(msg)
@@ -0,0 +1,163 @@
+"""
+Columns left out of collection reads unless a client asks for them.
+
+Large text, JSON and binary columns are read and serialized for every row of
+a list even when clients never look at them.  Declare them on the schema::
+
+    class ArticleSchema(BaseModel):
+        id: int
+        title: str
+        body: str
+
+        class JSONAPIMeta:
+            heavy_fields = ["body"]
+            # or infer them from the model: every ``TextField``,
+            # ``JSONField`` and ``BinaryField`` attribute
+            # heavy_fields = "auto"
+
+List endpoints then ``defer()`` these columns and leave them out of
+``attributes``.  They are returned when named in ``fields[...]`` and on
+detail reads.  Heavy attributes are optional in the response schema, so
+OpenAPI clients know they may be missing.
+"""
+
+from __future__ import annotations
+
+import types
+from functools import lru_cache
+from typing import Any, Optional, Type, Union, get_args, get_origin
+
+from django.db.models import BinaryField, JSONField, TextField
+from pydantic import BaseModel, model_serializer
+from pydantic.fields import FieldInfo
+
+from django_ninja_jsonapi.data_typing import TypeModel
+from django_ninja_jsonapi.storages.models_storage import models_storage
+from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
+
+AUTO_HEAVY_FIELDS = "auto"
+HEAVY_FIELD_TYPES = (TextField, JSONField, BinaryField)
+# schema types ``heavy_fields = "auto"`` may find a heavy column behind,
+# used while the model of a resource type isn't known
+HEAVY_ANNOTATIONS: tuple[Any, ...] = (Any, str, bytes, dict, list)
+# name of the serializer added to attributes schemas with heavy fields
+OMIT_UNSET_SERIALIZER = "omit_unset_heavy_fields"
+
+
+def get_declared_heavy_fields(schema: type) -> Union[str, tuple[str, ...]]:
+    """Return the ``heavy_fields`` of a schema's ``JSONAPIMeta`` (or ``Meta``)."""
+    for meta_attr in ("JSONAPIMeta", "Meta"):
+        heavy_fields = getattr(getattr(schema, meta_attr, None), "heavy_fields", None)
+        if heavy_fields:
+            return heavy_fields if heavy_fields == AUTO_HEAVY_FIELDS else tuple(heavy_fields)
+
+    return ()
+
+
+def _unwrap_annotation(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+
+    return get_origin(annotation) or annotation
+
+
+def _get_heavy_columns(model: Type[TypeModel]) -> set[str]:
+    return {
+        field.attname
+        for field in model._meta.concrete_fields  # ty: ignore[unresolved-attribute]
+        if not field.is_relation and isinstance(field, HEAVY_FIELD_TYPES)
+    }
+
+
+def get_omittable_attributes(
+    schema: Type[BaseModel],
+    fields: dict[str, FieldInfo],
+    model: Optional[Type[TypeModel]] = None,
+) -> tuple[str, ...]:
+    """
+    Return the attributes of ``schema`` that responses may leave out.
+
+    ``heavy_fields = "auto"`` is resolved against the column types of
+    ``model``.  Without a Django model every attribute whose type may hold a
+    heavy column is omittable.
+    """
+    declared = get_declared_heavy_fields(schema)
+    if declared == AUTO_HEAVY_FIELDS:
+        if getattr(model, "_meta", None) is not None:
+            heavy_columns = _get_heavy_columns(model)  # ty: ignore[invalid-argument-type]
+            return tuple(name for name in fields if name in heavy_columns)
+
+        return tuple(
+            name for name, field in fields.items() if _unwrap_annotation(field.annotation) in HEAVY_ANNOTATIONS
+        )
+
+    return tuple(name for name in declared if name in fields)
+
+
+def create_omit_unset_serializer(names: tuple[str, ...]):
+    """Serializer dropping the attributes among ``names`` that were left out of the response."""
+
+    @model_serializer(mode="wrap")
+    def omit_unset(self, handler):
+        data = handler(self)
+        fields = type(self).model_fields
+        for name in names:
+            if name not in self.model_fields_set:
+                data.pop(name, None)
+                data.pop(fields[name].alias, None)
+        return data
+
+    return omit_unset
+
+
+@lru_cache(maxsize=None)
+def build_heavy_fields(
+    model: Type[TypeModel],
+    declared: Union[str, tuple[str, ...]],
+    attributes: tuple[str, ...],
+    meta_fields: tuple[str, ...],
+) -> tuple[str, ...]:
+    """
+    Resolve the heavy fields of a resource to the attributes to defer.
+
+    Meta fields are always read, so they are never deferred.
+
+    :param attributes: the attributes responses may leave out.
+    :raises ValueError: if a declared field is not a model column among the attributes.
+    """
+    if not declared or getattr(model, "_meta", None) is None:
+        return ()
+
+    if declared == AUTO_HEAVY_FIELDS:
+        heavy_columns = _get_heavy_columns(model)
+        return tuple(name for name in attributes if name not in meta_fields and name in heavy_columns)
+
+    columns = {field.attname for field in model._meta.concrete_fields if not field.is_relation}  # ty: ignore[unresolved-attribute]
+
+    for name in declared:
+        if name not in columns or name not in attributes:
+            msg = f"Heavy field {name!r} is not a column attribute of {model.__name__}"
+            raise ValueError(msg)
+
+    return tuple(name for name in declared if name not in meta_fields)
+
+
+def get_heavy_fields(resource_type: str) -> tuple[str, ...]:
+    """Return the attributes a registered resource defers on collection reads."""
+    if not schemas_storage.has_operation(resource_type, "get"):
+        return ()
+
+    schema = schemas_storage.get_source_schema(resource_type)
+    if not (declared := get_declared_heavy_fields(schema)):
+        return ()
+
+    attrs_schema = schemas_storage.get_attrs_schema(resource_type, operation_type="get")
+    model = models_storage.get_model(resource_type)
+    return build_heavy_fields(
+        model,
+        declared,
+        get_omittable_attributes(schema, attrs_schema.model_fields, model),
+        tuple(schemas_storage.get_meta_fields(resource_type, operation_type="get")),
+    )
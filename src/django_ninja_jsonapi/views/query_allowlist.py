@@ -0,0 +1,196 @@
+"""
+Per-resource allowlist of the filters and sorts clients may use.
+
+Without an allowlist any model field, including fields of related models
+(``owner.name``), can be filtered with any operator and sorted on.  Declare
+the allowed fields on the view to reject everything else with ``400`` before
+a query is built::
+
+    class ComputerView(ViewBaseGeneric):
+        query_allowlist = {
+            "serial": QueryField(operators=("eq", "in"), sortable=True),
+            "owner.name": QueryField(operators=("eq",)),
+            "created_at": QueryField(operators=("lt", "le", "gt", "ge"), sortable=True),
+            "status": QueryField(aggregates=("count_by",)),
+        }
+        large_resource = True
+
+Views with ``large_resource = True`` also refuse ``like``/``ilike`` filters
+and sorts on columns no index starts with, whether or not they have an
+allowlist.  ``meta[aggregate]`` is only accepted for the functions and fields
+an allowlist names.  Allowlists are compiled once per declaration, when the
+application is initialized.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Type
+
+from django_ninja_jsonapi.data_layers.django_orm.query_building import get_to_many_hop
+from django_ninja_jsonapi.data_layers.django_orm.search import RANK_FIELD, SEARCH_NAME
+from django_ninja_jsonapi.data_typing import TypeModel
+from django_ninja_jsonapi.exceptions import InvalidAggregate, InvalidFilters, InvalidSort
+from django_ninja_jsonapi.index_advisor import get_existing_indexes, resolve_field_path
+from django_ninja_jsonapi.querystring import META_AGGREGATES, get_filter_leaves, parse_sort_field
+
+FILTER_OPERATORS = ("eq", "ne", "lt", "le", "gt", "ge", "in", "not_in", "like", "ilike", "is_null", "search")
+# ``filter[search]`` and ``sort=-rank`` of views with full-text search
+SEARCH_FIELDS = frozenset((SEARCH_NAME, RANK_FIELD))
+# can't be served by a B-tree index
+SCAN_OPERATORS = frozenset(("like", "ilike"))
+
+
+@dataclass(frozen=True)
+class QueryField:
+    operators: tuple[str, ...] = ()
+    sortable: bool = False
+    # ``meta[aggregate]`` functions, e.g. ``("sum", "avg")``
+    aggregates: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "operators", tuple(self.operators))
+        object.__setattr__(self, "aggregates", tuple(self.aggregates))
+        if unknown := [operator for operator in self.operators if operator not in FILTER_OPERATORS]:
+            msg = f"Unknown filter operators {unknown!r}. Must be any of {FILTER_OPERATORS!r}."
+            raise ValueError(msg)
+        if unknown := [function for function in self.aggregates if function not in META_AGGREGATES]:
+            msg = f"Unknown aggregates {unknown!r}. Must be any of {META_AGGREGATES!r}."
+            raise ValueError(msg)
+
+
+# large resources without an allowlist look up raw client sort paths, so bounded
+@lru_cache(maxsize=1024)
+def is_sort_indexed(model: Type[TypeModel], path: str) -> Optional[bool]:
+    """Whether an index starts with the column ``path`` ends at; ``None`` if it isn't a model column."""
+    if getattr(model, "_meta", None) is None or (resolved := resolve_field_path(model, path)) is None:
+        return None
+
+    related_model, field_name = resolved
+    return any(columns[0] == field_name for columns in get_existing_indexes(related_model))
+
+
+def _is_model_path(model: Type[TypeModel], path: str) -> bool:
+    """Whether ``path`` is a field, a to-many relationship or an aggregate sort of ``model``."""
+    if resolve_field_path(model, path) is not None or get_to_many_hop(model, path) is not None:
+        return True
+
+    aggregate, field_path = parse_sort_field(path)
+    return aggregate is not None and get_to_many_hop(model, field_path) is not None
+
+
+@dataclass(frozen=True)
+class QueryAllowlist:
+    model: Type[TypeModel]
+    # ``None``: any field and operator
+    operators: Optional[Mapping[str, frozenset[str]]] = None
+    sortable: Optional[frozenset[str]] = None
+    large_resource: bool = False
+    # ``None``: no aggregates
+    aggregates: Optional[Mapping[str, frozenset[str]]] = None
+
+    def _check_filter(self, resource_type: str, name: Any, operator: Any):
+        if self.operators is not None:
+            if name not in self.operators:
+                msg = f"Filtering on {name!r} is not allowed for resource type {resource_type!r}"
+                raise InvalidFilters(msg)
+            if operator not in self.operators[name]:
+                msg = f"Operator {operator!r} is not allowed on {name!r} for resource type {resource_type!r}"
+                raise InvalidFilters(msg)
+
+        if self.large_resource and operator in SCAN_OPERATORS:
+            msg = f"Operator {operator!r} is not allowed for resource type {resource_type!r}"
+            raise InvalidFilters(msg)
+
+    def _check_sort(self, resource_type: str, path: str):
+        if self.sortable is not None and path not in self.sortable:
+            msg = f"Sorting by {path!r} is not allowed for resource type {resource_type!r}"
+            raise InvalidSort(msg)
+
+        if self.large_resource and is_sort_indexed(self.model, path) is False:
+            msg = f"Sorting by {path!r} requires an index for resource type {resource_type!r}"
+            raise InvalidSort(msg)
+
+    def check_aggregates(self, resource_type: str, aggregates: Iterable[tuple[str, str]]):
+        """
+        Check the ``meta[aggregate]`` functions and fields of a request.
+
+        :raises InvalidAggregate: if an aggregate is not allowed.
+        """
+        for function, path in aggregates:
+            if self.aggregates is None or function not in self.aggregates.get(path, ()):
+                msg = f"Aggregate {function!r} of {path!r} is not allowed for resource type {resource_type!r}"
+                raise InvalidAggregate(msg)
+
+    def validate(
+        self,
+        resource_type: str,
+        filters: Iterable[dict[str, Any]],
+        sorts: Iterable[dict[str, Any]],
+        aggregates: Iterable[tuple[str, str]] = (),
+    ):
+        """
+        Check the filter conditions, sorts and aggregates of a request.
+
+        :raises InvalidFilters: if a filter field or operator is not allowed.
+        :raises InvalidSort: if a sort field is not allowed.
+        :raises InvalidAggregate: if an aggregate is not allowed.
+        """
+        for name, operator in get_filter_leaves(filters):
+            self._check_filter(resource_type, name, operator)
+
+        for item in sorts:
+            self._check_sort(resource_type, item["field"])
+
+        self.check_aggregates(resource_type, aggregates)
+
+
+@lru_cache(maxsize=None)
+def build_query_allowlist(
+    model: Type[TypeModel],
+    fields: Optional[tuple[tuple[str, QueryField], ...]],
+    large_resource: bool,
+    virtual_fields: frozenset[str] = frozenset(),
+) -> Optional[QueryAllowlist]:
+    """
+    Compile a view's declaration, or return ``None`` if it doesn't restrict anything.
+
+    :param virtual_fields: allowlisted names that aren't model fields, such as ``search`` or computed fields.
+    :raises ValueError: if an allowlisted field is not a field of ``model``.
+    """
+    if fields is None and not large_resource:
+        return None
+
+    if fields is None:
+        return QueryAllowlist(model=model, large_resource=large_resource)
+
+    has_meta = getattr(model, "_meta", None) is not None
+    for path, query_field in fields:
+        if has_meta and path not in virtual_fields and not _is_model_path(model, path):
+            msg = f"Allowlisted field {path!r} is not a field of {model.__name__}"
+            raise ValueError(msg)
+
+        if large_resource and query_field.sortable:
+            # looked up once, requests hit the cache
+            is_sort_indexed(model, path)
+
+    return QueryAllowlist(
+        model=model,
+        operators={path: frozenset(query_field.operators) for path, query_field in fields},
+        sortable=frozenset(path for path, query_field in fields if query_field.sortable),
+        large_resource=large_resource,
+        aggregates={path: frozenset(query_field.aggregates) for path, query_field in fields},
+    )
+
+
+def get_query_allowlist(view: type, model: Type[TypeModel]) -> Optional[QueryAllowlist]:
+    """Return the compiled allowlist declared on ``view``, if it has one."""
+    fields: Optional[dict[str, QueryField]] = getattr(view, "query_allowlist", None)
+    return build_query_allowlist(
+        model,
+        tuple(sorted(fields.items())) if fields is not None else None,
+        getattr(view, "large_resource", False),
+        frozenset(getattr(view, "computed_fields", {}))
+        | (SEARCH_FIELDS if getattr(view, "full_text_search", None) is not None else frozenset()),
+    )
@@ -0,0 +1,153 @@
+"""
+Build resource objects straight from ``QuerySet.values()`` rows.
+
+Used by views with ``trusted_read = True``: when the ``get`` attributes schema
+is a plain mapping of model columns (no validators, serializers, aliases or
+nested types) the list endpoint skips model instantiation and Pydantic
+validation.  Values are only coerced for ``str``/``int``/``float``/``bool``
+fields whose database type differs; everything else is trusted as returned by
+the database driver.
+"""
+
+from __future__ import annotations
+
+import types
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional, Type, Union, get_args, get_origin
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from django_ninja_jsonapi.data_typing import TypeModel
+from django_ninja_jsonapi.storages.models_storage import models_storage
+from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
+from django_ninja_jsonapi.views.heavy_fields import OMIT_UNSET_SERIALIZER
+
+COERCIBLE_TYPES: tuple[type, ...] = (str, int, float, bool)
+TRUSTED_TYPES: tuple[Any, ...] = (Any, Decimal, datetime, date, time, UUID)
+# model config keys that change how values are validated or dumped
+VALUE_CHANGING_CONFIG_KEYS = (
+    "str_strip_whitespace",
+    "str_to_lower",
+    "str_to_upper",
+    "str_max_length",
+    "str_min_length",
+    "coerce_numbers_to_str",
+    "use_enum_values",
+    "strict",
+)
+
+
+@dataclass(frozen=True)
+class ValuesRowPlan:
+    id_column: str
+    # (attribute name, coercion type or ``None``)
+    attributes: tuple[tuple[str, Optional[type]], ...]
+    meta_fields: tuple[str, ...]
+
+    @property
+    def columns(self) -> list[str]:
+        columns = [self.id_column]
+        for name in (*(name for name, _ in self.attributes), *self.meta_fields):
+            if name not in columns:
+                columns.append(name)
+        return columns
+
+    def build(self, row: dict[str, Any], resource_type: str) -> dict:
+        attributes = {}
+        for name, coerce_to in self.attributes:
+            value = row[name]
+            if coerce_to is not None and value is not None and type(value) is not coerce_to:
+                value = coerce_to(value)
+            attributes[name] = value
+
+        resource_meta = {name: row[name] for name in self.meta_fields}
+        return {
+            "type": resource_type,
+            "attributes": attributes,
+            "links": {},
+            "meta": resource_meta or None,
+            "id": f"{row[self.id_column]}",
+        }
+
+
+def _has_custom_hooks(schema: Type[BaseModel]) -> bool:
+    decorators = schema.__pydantic_decorators__
+    return any(
+        (
+            decorators.validators,
+            decorators.field_validators,
+            decorators.root_validators,
+            decorators.field_serializers,
+            # the serializer of heavy fields only drops attributes left out of the row
+            {name: value for name, value in decorators.model_serializers.items() if name != OMIT_UNSET_SERIALIZER},
+            decorators.model_validators,
+            decorators.computed_fields,
+        )
+    )
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def build_values_row_plan(
+    model: Type[TypeModel],
+    attrs_schema: Type[BaseModel],
+    meta_fields: tuple[str, ...],
+    id_column: str,
+) -> Optional[ValuesRowPlan]:
+    """
+    Return the row plan of a resource, or ``None`` if its attributes can't be read from ``values()`` rows.
+
+    Model validators registered for the resource are checked by the caller.
+    """
+    if _has_custom_hooks(attrs_schema) or any(attrs_schema.model_config.get(key) for key in VALUE_CHANGING_CONFIG_KEYS):
+        return None
+
+    concrete_columns = {
+        field.attname: field
+        for field in model._meta.concrete_fields  # ty: ignore[unresolved-attribute]
+        if not field.is_relation
+    }
+    if id_column not in concrete_columns:
+        return None
+
+    attributes = []
+    for name, field in attrs_schema.model_fields.items():
+        if field.alias not in (None, name) or field.metadata or name not in concrete_columns:
+            return None
+
+        annotation = _unwrap_optional(field.annotation)
+        if annotation not in COERCIBLE_TYPES and annotation not in TRUSTED_TYPES:
+            return None
+
+        if name not in meta_fields:
+            attributes.append((name, annotation if annotation in COERCIBLE_TYPES else None))
+
+    if any(name not in concrete_columns for name in meta_fields):
+        return None
+
+    return ValuesRowPlan(id_column=id_column, attributes=tuple(attributes), meta_fields=meta_fields)
+
+
+def get_values_row_plan(resource_type: str) -> Optional[ValuesRowPlan]:
+    """Return the row plan of a registered resource's ``get`` schema, if it has one."""
+    if any(schemas_storage.get_model_validators(resource_type, operation_type="get")):
+        return None
+
+    return build_values_row_plan(
+        models_storage.get_model(resource_type),
+        schemas_storage.get_attrs_schema(resource_type, operation_type="get"),
+        tuple(schemas_storage.get_meta_fields(resource_type, operation_type="get")),
+        models_storage.get_model_id_field_name(resource_type),
+    )
@@ -1,29 +1,57 @@
 import asyncio
 import inspect
 import logging
+from collections.abc import Iterable
+from dataclasses import replace
 from functools import partial
 from typing import Any, ClassVar, Optional, Type
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
+from asgiref.sync import sync_to_async
 from django.http import HttpRequest as Request
+from django.http import HttpResponse
 from pydantic import BaseModel as PydanticBaseModel
 
-from django_ninja_jsonapi.common import get_relationship_info_from_field_metadata
+from django_ninja_jsonapi.common import get_limited_include_attr_name, get_relationship_info_from_field_metadata
 from django_ninja_jsonapi.data_layers.base import BaseDataLayer
+from django_ninja_jsonapi.data_layers.django_orm.search import FullTextSearch
 from django_ninja_jsonapi.data_typing import TypeModel, TypeSchema
-from django_ninja_jsonapi.exceptions import BadRequest, InvalidInclude
-from django_ninja_jsonapi.inflection import format_keys
+from django_ninja_jsonapi.diagnostics import (
+    diagnostics_stage,
+    finish_request_diagnostics,
+    install_query_recorder,
+    instrument_data_layer,
+    start_request_diagnostics,
+)
+from django_ninja_jsonapi.exceptions import BadRequest, InvalidAggregate, InvalidInclude
+from django_ninja_jsonapi.fragment_cache import (
+    FragmentCache,
+    FragmentLookup,
+    encode_fragment,
+    get_fieldset_key,
+    get_version_field,
+)
+from django_ninja_jsonapi.inflection import format_keys, get_nested_inflection
 from django_ninja_jsonapi.inflection import get_formatter as get_inflection_formatter
+from django_ninja_jsonapi.links import LinkBuilder
+from django_ninja_jsonapi.metrics import finish_request_metrics, start_request_metrics
+from django_ninja_jsonapi.query_cost import QueryCost, QueryCostEstimator
 from django_ninja_jsonapi.querystring import QueryStringManager
+from django_ninja_jsonapi.renderers import JSONAPI_MEDIA_TYPE
 from django_ninja_jsonapi.schema import BaseJSONAPIItemInSchema
 from django_ninja_jsonapi.storages.models_storage import models_storage
 from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
 from django_ninja_jsonapi.types_metadata import RelationshipInfo
 from django_ninja_jsonapi.views.enums import Operation
+from django_ninja_jsonapi.views.heavy_fields import get_heavy_fields
+from django_ninja_jsonapi.views.query_allowlist import QueryAllowlist, QueryField, get_query_allowlist
 from django_ninja_jsonapi.views.schemas import OperationConfig, RelationshipRequestInfo
+from django_ninja_jsonapi.views.values_rows import ValuesRowPlan, get_values_row_plan
 
 logger = logging.getLogger(__name__)
 
+# collection count of ``HEAD`` responses
+COUNT_HEADER = "X-Total-Count"
+
 
 class ViewBase:
     """
@@ -34,7 +62,18 @@ class ViewBase:
     operation_dependencies: ClassVar[dict[Operation, OperationConfig]] = {}
     select_for_includes: ClassVar[dict[str, list[str]]] = {}
     prefetch_for_includes: ClassVar[dict[str, list[str]]] = {}
+    include_limits: ClassVar[dict[str, int]] = {}
+    include_ordering: ClassVar[dict[str, list[str]]] = {}
     django_filterset_class: ClassVar[Optional[type]] = None
+    # allowed filter fields, operators and sorts, see ``views/query_allowlist.py``
+    query_allowlist: ClassVar[Optional[dict[str, QueryField]]] = None
+    large_resource: ClassVar[bool] = False
+    # ``search`` filter and ``rank`` sort, see ``data_layers/django_orm/search.py``
+    full_text_search: ClassVar[Optional[FullTextSearch]] = None
+    # attributes and meta computed by the database, e.g. ``{"computer_count": Count("computers")}``
+    computed_fields: ClassVar[dict[str, Any]] = {}
+    # build list responses from ``values()`` rows, see ``views/values_rows.py``
+    trusted_read: ClassVar[bool] = False
 
     def __init__(
         self,
@@ -53,11 +92,26 @@ class ViewBase:
         self.model: Type[TypeModel] = model
         self.schema: Type[TypeSchema] = schema
         self.options: dict = options
-        self.query_params: QueryStringManager = QueryStringManager(request=request)
-        self.include_jsonapi_object: bool = self.query_params.config.get("INCLUDE_JSONAPI_OBJECT", False)
-        self.jsonapi_version: str = str(self.query_params.config.get("JSONAPI_VERSION", "1.0"))
-        self._api_prefix: Optional[str] = None
-        self._validate_include_paths()
+        self.metrics = start_request_metrics(request, resource_type=resource_type, operation=operation.name.lower())
+        self.diagnostics = start_request_diagnostics(request)
+        with diagnostics_stage("querystring", self.diagnostics):
+            self.query_params: QueryStringManager = QueryStringManager(request=request)
+            self.include_jsonapi_object: bool = self.query_params.config.get("INCLUDE_JSONAPI_OBJECT", False)
+            self.jsonapi_version: str = str(self.query_params.config.get("JSONAPI_VERSION", "1.0"))
+            self.debug_meta: bool = self.query_params.config.get("DEBUG_META", False)
+            self.query_cost: Optional[QueryCost] = None
+            self._api_prefix: Optional[str] = None
+            self._resource_paths: dict[str, str] = {}
+            self.link_builder = LinkBuilder.for_request(request)
+            self._effective_include_limits: Optional[dict[str, int]] = None
+            self._values_row_plan: Optional[ValuesRowPlan] = None
+            self.fragment_cache: Optional[FragmentCache] = FragmentCache.from_settings()
+            self._fragment_keys: dict[FragmentLookup, str] = {}
+            self._fragments: dict[str, dict] = {}
+            self._fragments_to_store: dict[str, dict] = {}
+            self._validate_include_paths()
+            self._validate_query_allowlist()
+            self._enforce_query_cost()
 
     async def get_data_layer(
         self,
@@ -69,17 +123,29 @@ class ViewBase:
         :param extra_view_deps:
         :return:
         """
-        dl_kwargs = await self.handle_endpoint_dependencies(extra_view_deps)
-        return self.data_layer_cls(
+        with diagnostics_stage("dependencies", self.diagnostics):
+            dl_kwargs = await self.handle_endpoint_dependencies(extra_view_deps)
+        dl = self.data_layer_cls(
             request=self.request,
             model=self.model,
             schema=self.schema,
             resource_type=self.resource_type,
             select_for_includes=self.select_for_includes,
             prefetch_for_includes=self.prefetch_for_includes,
+            include_limits=self._get_include_limits(),
+            include_ordering=self.include_ordering,
+            values_fields=self._get_values_fields(),
+            deferred_fields=self._get_deferred_fields(),
             django_filterset_class=self.django_filterset_class,
+            full_text_search=self.full_text_search,
+            computed_fields=self.computed_fields,
             **dl_kwargs,
         )
+        if self.diagnostics is not None:
+            await sync_to_async(install_query_recorder, thread_sensitive=True)()
+            instrument_data_layer(dl, self.diagnostics)
+
+        return dl
 
     async def handle_get_resource_detail(
         self,
@@ -91,7 +157,19 @@ class ViewBase:
         view_kwargs = {dl.url_id_field: obj_id}
         db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
 
-        return self._build_detail_response(db_object)
+        await self._load_fragments([db_object])
+        response = self._build_detail_response(db_object)
+        await self._store_fragments()
+        return response
+
+    async def handle_head_resource_detail(
+        self,
+        obj_id: str,
+        **extra_view_deps,
+    ) -> HttpResponse:
+        dl: BaseDataLayer = await self.get_data_layer(extra_view_deps)
+        await dl.check_object_exists(view_kwargs={dl.url_id_field: obj_id}, qs=self.query_params)
+        return self._build_head_response()
 
     async def handle_get_resource_relationship(
         self,
@@ -129,6 +207,9 @@ class ViewBase:
                 relationship_name=relationship_name,
             ),
         )
+        if self.query_params.count_only:
+            return self._build_count_response(count)
+
         total_pages = self._calculate_total_pages(count)
         return self._build_list_response(items_from_db, count, total_pages)
 
@@ -239,6 +320,9 @@ class ViewBase:
         db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
 
         await dl.update_object(db_object, data_update, view_kwargs)
+        if self.computed_fields:
+            # recomputed from the updated row
+            db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
 
         return self._build_detail_response(db_object)
 
@@ -263,9 +347,20 @@ class ViewBase:
     async def handle_get_resource_list(self, **extra_view_deps) -> dict:
         dl: BaseDataLayer = await self.get_data_layer(extra_view_deps)
         count, items_from_db = await dl.get_collection(qs=self.query_params)
+        if self.query_params.count_only:
+            return self._build_count_response(count)
+
         total_pages = self._calculate_total_pages(count)
 
-        return self._build_list_response(items_from_db, count, total_pages)
+        await self._load_fragments(items_from_db)
+        response = self._build_list_response(items_from_db, count, total_pages)
+        await self._store_fragments()
+        return response
+
+    async def handle_head_resource_list(self, **extra_view_deps) -> HttpResponse:
+        dl: BaseDataLayer = await self.get_data_layer(extra_view_deps)
+        count, _ = await dl.get_collection(qs=self.query_params)
+        return self._build_head_response(count)
 
     async def handle_post_resource_list(
         self,
@@ -279,7 +374,7 @@ class ViewBase:
         db_object = await dl.create_object(data_create=data_create, view_kwargs={})
 
         view_kwargs = {dl.url_id_field: models_storage.get_object_id(db_object, self.resource_type)}
-        if self.query_params.include:
+        if self.query_params.include or self.computed_fields:
             db_object = await dl.get_object(view_kwargs=view_kwargs, qs=self.query_params)
 
         return self._build_detail_response(db_object)
@@ -370,6 +465,140 @@ class ViewBase:
 
                 resource_type = info.resource_type
 
+    def _validate_query_allowlist(self):
+        allowlist = get_query_allowlist(type(self), self.model)
+        aggregates = self.query_params.aggregates
+        if aggregates and self.operation != Operation.GET_LIST:
+            raise InvalidAggregate("Aggregates are only supported on collection reads")
+
+        if allowlist is not None:
+            allowlist.validate(self.resource_type, self.query_params.filters, self.query_params.sorts, aggregates)
+        elif aggregates:
+            QueryAllowlist(model=self.model).check_aggregates(self.resource_type, aggregates)
+
+    def _is_to_many_include_path(self, include_path: str) -> bool:
+        resource_type = self.resource_type
+        info: Optional[RelationshipInfo] = None
+        for relationship_name in include_path.split("."):
+            info = schemas_storage.get_relationship_info(
+                resource_type=resource_type,
+                operation_type="get",
+                field_name=relationship_name,
+            )
+            if info is None:
+                return False
+
+            resource_type = info.resource_type
+
+        return info is not None and info.many
+
+    def _get_include_limits(self) -> dict[str, int]:
+        """
+        Return per-parent limits for to-many include paths of this request.
+
+        Query parameter overrides (``page[include.<path>]``) take precedence over
+        the view's ``include_limits`` and the ``DEFAULT_INCLUDE_LIMIT`` setting.
+        """
+        if self._effective_include_limits is not None:
+            return self._effective_include_limits
+
+        overrides = self.query_params.include_limits
+        if not schemas_storage.has_resource(self.resource_type):
+            self._effective_include_limits = {}
+            return self._effective_include_limits
+
+        default_limit: Optional[int] = self.query_params.config.get("DEFAULT_INCLUDE_LIMIT")
+        limits: dict[str, int] = {}
+        for include_path in self.query_params.include:
+            parts = include_path.split(".")
+            for depth in range(1, len(parts) + 1):
+                path = ".".join(parts[:depth])
+                if path in limits or not self._is_to_many_include_path(path):
+                    continue
+
+                limit = overrides.get(path, self.include_limits.get(path, default_limit))
+                if limit is not None:
+                    limits[path] = limit
+
+        for path in overrides:
+            if path not in limits:
+                raise BadRequest(
+                    detail=f"Include limit {path!r} does not match a requested to-many include",
+                    parameter=f"page[include.{path}]",
+                )
+
+        self._effective_include_limits = limits
+        return limits
+
+    def _enforce_query_cost(self):
+        if "QUERY_COST" not in self.query_params.config and not self.debug_meta:
+            return
+
+        self.query_cost = QueryCostEstimator(
+            query_params=self.query_params,
+            resource_type=self.resource_type,
+            model=self.model,
+            is_collection=self.operation in {Operation.GET_LIST, Operation.DELETE_LIST},
+            include_limits=self._get_include_limits(),
+        ).enforce()
+
+    def _get_values_fields(self) -> Optional[list[str]]:
+        """Columns to fetch with ``values()`` when the list can be built without model instances."""
+        if (
+            not self.trusted_read
+            or self.operation != Operation.GET_LIST
+            or self.query_params.include
+            or self.resource_type in self.query_params.fields
+            or self.query_params.pagination.cursor
+        ):
+            return None
+
+        self._values_row_plan = get_values_row_plan(self.resource_type)
+        if self._values_row_plan is None:
+            return None
+
+        if deferred_fields := self._get_deferred_fields():
+            self._values_row_plan = replace(
+                self._values_row_plan,
+                attributes=tuple(item for item in self._values_row_plan.attributes if item[0] not in deferred_fields),
+            )
+        return self._values_row_plan.columns
+
+    def _get_deferred_fields(self) -> tuple[str, ...]:
+        """Heavy attributes left out of a list without a sparse fieldset, see ``views/heavy_fields.py``."""
+        if self.operation != Operation.GET_LIST or self.resource_type in self.query_params.fields:
+            return ()
+
+        heavy_fields = get_heavy_fields(self.resource_type)
+        if (version_field := get_version_field(self.resource_type)) in heavy_fields:
+            # read by the fragment cache for every object
+            heavy_fields = tuple(name for name in heavy_fields if name != version_field)
+        return heavy_fields
+
+    def _get_debug_meta(self) -> dict[str, Any]:
+        debug: dict[str, Any] = {}
+        if self.query_cost is not None:
+            debug["queryCost"] = self.query_cost.as_dict()
+        if self.diagnostics is not None:
+            debug.update(self.diagnostics.as_debug_meta())
+
+        return debug
+
+    def _record_response_metrics(self, response: dict):
+        if self.metrics is None:
+            return
+
+        data = response["data"]
+        self.metrics.rows = len(data) if isinstance(data, list) else int(data is not None)
+        self.metrics.included = len(response.get("included", []))
+
+    def _apply_debug_meta(self, response: dict) -> dict:
+        if not self.debug_meta:
+            return response
+
+        response["meta"] = {**(response.get("meta") or {}), "debug": self._get_debug_meta()}
+        return response
+
     @staticmethod
     def _normalize_path(path: str) -> str:
         normalized = "/" + path.strip("/")
@@ -386,37 +615,30 @@ class ViewBase:
         return self._api_prefix
 
     def _build_resource_path(self, resource_type: str, resource_id: Optional[str] = None) -> str:
-        base = self._normalize_path(models_storage.get_resource_path(resource_type))
-        prefix = self._get_api_prefix().rstrip("/")
+        if (base := self._resource_paths.get(resource_type)) is None:
+            resource_path = self._normalize_path(models_storage.get_resource_path(resource_type))
+            base = self._resource_paths[resource_type] = self._get_api_prefix().rstrip("/") + resource_path
         if resource_id is None:
-            return f"{prefix}{base}"
+            return base
 
-        return f"{prefix}{base}{resource_id}/"
+        return f"{base}{resource_id}/"
 
-    def _build_relationship_links(self, resource_type: str, resource_id: str, relationship_name: str) -> dict[str, str]:
-        detail_path = self._build_resource_path(resource_type, resource_id)
-        return {
-            "self": self.request.build_absolute_uri(f"{detail_path}relationships/{relationship_name}/"),
-            "related": self.request.build_absolute_uri(f"{detail_path}{relationship_name}/"),
-        }
+    def _build_resource_url(self, resource_type: str, resource_id: str) -> str:
+        return self.link_builder.url(self._build_resource_path(resource_type, resource_id))
 
-    @staticmethod
-    def _replace_query_params(url: str, params: dict[str, Optional[Any]]) -> str:
-        split = urlsplit(url)
-        query = parse_qs(split.query, keep_blank_values=True)
-        for key, value in params.items():
-            if value is None:
-                query.pop(key, None)
-                continue
-            query[key] = [str(value)]
-
-        encoded = urlencode(query, doseq=True)
-        return urlunsplit((split.scheme, split.netloc, split.path, encoded, split.fragment))
+    def _build_relationship_links(
+        self,
+        resource_type: str,
+        resource_id: str,
+        relationship_name: str,
+    ) -> Optional[dict[str, str]]:
+        detail_path = self._build_resource_path(resource_type, resource_id)
+        return self.link_builder.relationship_urls(detail_path, relationship_name)
 
     def _build_pagination_links(self, count: Optional[int], total_pages: Optional[int]) -> dict[str, Optional[str]]:
-        self_url = self.request.build_absolute_uri(self.request.get_full_path())
+        page_url = self.link_builder.page_url
         links: dict[str, Optional[str]] = {
-            "self": self_url,
+            "self": self.link_builder.self_url,
             "first": None,
             "last": None,
             "prev": None,
@@ -425,14 +647,10 @@ class ViewBase:
 
         if self.query_params.pagination.cursor and self.query_params.pagination.size:
             page_size = self.query_params.pagination.size
-            links["first"] = self._replace_query_params(
-                self_url,
-                {"page[cursor]": 0, "page[size]": page_size},
-            )
+            links["first"] = page_url({"page[cursor]": 0, "page[size]": page_size})
             if self.query_params.pagination.next_cursor is not None:
-                links["next"] = self._replace_query_params(
-                    self_url,
-                    {"page[cursor]": self.query_params.pagination.next_cursor, "page[size]": page_size},
+                links["next"] = page_url(
+                    {"page[cursor]": self.query_params.pagination.next_cursor, "page[size]": page_size}
                 )
 
             return links
@@ -442,23 +660,14 @@ class ViewBase:
             page_number = max(1, self.query_params.pagination.number)
             last_page = max(1, total_pages or 1)
 
-            links["first"] = self._replace_query_params(self_url, {"page[number]": 1, "page[size]": page_size})
-            links["last"] = self._replace_query_params(
-                self_url,
-                {"page[number]": last_page, "page[size]": page_size},
-            )
+            links["first"] = page_url({"page[number]": 1, "page[size]": page_size})
+            links["last"] = page_url({"page[number]": last_page, "page[size]": page_size})
 
             if page_number > 1:
-                links["prev"] = self._replace_query_params(
-                    self_url,
-                    {"page[number]": page_number - 1, "page[size]": page_size},
-                )
+                links["prev"] = page_url({"page[number]": page_number - 1, "page[size]": page_size})
 
             if page_number < last_page:
-                links["next"] = self._replace_query_params(
-                    self_url,
-                    {"page[number]": page_number + 1, "page[size]": page_size},
-                )
+                links["next"] = page_url({"page[number]": page_number + 1, "page[size]": page_size})
 
             return links
 
@@ -467,27 +676,131 @@ class ViewBase:
         if count is None or offset is None or limit is None:
             return links
 
-        links["first"] = self._replace_query_params(self_url, {"page[offset]": 0, "page[limit]": limit})
+        links["first"] = page_url({"page[offset]": 0, "page[limit]": limit})
         last_offset = 0 if count == 0 else ((count - 1) // limit) * limit
-        links["last"] = self._replace_query_params(
-            self_url,
-            {"page[offset]": last_offset, "page[limit]": limit},
-        )
+        links["last"] = page_url({"page[offset]": last_offset, "page[limit]": limit})
 
         if offset > 0:
-            links["prev"] = self._replace_query_params(
-                self_url,
-                {"page[offset]": max(0, offset - limit), "page[limit]": limit},
-            )
+            links["prev"] = page_url({"page[offset]": max(0, offset - limit), "page[limit]": limit})
 
         if offset + limit < count:
-            links["next"] = self._replace_query_params(
-                self_url,
-                {"page[offset]": offset + limit, "page[limit]": limit},
-            )
+            links["next"] = page_url({"page[offset]": offset + limit, "page[limit]": limit})
 
         return links
 
+    def _collect_fragment_lookups(
+        self,
+        db_items: list[TypeModel],
+        resource_type: str,
+        field_names: Optional[Iterable[str]],
+        include_paths: list[list[str]],
+        include_fields: dict[str, dict[str, Type[TypeSchema]]],
+        lookups: dict[FragmentLookup, TypeModel],
+    ):
+        """Collect the cacheable objects of the primary data and its includes, like ``_process_includes``."""
+        assert self.fragment_cache is not None
+        if self.fragment_cache.is_cached(resource_type):
+            fieldset_key = get_fieldset_key(field_names)
+            for db_item in db_items:
+                if not isinstance(db_item, dict):
+                    object_id = str(models_storage.get_object_id(db_item, resource_type))
+                    lookups[(resource_type, object_id, fieldset_key)] = db_item
+
+        for target_relationship, *include_path in include_paths:
+            info = schemas_storage.get_relationship_info(
+                resource_type=resource_type,
+                operation_type="get",
+                field_name=target_relationship,
+            )
+            if info is None:
+                continue
+
+            relationship_attr_name = info.model_field_name or target_relationship
+            related_db_items = []
+            for db_item in db_items:
+                value = None
+                if info.many:
+                    value = getattr(db_item, get_limited_include_attr_name(relationship_attr_name), None)
+                if value is None:
+                    value = getattr(db_item, relationship_attr_name, None)
+                if value is None:
+                    continue
+
+                if info.many:
+                    related_db_items.extend(value.all() if hasattr(value, "all") else value)
+                else:
+                    related_db_items.append(value)
+
+            self._collect_fragment_lookups(
+                db_items=related_db_items,
+                resource_type=info.resource_type,
+                # to-one includes are prepared without sparse fieldsets
+                field_names=include_fields.get(info.resource_type) if info.many else None,
+                include_paths=[include_path] if include_path else [],
+                include_fields=include_fields,
+                lookups=lookups,
+            )
+
+    async def _load_fragments(self, db_items: list[TypeModel]):
+        """Fetch the cached resource objects of a response in one batch."""
+        if self.fragment_cache is None:
+            return
+
+        fragment_cache = self.fragment_cache
+        include_fields = self._get_include_fields()
+        include_paths = self._prepare_include_params() if self.query_params.include else []
+
+        def load() -> tuple[dict[FragmentLookup, str], dict[str, dict]]:
+            lookups: dict[FragmentLookup, TypeModel] = {}
+            self._collect_fragment_lookups(
+                db_items=db_items,
+                resource_type=self.resource_type,
+                field_names=include_fields.get(self.resource_type),
+                include_paths=include_paths,
+                include_fields=include_fields,
+                lookups=lookups,
+            )
+            if not lookups:
+                return {}, {}
+
+            keys = fragment_cache.get_keys(lookups)
+            return keys, fragment_cache.get_many(keys.values())
+
+        self._fragment_keys, self._fragments = await sync_to_async(load, thread_sensitive=True)()
+
+    async def _store_fragments(self):
+        if self.fragment_cache is None or not self._fragments_to_store:
+            return
+
+        await sync_to_async(self.fragment_cache.set_many, thread_sensitive=True)(self._fragments_to_store)
+        self._fragments_to_store = {}
+
+    def _get_item_data(
+        self,
+        db_item,
+        resource_type: str,
+        include_fields: Optional[dict[str, dict[str, Type[TypeSchema]]]] = None,
+    ) -> dict:
+        """``_prepare_item_data`` served from the fragments loaded by ``_load_fragments``."""
+        if self.fragment_cache is None or isinstance(db_item, dict) or not self.fragment_cache.is_cached(resource_type):
+            return self._prepare_item_data(db_item, resource_type, include_fields)
+
+        lookup = (
+            resource_type,
+            str(models_storage.get_object_id(db_item, resource_type)),
+            get_fieldset_key(include_fields.get(resource_type) if include_fields else None),
+        )
+        key = self._fragment_keys.get(lookup)
+        if key is not None and (fragment := self._fragments.get(key)) is not None:
+            # links and relationships are added to the response object
+            return {**fragment, "links": {}}
+
+        item_data = self._prepare_item_data(db_item, resource_type, include_fields)
+        if key is not None:
+            self._fragments[key] = self._fragments_to_store[key] = encode_fragment(item_data)
+
+        return item_data
+
     @classmethod
     def _prepare_item_data(
         cls,
@@ -515,6 +828,9 @@ class ViewBase:
             for meta_field in meta_fields:
                 result.get("attributes", {}).pop(meta_field, None)
 
+            if get_nested_inflection() and (inflection := get_inflection_formatter()):
+                result["attributes"] = format_keys(result["attributes"], inflection, nested=True)
+
             if resource_meta:
                 result["meta"] = resource_meta
 
@@ -556,7 +872,7 @@ class ViewBase:
         attrs = {key: value for key, value in result_attributes.items() if key not in meta_fields}
         inflection = get_inflection_formatter()
         if inflection:
-            attrs = format_keys(attrs, inflection)
+            attrs = format_keys(attrs, inflection, nested=get_nested_inflection())
         result = {
             "id": object_id,
             "type": resource_type,
@@ -595,16 +911,16 @@ class ViewBase:
         include_paths: list[list[str]],
         include_fields: dict[str, dict[str, Type[TypeSchema]]],
         result_included: Optional[dict] = None,
+        parent_include_path: str = "",
     ) -> dict[tuple[str, str], dict]:
         result_included = result_included or {}
+        include_limits = self._get_include_limits()
 
         for db_item, item_data in zip(db_items, items_data, strict=False):
             item_data["relationships"] = item_data.get("relationships", {})
-            item_data.setdefault("links", {})["self"] = self.request.build_absolute_uri(
-                self._build_resource_path(
-                    resource_type=resource_type,
-                    resource_id=str(models_storage.get_object_id(db_item, resource_type)),
-                )
+            item_data.setdefault("links", {})["self"] = self._build_resource_url(
+                resource_type=resource_type,
+                resource_id=str(models_storage.get_object_id(db_item, resource_type)),
             )
 
             for path in include_paths:
@@ -622,20 +938,36 @@ class ViewBase:
                         )
                     )
                 relationship_attr_name = info.model_field_name or target_relationship
+                full_include_path = f"{parent_include_path}{target_relationship}"
                 db_items_to_process: list[TypeModel] = []
                 items_data_to_process: list[dict] = []
+                relationship_meta: Optional[dict[str, Any]] = None
 
                 if info.many:
                     relationship_data = []
-                    relationship_db_items = getattr(db_item, relationship_attr_name)
+                    limit = include_limits.get(full_include_path)
+                    relationship_db_items = None
+                    if limit is not None:
+                        relationship_db_items = getattr(
+                            db_item, get_limited_include_attr_name(relationship_attr_name), None
+                        )
+                    if relationship_db_items is None:
+                        relationship_db_items = getattr(db_item, relationship_attr_name)
                     if hasattr(relationship_db_items, "all") and callable(relationship_db_items.all):
                         relationship_db_items = relationship_db_items.all()
 
+                    if limit is not None:
+                        # The data layer fetches one extra row per parent to detect truncation.
+                        relationship_db_items = list(relationship_db_items[: limit + 1])
+                        truncated = len(relationship_db_items) > limit
+                        relationship_db_items = relationship_db_items[:limit]
+                        relationship_meta = {"limit": limit, "truncated": truncated}
+
                     for relationship_db_item in relationship_db_items:
                         include_key = self._get_include_key(relationship_db_item, info)
 
                         if not (relationship_item_data := result_included.get(include_key)):
-                            relationship_item_data = self._prepare_item_data(
+                            relationship_item_data = self._get_item_data(
                                 db_item=relationship_db_item,
                                 resource_type=info.resource_type,
                                 include_fields=include_fields,
@@ -664,7 +996,7 @@ class ViewBase:
                     include_key = self._get_include_key(relationship_db_item, info)
 
                     if not (relationship_item_data := result_included.get(include_key)):
-                        relationship_item_data = self._prepare_item_data(relationship_db_item, info.resource_type)
+                        relationship_item_data = self._get_item_data(relationship_db_item, info.resource_type)
                         result_included[include_key] = relationship_item_data
 
                     items_data_to_process.append(relationship_item_data)
@@ -677,16 +1009,18 @@ class ViewBase:
                         include_paths=[include_path],
                         result_included=result_included,
                         include_fields=include_fields,
+                        parent_include_path=f"{full_include_path}.",
                     )
 
-                item_data["relationships"][target_relationship] = {
-                    "data": relationship_data,
-                    "links": self._build_relationship_links(
-                        resource_type=resource_type,
-                        resource_id=str(models_storage.get_object_id(db_item, resource_type)),
-                        relationship_name=target_relationship,
-                    ),
-                }
+                item_data["relationships"][target_relationship] = {"data": relationship_data}
+                if relationship_links := self._build_relationship_links(
+                    resource_type=resource_type,
+                    resource_id=str(models_storage.get_object_id(db_item, resource_type)),
+                    relationship_name=target_relationship,
+                ):
+                    item_data["relationships"][target_relationship]["links"] = relationship_links
+                if relationship_meta is not None:
+                    item_data["relationships"][target_relationship]["meta"] = relationship_meta
 
         return result_included
 
@@ -704,8 +1038,15 @@ class ViewBase:
         return result
 
     def _get_include_fields(self) -> dict[str, dict[str, Type[TypeSchema]]]:
+        fields = self.query_params.fields
+        if deferred_fields := self._get_deferred_fields():
+            attrs_schema = schemas_storage.get_attrs_schema(self.resource_type, operation_type="get")
+            # the other attributes, as if they were requested with ``fields[...]``
+            default_field_names = [name for name in attrs_schema.model_fields if name not in deferred_fields]
+            fields = {**fields, self.resource_type: default_field_names or [""]}
+
         include_fields = {}
-        for resource_type, field_names in self.query_params.fields.items():
+        for resource_type, field_names in fields.items():
             include_fields[resource_type] = {}
 
             for field_name in field_names:
@@ -719,31 +1060,52 @@ class ViewBase:
 
     def _build_detail_response(self, db_item: TypeModel) -> dict:
         include_fields = self._get_include_fields()
-        item_data = self._prepare_item_data(db_item, self.resource_type, include_fields)
-        item_data.setdefault("links", {})["self"] = self.request.build_absolute_uri(
-            self._build_resource_path(
-                resource_type=self.resource_type,
-                resource_id=str(models_storage.get_object_id(db_item, self.resource_type)),
-            )
+        with diagnostics_stage("serialize", self.diagnostics):
+            item_data = self._get_item_data(db_item, self.resource_type, include_fields)
+        item_data.setdefault("links", {})["self"] = self._build_resource_url(
+            resource_type=self.resource_type,
+            resource_id=str(models_storage.get_object_id(db_item, self.resource_type)),
         )
         response = {
             "data": item_data,
             "meta": None,
-            "links": {"self": self.request.build_absolute_uri(self.request.get_full_path())},
+            "links": {"self": self.link_builder.self_url},
         }
         if self.include_jsonapi_object:
             response["jsonapi"] = {"version": self.jsonapi_version}
 
         if self.query_params.include:
-            included = self._process_includes(
-                db_items=[db_item],
-                items_data=[item_data],
-                include_paths=self._prepare_include_params(),
-                resource_type=self.resource_type,
-                include_fields=include_fields,
-            )
+            with diagnostics_stage("includes", self.diagnostics):
+                included = self._process_includes(
+                    db_items=[db_item],
+                    items_data=[item_data],
+                    include_paths=self._prepare_include_params(),
+                    resource_type=self.resource_type,
+                    include_fields=include_fields,
+                )
             response["included"] = [value for _, value in sorted(included.items(), key=lambda item: item[0])]
 
+        self._record_response_metrics(response)
+        return self._apply_debug_meta(response)
+
+    def _build_count_response(self, count: Optional[int]) -> dict:
+        """List response of a count-only request: no rows, includes or pagination links."""
+        meta: dict[str, Any] = {"count": count}
+        if self.query_params.aggregate_meta is not None:
+            meta["aggregates"] = self.query_params.aggregate_meta
+        response = {"data": [], "meta": meta, "links": {"self": self.link_builder.self_url}}
+        if self.include_jsonapi_object:
+            response["jsonapi"] = {"version": self.jsonapi_version}
+
+        return self._apply_debug_meta(response)
+
+    def _build_head_response(self, count: Optional[int] = None) -> HttpResponse:
+        response = HttpResponse(content_type=JSONAPI_MEDIA_TYPE)
+        if count is not None:
+            response[COUNT_HEADER] = str(count)
+        # the response isn't rendered, finish the request here
+        finish_request_metrics(self.request, status=response.status_code, response_bytes=0)
+        finish_request_diagnostics(self.request)
         return response
 
     def _build_list_response(
@@ -753,30 +1115,39 @@ class ViewBase:
         total_pages: Optional[int],
     ) -> dict:
         include_fields = self._get_include_fields()
-        items_data = [self._prepare_item_data(db_item, self.resource_type, include_fields) for db_item in items_from_db]
-        for db_item, item_data in zip(items_from_db, items_data, strict=False):
-            item_data.setdefault("links", {})["self"] = self.request.build_absolute_uri(
-                self._build_resource_path(
-                    resource_type=self.resource_type,
-                    resource_id=str(models_storage.get_object_id(db_item, self.resource_type)),
-                )
+        with diagnostics_stage("serialize", self.diagnostics):
+            items_data = [
+                self._values_row_plan.build(db_item, self.resource_type)
+                if self._values_row_plan is not None and isinstance(db_item, dict)
+                else self._get_item_data(db_item, self.resource_type, include_fields)
+                for db_item in items_from_db
+            ]
+        for item_data in items_data:
+            item_data.setdefault("links", {})["self"] = self._build_resource_url(
+                resource_type=self.resource_type,
+                resource_id=item_data["id"],
             )
+        meta: dict[str, Any] = {"count": count, "totalPages": total_pages}
+        if self.query_params.aggregate_meta is not None:
+            meta["aggregates"] = self.query_params.aggregate_meta
         response = {
             "data": items_data,
-            "meta": {"count": count, "totalPages": total_pages},
+            "meta": meta,
             "links": self._build_pagination_links(count=count, total_pages=total_pages),
         }
         if self.include_jsonapi_object:
             response["jsonapi"] = {"version": self.jsonapi_version}
 
         if self.query_params.include:
-            included = self._process_includes(
-                db_items=items_from_db,
-                items_data=items_data,
-                resource_type=self.resource_type,
-                include_paths=self._prepare_include_params(),
-                include_fields=include_fields,
-            )
+            with diagnostics_stage("includes", self.diagnostics):
+                included = self._process_includes(
+                    db_items=items_from_db,
+                    items_data=items_data,
+                    resource_type=self.resource_type,
+                    include_paths=self._prepare_include_params(),
+                    include_fields=include_fields,
+                )
             response["included"] = [value for _, value in sorted(included.items(), key=lambda item: item[0])]
 
-        return response
+        self._record_response_metrics(response)
+        return self._apply_debug_meta(response)
@@ -0,0 +1,77 @@
+"""
+Pre-fork warmup of lazily built state.
+
+Call :func:`warmup` (or :meth:`ApplicationBuilder.warmup`) once all resources
+are registered, before the server forks its workers (e.g. at the end of
+``wsgi.py``/``asgi.py`` with gunicorn ``--preload``)::
+
+    application = get_wsgi_application()
+    warmup(api)
+
+Everything is then built in the parent process and, with ``freeze=True``,
+moved to the permanent GC generation so the workers share it copy-on-write
+instead of touching (and copying) it on every collection.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+from typing import Optional
+
+from django.urls import NoReverseMatch
+from ninja import NinjaAPI
+
+from django_ninja_jsonapi.fragment_cache import FragmentCache
+from django_ninja_jsonapi.openapi import get_openapi_document
+from django_ninja_jsonapi.storages.models_storage import models_storage
+from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
+from django_ninja_jsonapi.storages.views_storage import views_storage
+from django_ninja_jsonapi.views.heavy_fields import get_heavy_fields
+from django_ninja_jsonapi.views.values_rows import get_values_row_plan
+
+log = logging.getLogger(__name__)
+
+OPERATION_TYPES = ("get", "create", "update")
+
+
+def warmup_resource(resource_type: str):
+    """Build the sparse-fieldset schemas, model metadata, heavy fields and row plan of a resource."""
+    for operation_type in OPERATION_TYPES:
+        if schemas_storage.has_operation(resource_type, operation_type):
+            list(schemas_storage.get_field_schemas(resource_type, operation_type).values())
+
+    model = models_storage.get_model(resource_type)
+    model_meta = getattr(model, "_meta", None)
+    if model_meta is None:
+        return
+
+    # populates Django's relation and field-name caches
+    model_meta.get_fields()
+    get_heavy_fields(resource_type)
+    if getattr(views_storage.get_view(resource_type), "trusted_read", False):
+        get_values_row_plan(resource_type)
+
+
+def warmup(api: Optional[NinjaAPI] = None, freeze: bool = True):
+    """
+    Eagerly build the per-resource state of every registered resource.
+
+    Pass the ``api`` to also build its OpenAPI document; this needs the API's
+    URLs to be importable, so call it after the URLconf is loaded.
+    """
+    for resource_type in views_storage.get_resource_types():
+        if schemas_storage.has_resource(resource_type):
+            warmup_resource(resource_type)
+
+    FragmentCache.from_settings()
+
+    if api is not None:
+        try:
+            get_openapi_document(api)
+        except NoReverseMatch:
+            log.warning("Skipped OpenAPI warmup: the API %r is not included in the URLconf", api.urls_namespace)
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
@@ -1,5 +1,6 @@
 SECRET_KEY = "test-key"
 INSTALLED_APPS = [
+    "django_ninja_jsonapi",
     "tests.testapp",
 ]
 DATABASES = {
@@ -0,0 +1,91 @@
+import pytest
+from django.test import RequestFactory
+
+from django_ninja_jsonapi.data_layers.django_orm.aggregates import compute_aggregates
+from django_ninja_jsonapi.exceptions import InvalidAggregate
+from django_ninja_jsonapi.querystring import QueryStringManager
+from django_ninja_jsonapi.views import QueryField
+from django_ninja_jsonapi.views.query_allowlist import get_query_allowlist
+from tests.testapp.models import Computer, Customer
+
+
+def _query_params(params: dict) -> QueryStringManager:
+    return QueryStringManager(RequestFactory().get("/api/computers", params))
+
+
+def test_parse_aggregates():
+    query_params = _query_params({"meta[aggregate]": "count:serial,count_by:owner.name,count:serial"})
+
+    assert query_params.aggregates == [("count", "serial"), ("count_by", "owner.name")]
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("serial", "must be '<function>:<field>'"),
+        ("median:serial", "Unknown aggregate 'median'"),
+    ],
+)
+def test_parse_aggregates_rejects_invalid_items(value, message):
+    with pytest.raises(InvalidAggregate, match=message):
+        _ = _query_params({"meta[aggregate]": value}).aggregates
+
+
+def test_zero_page_size_is_kept_only_with_aggregates():
+    assert _query_params({"page[size]": "0", "meta[aggregate]": "count:serial"}).pagination.size == 0
+    assert _query_params({"page[size]": "0"}).pagination.size != 0
+
+
+class ComputerView:
+    query_allowlist = {
+        "serial": QueryField(operators=("eq",), aggregates=("count", "max")),
+        "owner.name": QueryField(aggregates=("count_by",)),
+    }
+
+
+def test_allowlisted_aggregates_pass():
+    allowlist = get_query_allowlist(ComputerView, Computer)
+
+    allowlist.check_aggregates("computer", [("max", "serial"), ("count_by", "owner.name")])
+
+
+@pytest.mark.parametrize("aggregate", [("sum", "serial"), ("count", "owner.name"), ("count", "id")])
+def test_aggregates_outside_the_allowlist_are_rejected(aggregate):
+    allowlist = get_query_allowlist(ComputerView, Computer)
+
+    with pytest.raises(InvalidAggregate, match="is not allowed for resource type 'computer'"):
+        allowlist.check_aggregates("computer", [aggregate])
+
+
+def test_unknown_allowlisted_aggregates_are_rejected():
+    with pytest.raises(ValueError, match="Unknown aggregates"):
+        QueryField(aggregates=("median",))
+
+
+@pytest.fixture
+def computers(db):
+    alice = Customer.objects.create(name="Alice", email="alice@example.com")
+    bob = Customer.objects.create(name="Bob", email="bob@example.com")
+    Computer.objects.create(serial="A-1", owner=alice)
+    Computer.objects.create(serial="A-2", owner=alice)
+    Computer.objects.create(serial="B-1", owner=bob)
+    Computer.objects.create(serial="X-1")
+
+
+def test_compute_aggregates(computers):
+    queryset = Computer.objects.order_by("serial")
+
+    assert compute_aggregates(queryset, [("count", "serial"), ("max", "serial"), ("count_by", "owner.name")]) == {
+        "count": {"serial": 4},
+        "max": {"serial": "X-1"},
+        "count_by": {"owner.name": {"null": 1, "Alice": 2, "Bob": 1}},
+    }
+
+
+def test_compute_aggregates_of_a_filtered_queryset(computers):
+    queryset = Computer.objects.filter(owner__name="Alice")
+
+    assert compute_aggregates(queryset, [("min", "serial"), ("count_by", "owner.name")]) == {
+        "min": {"serial": "A-1"},
+        "count_by": {"owner.name": {"Alice": 2}},
+    }
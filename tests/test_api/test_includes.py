@@ -282,6 +282,24 @@ def test_apply_querystring_uses_include_mappings(monkeypatch):
     assert fake_qs.prefetched == ["owner__groups"]
 
 
+def test_includes_with_computed_fields_are_prefetched(monkeypatch):
+    request = RequestFactory().get("/api/computers", {"include": "owner"})
+    data_layer = DjangoORMDataLayer(
+        request=request,
+        model=SimpleNamespace,
+        schema=SimpleNamespace,
+        resource_type="computer",
+        select_for_includes={"__all__": ["company"], "owner": ["owner__profile"]},
+    )
+    monkeypatch.setattr(data_layer, "_map_include_path_to_prefetch", lambda include_path: include_path)
+    monkeypatch.setattr(data_layer, "_is_select_related_include_path", lambda include_path: True)
+
+    selects, prefetches = data_layer._resolve_include_optimizations(["owner"], annotated_exprs=frozenset({"owner"}))
+
+    assert selects == {"company"}
+    assert prefetches == {"owner", "owner__profile"}
+
+
 def test_build_list_response_includes_top_level_links(monkeypatch):
     request = RequestFactory().get("/api/customers", {"page[number]": "2", "page[size]": "2"})
     view = DummyView(
@@ -69,8 +69,8 @@ def test_limited_operations_register_only_requested_http_methods():
 
     path_methods = _collect_path_methods(api)
 
-    assert path_methods["/dummy/"] == {"GET"}
-    assert path_methods["/dummy/{obj_id}/"] == {"GET"}
+    assert path_methods["/dummy/"] == {"GET", "HEAD"}
+    assert path_methods["/dummy/{obj_id}/"] == {"GET", "HEAD"}
 
 
 def test_default_operations_do_not_register_delete_on_list_route():
@@ -1,3 +1,4 @@
+import gc
 from typing import Annotated
 
 import pytest
@@ -7,6 +8,7 @@ from pydantic import BaseModel
 from django_ninja_jsonapi.api.application_builder import ApplicationBuilder, ApplicationBuilderError
 from django_ninja_jsonapi.generics import ViewBaseGeneric
 from django_ninja_jsonapi.renderers import JSONAPI_MEDIA_TYPE
+from django_ninja_jsonapi.storages.schemas_storage import schemas_storage
 from django_ninja_jsonapi.types_metadata import RelationshipInfo
 from django_ninja_jsonapi.views.enums import Operation
 
@@ -160,3 +162,33 @@ def test_builder_initializes_resources_with_included_relationship_schemas():
 
     initialized = builder.initialize()
     assert initialized is api
+
+
+def test_builder_cannot_warm_up_before_initialize():
+    builder = ApplicationBuilder(NinjaAPI())
+
+    with pytest.raises(ApplicationBuilderError):
+        builder.warmup()
+
+
+def test_builder_warmup_builds_field_schemas_and_freezes(monkeypatch):
+    api = NinjaAPI()
+    builder = ApplicationBuilder(api)
+    builder.add_resource(
+        path="/dummy",
+        tags=["dummy"],
+        resource_type="dummy",
+        view=DummyView,
+        model=DummyModel,
+        schema=DummySchema,
+        operations=[Operation.GET_LIST],
+    )
+    builder.initialize()
+    frozen = []
+    monkeypatch.setattr(gc, "freeze", lambda: frozen.append(True))
+
+    assert builder.warmup() is api
+
+    field_schemas = schemas_storage.get_field_schemas("dummy", operation_type="get")
+    assert set(field_schemas._built) == {"name"}
+    assert frozen == [True]
@@ -2,10 +2,13 @@ from types import SimpleNamespace
 
 import pytest
 from django.core.exceptions import FieldError
+from django.db.models import Prefetch
 from django.test import RequestFactory
 
 from django_ninja_jsonapi.data_layers.django_orm.orm import DjangoORMDataLayer
 from django_ninja_jsonapi.exceptions import BadRequest
+from django_ninja_jsonapi.types_metadata import RelationshipInfo
+from tests.testapp.models import Customer
 
 
 class _AttributesRecorder:
@@ -125,6 +128,38 @@ async def test_delete_objects_uses_single_queryset_delete(monkeypatch):
     assert queryset.deleted is True
 
 
+@pytest.mark.asyncio
+async def test_check_object_exists_runs_get_object_hooks(monkeypatch):
+    data_layer = DjangoORMDataLayer(
+        request=RequestFactory().head("/api/customers/1"),
+        model=SimpleNamespace,
+        schema=SimpleNamespace,
+        resource_type="customer",
+    )
+    calls = []
+
+    async def before_get_object(view_kwargs):
+        calls.append(("before", view_kwargs))
+
+    async def after_get_object(obj, view_kwargs):
+        calls.append(("after", obj, view_kwargs))
+
+    monkeypatch.setattr(data_layer, "before_get_object", before_get_object)
+    monkeypatch.setattr(data_layer, "after_get_object", after_get_object)
+    monkeypatch.setattr(
+        "django_ninja_jsonapi.data_layers.django_orm.orm.BaseDjangoORM.queryset",
+        lambda model: SimpleNamespace(),
+    )
+    monkeypatch.setattr(
+        "django_ninja_jsonapi.data_layers.django_orm.orm.BaseDjangoORM.exists_or_raise",
+        lambda queryset, **kwargs: None,
+    )
+
+    await data_layer.check_object_exists({"id": "1"})
+
+    assert calls == [("before", {"id": "1"}), ("after", None, {"id": "1"})]
+
+
 def test_apply_querystring_uses_django_filterset_when_configured():
     class FakeQuerySet:
         def filter(self, *args, **kwargs):
@@ -220,3 +255,96 @@ def test_apply_querystring_raises_bad_request_on_invalid_filter_or_sort(monkeypa
         data_layer._apply_querystring(FakeQuerySet(), qs)
 
     assert exc_info.value.as_dict["detail"] == "Invalid filter or sort query parameters"
+
+
+def test_build_prefetch_lookups_uses_sliced_prefetch_for_limited_includes(monkeypatch):
+    request = RequestFactory().get("/api/customers")
+    data_layer = DjangoORMDataLayer(
+        request=request,
+        model=Customer,
+        schema=SimpleNamespace,
+        resource_type="customer",
+        include_limits={"computers": 2},
+        include_ordering={"computers": ["-serial"]},
+    )
+    relationships = {
+        ("customer", "computers"): RelationshipInfo(resource_type="computer", many=True),
+        ("computer", "tags"): RelationshipInfo(resource_type="tag", many=True),
+    }
+    monkeypatch.setattr(
+        "django_ninja_jsonapi.data_layers.django_orm.orm.schemas_storage.get_relationship_info",
+        lambda resource_type, operation_type, field_name: relationships.get((resource_type, field_name)),
+    )
+
+    lookups = data_layer._build_prefetch_lookups({"computers__tags"})
+
+    assert len(lookups) == 2
+    limited, nested = lookups
+    assert isinstance(limited, Prefetch)
+    assert limited.prefetch_through == "computers"
+    assert limited.to_attr == "jsonapi_limited_computers"
+    assert limited.queryset.query.high_mark == 3
+    assert limited.queryset.query.order_by == ("-serial", "pk")
+    assert nested == "jsonapi_limited_computers__tags"
+
+
+@pytest.mark.django_db
+def test_apply_querystring_annotates_computed_fields_only_when_used(monkeypatch):
+    from django.db.models import Count
+    from pydantic import BaseModel
+
+    class CustomerAttributes(BaseModel):
+        name: str
+        computer_count: int = 0
+
+    monkeypatch.setattr(
+        "django_ninja_jsonapi.data_layers.django_orm.orm.schemas_storage.get_attrs_schema",
+        lambda resource_type, operation_type: CustomerAttributes,
+    )
+    monkeypatch.setattr(
+        "django_ninja_jsonapi.data_layers.django_orm.orm.schemas_storage.get_meta_fields",
+        lambda resource_type, operation_type: [],
+    )
+    monkeypatch.setattr(
+        "django_ninja_jsonapi.data_layers.django_orm.orm.models_storage.get_model_id_field_name",
+        lambda resource_type: "id",
+    )
+    alice = Customer.objects.create(name="Alice", email="alice@example.com")
+    Customer.objects.create(name="Bob", email="bob@example.com")
+    alice.computers.create(serial="SN-001")
+    data_layer = DjangoORMDataLayer(
+        request=RequestFactory().get("/api/customers"),
+        model=Customer,
+        schema=SimpleNamespace,
+        resource_type="customer",
+        computed_fields={"computer_count": Count("computers")},
+    )
+
+    def apply(fields, filters=(), sorts=()):
+        qs = SimpleNamespace(filters=list(filters), sorts=list(sorts), include=[], fields=fields, aggregates=[])
+        return data_layer._apply_querystring(Customer.objects.all(), qs)
+
+    queryset = apply({})
+    assert list(queryset.query.annotation_select) == ["computer_count"]
+    assert {customer.name: customer.computer_count for customer in queryset} == {"Alice": 1, "Bob": 0}
+
+    assert not apply({"customer": ["name"]}).query.annotations
+
+    queryset = apply(
+        {"customer": ["name"]},
+        filters=[{"name": "computer_count", "op": "gt", "val": 0}],
+        sorts=[{"field": "computer_count", "order": "desc"}],
+    )
+    assert not queryset.query.annotation_select
+    assert [customer.name for customer in queryset] == ["Alice"]
+
+
+def test_unknown_collection_count_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Invalid collection_count_strategy: 'estimate'"):
+        DjangoORMDataLayer(
+            request=RequestFactory().get("/api/customers"),
+            model=Customer,
+            schema=SimpleNamespace,
+            resource_type="customer",
+            collection_count_strategy="estimate",
+        )
@@ -0,0 +1,75 @@
+import logging
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from django_ninja_jsonapi.diagnostics import (
+    REQUEST_DIAGNOSTICS_ATTR,
+    JSONAPIDiagnosticsMiddleware,
+    RequestDiagnostics,
+    finish_request_diagnostics,
+    get_current_diagnostics,
+    normalize_querystring,
+    start_request_diagnostics,
+)
+
+
+def test_server_timing_header_lists_stages_and_db_time():
+    diagnostics = RequestDiagnostics()
+    with diagnostics.stage("querystring"):
+        pass
+    diagnostics.record_query("SELECT 1", 0.002)
+    with diagnostics.paused():
+        diagnostics.record_query("EXPLAIN SELECT 1", 0.001)
+
+    header = diagnostics.server_timing_header()
+    assert header.startswith("querystring;dur=")
+    assert 'db;dur=2.000;desc="1 queries"' in header
+    assert "total;dur=" in header
+    assert "queries" not in diagnostics.as_debug_meta()
+
+
+def test_normalize_querystring_strips_filter_values_and_page_position():
+    request = RequestFactory().get(
+        "/api/customers/",
+        {
+            "filter": '[{"name": "name", "op": "eq", "val": "Alice"}]',
+            "filter[email]": "alice@example.com",
+            "page[number]": "3",
+            "page[size]": "10",
+            "include": "computers",
+        },
+    )
+
+    assert normalize_querystring(request) == (
+        'filter=[{"name":"name","op":"eq","val":"?"}]&filter[email]=?&include=computers&page[number]=?&page[size]=10'
+    )
+
+
+def test_middleware_logs_slow_requests(settings, caplog):
+    settings.NINJA_JSONAPI = {"DIAGNOSTICS": {"ENABLED": True, "SLOW_REQUEST_THRESHOLD_MS": 0}}
+
+    def view(request):
+        with getattr(request, REQUEST_DIAGNOSTICS_ATTR).stage("render"):
+            pass
+        return HttpResponse()
+
+    with caplog.at_level(logging.WARNING, logger="django_ninja_jsonapi.diagnostics"):
+        response = JSONAPIDiagnosticsMiddleware(view)(RequestFactory().get("/api/customers/", {"page[number]": "2"}))
+
+    assert response["Server-Timing"].startswith("render;dur=")
+    assert "Slow JSON:API request GET /api/customers/?page[number]=?" in caplog.text
+
+
+def test_finishing_a_request_resets_the_current_diagnostics(settings):
+    settings.NINJA_JSONAPI = {"DIAGNOSTICS": {"ENABLED": True}}
+    request = RequestFactory().get("/api/customers/")
+
+    diagnostics = start_request_diagnostics(request)
+    # nested views reuse the diagnostics of the request
+    assert start_request_diagnostics(request) is diagnostics
+    assert get_current_diagnostics() is diagnostics
+
+    finish_request_diagnostics(request)
+    assert get_current_diagnostics() is None
+    finish_request_diagnostics(request)
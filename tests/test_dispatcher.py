@@ -0,0 +1,84 @@
+import pytest
+from django.test.utils import override_settings
+from django.urls import URLResolver, path, re_path
+from django.urls.exceptions import Resolver404
+from django.urls.resolvers import RoutePattern
+
+from django_ninja_jsonapi.api.dispatcher import PathTrie, TrieURLResolver, get_url_dispatch
+
+
+def view(request, **kwargs):
+    return None
+
+
+def other_view(request, **kwargs):
+    return None
+
+
+def build_resolver(patterns):
+    return URLResolver(RoutePattern("", is_endpoint=False), [TrieURLResolver(patterns)])
+
+
+def test_resolves_static_and_dynamic_segments():
+    resolver = build_resolver(
+        [
+            path("articles/", view, name="articles"),
+            path("articles/<obj_id>/", view, name="article"),
+            path("articles/<obj_id>/relationships/author/", other_view, name="article-author"),
+        ]
+    )
+
+    assert resolver.resolve("articles/").url_name == "articles"
+
+    match = resolver.resolve("articles/1/relationships/author/")
+    assert match.func is other_view
+    assert match.kwargs == {"obj_id": "1"}
+    assert match.route == "articles/<obj_id>/relationships/author/"
+
+    with pytest.raises(Resolver404):
+        resolver.resolve("articles/1/relationships/")
+    with pytest.raises(Resolver404):
+        resolver.resolve("articles//")
+
+
+def test_first_registered_pattern_wins():
+    resolver = build_resolver(
+        [
+            path("articles/<int:obj_id>/", view, name="by-id"),
+            path("articles/<slug:slug>/", other_view, name="by-slug"),
+            path("articles/latest/", other_view, name="latest"),
+        ]
+    )
+
+    match = resolver.resolve("articles/12/")
+    assert match.url_name == "by-id"
+    assert match.kwargs == {"obj_id": 12}
+    assert resolver.resolve("articles/first-post/").url_name == "by-slug"
+    # like Django, the earlier dynamic pattern shadows the static one
+    assert resolver.resolve("articles/latest/").url_name == "by-slug"
+
+
+def test_patterns_spanning_segments_fall_back_to_linear_matching():
+    patterns = [
+        path("files/<path:name>", view, name="file"),
+        re_path(r"^legacy/(?P<obj_id>\d+)/$", view, name="legacy"),
+        path("articles/", view, name="articles"),
+    ]
+    assert len(PathTrie(patterns).fallback) == 2
+
+    resolver = build_resolver(patterns)
+    assert resolver.resolve("files/a/b.txt").kwargs == {"name": "a/b.txt"}
+    assert resolver.resolve("legacy/3/").kwargs == {"obj_id": "3"}
+    assert resolver.resolve("articles/").url_name == "articles"
+
+
+def test_reverse_uses_mounted_patterns():
+    resolver = build_resolver([path("articles/<obj_id>/", view, name="article")])
+
+    assert resolver.reverse("article", obj_id=1) == "articles/1/"
+
+
+@override_settings(NINJA_JSONAPI={"URL_DISPATCH": "regex"})
+def test_invalid_url_dispatch_setting():
+    with pytest.raises(ValueError, match="URL_DISPATCH"):
+        get_url_dispatch()
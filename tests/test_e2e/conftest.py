@@ -82,9 +82,25 @@ class GenericView(ViewBaseGeneric):
 _NS = "e2e-integration"
 
 
-@pytest.fixture(autouse=True)
-def e2e_api(settings):
-    """Build the API, register URL patterns, and tear down after the test."""
+@pytest.fixture(autouse=True, params=["django", "trie"])
+def e2e_api(request, settings):
+    """Build the API, register URL patterns, and tear down after the test.
+
+    Every test runs with both URL dispatchers.
+    """
+    yield from serve_e2e_api(settings, request.param)
+
+
+def serve_e2e_api(settings, url_dispatch: str, schemas: Optional[dict] = None, views: Optional[dict] = None):
+    """
+    Build the API and serve it until the generator is closed.
+
+    :param schemas: schemas replacing the default ones, by resource type.
+    :param views: views replacing ``GenericView``, by resource type.
+    """
+    schemas, views = schemas or {}, views or {}
+    settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "URL_DISPATCH": url_dispatch}
+
     # Ensure the namespace is not already registered (cleanup from prior test).
     while _NS in NinjaAPI._registry:
         NinjaAPI._registry.remove(_NS)
@@ -96,9 +112,9 @@ def e2e_api(settings):
         path="/customers",
         tags=["customers"],
         resource_type="customer",
-        view=GenericView,
+        view=views.get("customer", GenericView),
         model=Customer,
-        schema=CustomerSchema,
+        schema=schemas.get("customer", CustomerSchema),
         schema_in_post=CustomerCreateSchema,
         schema_in_patch=CustomerCreateSchema,
     )
@@ -116,9 +132,9 @@ def e2e_api(settings):
         path="/tags",
         tags=["tags"],
         resource_type="tag",
-        view=GenericView,
+        view=views.get("tag", GenericView),
         model=Tag,
-        schema=TagSchema,
+        schema=schemas.get("tag", TagSchema),
     )
     builder.initialize()
 
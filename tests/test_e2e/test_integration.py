@@ -7,11 +7,11 @@ from __future__ import annotations
 import json
 
 import pytest
-from asgiref.sync import sync_to_async
+from asgiref.sync import async_to_sync, sync_to_async
 from django.test import AsyncClient
 
 from django_ninja_jsonapi.renderers import JSONAPI_MEDIA_TYPE
-from tests.testapp.models import Computer, Customer
+from tests.testapp.models import Computer, Customer, Tag
 
 pytestmark = [
     pytest.mark.django_db(transaction=True),
@@ -34,6 +34,10 @@ async def _create_computer(serial: str = "SN-001", owner: Customer | None = None
     return await sync_to_async(Computer.objects.create)(serial=serial, owner=owner)
 
 
+async def _first_computer_pk() -> int:
+    return await sync_to_async(lambda: Computer.objects.order_by("pk").values_list("pk", flat=True).first())()
+
+
 # ---------------------------------------------------------------------------
 # GET list & detail
 # ---------------------------------------------------------------------------
@@ -176,6 +180,64 @@ class TestIncludes:
         assert len(included) == 2
         assert all(item["type"] == "computer" for item in included)
 
+    async def test_include_to_many_limit_from_query(self):
+        cust = await _create_customer()
+        other = await _create_customer("Bob", "bob@example.com")
+        for idx in range(3):
+            await _create_computer(f"SN-A{idx}", owner=cust)
+        await _create_computer("SN-B0", owner=other)
+
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?include=computers&page[include.computers]=2")
+        assert resp.status_code == 200
+        body = json.loads(resp.content)
+
+        rels = {item["id"]: item["relationships"]["computers"] for item in body["data"]}
+        assert len(rels[str(cust.pk)]["data"]) == 2
+        assert rels[str(cust.pk)]["meta"] == {"limit": 2, "truncated": True}
+        assert rels[str(cust.pk)]["links"]["related"].endswith(f"/api/customers/{cust.pk}/computers/")
+        assert len(rels[str(other.pk)]["data"]) == 1
+        assert rels[str(other.pk)]["meta"] == {"limit": 2, "truncated": False}
+        assert len(body["included"]) == 3
+
+    async def test_include_to_many_default_limit_from_settings(self, settings):
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "DEFAULT_INCLUDE_LIMIT": 1}
+        cust = await _create_customer()
+        await _create_computer("SN-001", owner=cust)
+        await _create_computer("SN-002", owner=cust)
+
+        client = AsyncClient()
+        resp = await client.get(f"/api/customers/{cust.pk}/?include=computers")
+        assert resp.status_code == 200
+        rel = json.loads(resp.content)["data"]["relationships"]["computers"]
+        assert rel["data"] == [{"id": str((await _first_computer_pk())), "type": "computer"}]
+        assert rel["meta"] == {"limit": 1, "truncated": True}
+
+    async def test_include_to_many_limit_on_nested_include(self):
+        cust = await _create_customer()
+        first = await _create_computer("SN-001", owner=cust)
+        await _create_computer("SN-002", owner=cust)
+        tag = await sync_to_async(Tag.objects.create)(label="laptop")
+        await sync_to_async(first.tags.add)(tag)
+
+        client = AsyncClient()
+        resp = await client.get(f"/api/customers/{cust.pk}/?include=computers.tags&page[include.computers]=1")
+        assert resp.status_code == 200
+        body = json.loads(resp.content)
+
+        rel = body["data"]["relationships"]["computers"]
+        assert rel["data"] == [{"id": str(first.pk), "type": "computer"}]
+        assert rel["meta"] == {"limit": 1, "truncated": True}
+        assert {(item["type"], item["id"]) for item in body["included"]} == {
+            ("computer", str(first.pk)),
+            ("tag", str(tag.pk)),
+        }
+
+    async def test_include_limit_for_unrequested_include_is_rejected(self):
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?page[include.computers]=2")
+        assert resp.status_code == 400
+
 
 # ---------------------------------------------------------------------------
 # Sparse fieldsets
@@ -218,6 +280,24 @@ class TestSorting:
         names = [item["attributes"]["name"] for item in json.loads(resp.content)["data"]]
         assert names == ["Zara", "Alice"]
 
+    async def test_sort_by_to_many_count(self):
+        zara = await _create_customer("Zara", "z@b.com")
+        alice = await _create_customer("Alice", "a@b.com")
+        await _create_customer("Bob", "b@b.com")
+        await _create_computer("SN-001", owner=alice)
+        await _create_computer("SN-002", owner=alice)
+        await _create_computer("SN-003", owner=zara)
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?sort=-computers.count")
+        assert resp.status_code == 200
+        names = [item["attributes"]["name"] for item in json.loads(resp.content)["data"]]
+        assert names == ["Alice", "Zara", "Bob"]
+
+    async def test_sort_by_to_many_field_requires_aggregate(self):
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?sort=computers.serial")
+        assert resp.status_code == 400
+
 
 # ---------------------------------------------------------------------------
 # Pagination
@@ -270,3 +350,747 @@ class TestContentNegotiation:
             content_type="application/json",
         )
         assert resp.status_code == 415
+
+
+# ---------------------------------------------------------------------------
+# Query cost budgeting
+# ---------------------------------------------------------------------------
+
+
+class TestQueryCost:
+    async def test_query_over_budget_is_rejected(self, settings):
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "QUERY_COST": {"BUDGET": 100}}
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?include=computers.tags")
+        assert resp.status_code == 400
+        error = json.loads(resp.content)["errors"][0]
+        assert error["title"] == "Query cost budget exceeded."
+
+    async def test_query_cost_in_debug_meta(self, settings):
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "DEBUG_META": True}
+        await _create_customer()
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?page[size]=5")
+        assert resp.status_code == 200
+        meta = json.loads(resp.content)["meta"]
+        assert meta["count"] == 1
+        assert meta["debug"]["queryCost"]["rows"] == 5
+
+
+class TestDiagnostics:
+    async def test_diagnostics_in_debug_meta_and_server_timing(self, settings):
+        settings.MIDDLEWARE = ["django_ninja_jsonapi.diagnostics.JSONAPIDiagnosticsMiddleware"]
+        settings.NINJA_JSONAPI = {
+            **settings.NINJA_JSONAPI,
+            "DEBUG_META": True,
+            "DIAGNOSTICS": {"ENABLED": True, "SQL_IN_META": True, "EXPLAIN": True},
+        }
+        owner = await _create_customer()
+        await _create_computer(owner=owner)
+        client = AsyncClient()
+        resp = await client.get("/api/customers/?include=computers")
+        assert resp.status_code == 200
+
+        debug = json.loads(resp.content)["meta"]["debug"]
+        assert debug["queryCount"] == len(debug["queries"]) >= 2
+        assert {
+            "querystring",
+            "dl_get_collection",
+            "hook_before_get_collection",
+            "hook_after_get_collection",
+            "serialize",
+            "includes",
+        } <= set(debug["timings"])
+        assert debug["explain"]
+
+        server_timing = resp.headers["Server-Timing"]
+        assert "dl_get_collection;dur=" in server_timing
+        assert "render;dur=" in server_timing
+        assert f'desc="{debug["queryCount"]} queries"' in server_timing
+
+    async def test_no_server_timing_when_disabled(self, settings):
+        settings.MIDDLEWARE = ["django_ninja_jsonapi.diagnostics.JSONAPIDiagnosticsMiddleware"]
+        client = AsyncClient()
+        resp = await client.get("/api/customers/")
+        assert resp.status_code == 200
+        assert "Server-Timing" not in resp.headers
+
+
+class TestMetrics:
+    async def test_requests_and_errors_are_recorded(self, settings):
+        from django_ninja_jsonapi.metrics import metrics_registry
+
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "METRICS": {"ENABLED": True}}
+        metrics_registry.reset()
+        await _create_customer()
+        client = AsyncClient()
+        assert (await client.get("/api/customers/")).status_code == 200
+        assert (await client.get("/api/customers/?include=unknown")).status_code == 400
+
+        text = metrics_registry.render()
+        metrics_registry.reset()
+        assert 'jsonapi_requests_total{operation="get_list",resource_type="customer"} 2' in text
+        assert 'jsonapi_errors_total{operation="get_list",resource_type="customer",status="400"} 1' in text
+        assert 'jsonapi_rows_sum{operation="get_list",resource_type="customer"} 1' in text
+        assert 'jsonapi_count_query_duration_seconds_count{operation="get_list",resource_type="customer"} 1' in text
+
+    async def test_validation_and_server_errors_are_recorded(self, settings, monkeypatch):
+        from django_ninja_jsonapi.metrics import metrics_registry
+        from tests.test_e2e.conftest import GenericView
+
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "METRICS": {"ENABLED": True}}
+        metrics_registry.reset()
+        payload = {"atomic:operations": [{"op": "not-supported", "href": "/customers"}]}
+        response = await AsyncClient().post(
+            "/api/operations", data=json.dumps(payload), content_type="application/json"
+        )
+        assert response.status_code == 422
+
+        async def fail(self):
+            raise RuntimeError
+
+        monkeypatch.setattr(GenericView, "handle_get_resource_list", fail)
+        response = await AsyncClient(raise_request_exception=False).get("/api/customers/")
+        assert response.status_code == 500
+
+        text = metrics_registry.render()
+        metrics_registry.reset()
+        assert 'jsonapi_errors_total{operation="atomic",resource_type="atomic",status="422"} 1' in text
+        assert 'jsonapi_errors_total{operation="get_list",resource_type="customer",status="500"} 1' in text
+
+
+class TestTrustedRead:
+    async def test_trusted_read_matches_regular_list(self, monkeypatch):
+        from tests.test_e2e.conftest import GenericView
+
+        await _create_customer("Alice", "a@b.com")
+        await _create_customer("Bob", "b@b.com")
+        client = AsyncClient()
+        regular = json.loads((await client.get("/api/customers/?sort=-name")).content)
+
+        monkeypatch.setattr(GenericView, "trusted_read", True)
+        monkeypatch.setattr(GenericView, "_prepare_item_data", None)
+        trusted = json.loads((await client.get("/api/customers/?sort=-name")).content)
+
+        assert trusted == regular
+        assert [item["attributes"]["name"] for item in trusted["data"]] == ["Bob", "Alice"]
+
+
+class TestFragmentCache:
+    @pytest.fixture(autouse=True)
+    def _fragment_cache(self, settings):
+        from django.core.cache import cache
+
+        settings.NINJA_JSONAPI = {
+            **settings.NINJA_JSONAPI,
+            "FRAGMENT_CACHE": {"ENABLED": True, "RESOURCES": {"computer": {}, "customer": {}}},
+        }
+        cache.clear()
+        yield
+        cache.clear()
+
+    async def test_cached_fragments_are_reused_and_invalidated(self, monkeypatch):
+        from tests.test_e2e.conftest import GenericView
+
+        customer = await _create_customer("Alice", "a@b.com")
+        computer = await _create_computer(serial="SN-001", owner=customer)
+        client = AsyncClient()
+        first = json.loads((await client.get("/api/customers/?include=computers")).content)
+        assert first["included"][0]["attributes"]["serial"] == "SN-001"
+
+        prepare_item_data = GenericView._prepare_item_data
+        prepared = []
+
+        def tracking_prepare(db_item, resource_type, include_fields=None):
+            prepared.append(resource_type)
+            return prepare_item_data(db_item, resource_type, include_fields)
+
+        monkeypatch.setattr(GenericView, "_prepare_item_data", staticmethod(tracking_prepare))
+        second = json.loads((await client.get("/api/customers/?include=computers")).content)
+        assert second == first
+        assert prepared == []
+
+        computer.serial = "SN-002"
+        await sync_to_async(computer.save)()
+        third = json.loads((await client.get("/api/customers/?include=computers")).content)
+        assert third["included"][0]["attributes"]["serial"] == "SN-002"
+        assert prepared == ["computer"]
+
+
+class TestOpenAPI:
+    async def test_document_is_served_with_etag(self):
+        client = AsyncClient()
+        response = await client.get("/api/openapi.json")
+        assert response.status_code == 200
+        assert "/api/customers/" in json.loads(response.content)["paths"]
+
+        etag = response["ETag"]
+        not_modified = await client.get("/api/openapi.json", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified["ETag"] == etag
+
+    async def test_document_is_read_from_cache_dir(self, e2e_api, settings, tmp_path, monkeypatch):
+        from django_ninja_jsonapi.openapi import clear_openapi_cache, get_openapi_document
+
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "OPENAPI": {"CACHE_DIR": str(tmp_path)}}
+        document = await sync_to_async(get_openapi_document)(e2e_api)
+        assert len(list(tmp_path.glob("openapi-*.json"))) == 1
+
+        clear_openapi_cache(e2e_api)
+        monkeypatch.setattr(e2e_api, "get_openapi_schema", None)
+        assert await sync_to_async(get_openapi_document)(e2e_api) == document
+
+    async def test_fingerprint_covers_operation_docs_and_models(self, e2e_api, monkeypatch):
+        from pydantic import BaseModel
+
+        from django_ninja_jsonapi.openapi import get_api_fingerprint
+
+        fingerprint = get_api_fingerprint(e2e_api, "/api/")
+        operation = next(
+            path_view.operations[0] for _, router in e2e_api._routers for path_view in router.path_operations.values()
+        )
+
+        monkeypatch.setattr(operation, "description", "Changed")
+        described = get_api_fingerprint(e2e_api, "/api/")
+        assert described != fingerprint
+
+        class Other(BaseModel):
+            value: int
+
+        monkeypatch.setitem(operation.response_models, next(iter(operation.response_models)), Other)
+        assert get_api_fingerprint(e2e_api, "/api/") not in (fingerprint, described)
+
+    async def test_fingerprint_covers_cache_key(self, e2e_api, settings):
+        from django_ninja_jsonapi.openapi import get_api_fingerprint
+
+        fingerprint = get_api_fingerprint(e2e_api, "/api/")
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "OPENAPI": {"CACHE_KEY": "deployment-2"}}
+
+        assert get_api_fingerprint(e2e_api, "/api/") != fingerprint
+
+
+class TestLinks:
+    async def test_relative_links_without_relationship_links(self, settings):
+        settings.NINJA_JSONAPI = {
+            **settings.NINJA_JSONAPI,
+            "LINKS": {"RELATIVE": True, "RELATIONSHIP_LINKS": False},
+        }
+        customer = await _create_customer()
+        await _create_computer(owner=customer)
+        client = AsyncClient()
+        body = json.loads((await client.get("/api/customers/?include=computers")).content)
+
+        assert body["links"]["self"] == "/api/customers/?include=computers"
+        assert body["links"]["first"].startswith("/api/customers/?")
+        assert body["data"][0]["links"]["self"] == f"/api/customers/{customer.pk}/"
+        assert body["data"][0]["relationships"]["computers"].get("links") is None
+
+
+class TestURLDispatch:
+    async def test_operations_share_one_resolver_with_trie_dispatch(self, settings):
+        from django.urls import get_resolver
+
+        from django_ninja_jsonapi.api.dispatcher import TrieURLResolver
+
+        patterns = get_resolver().url_patterns[0].url_patterns
+        trie_dispatch = settings.NINJA_JSONAPI["URL_DISPATCH"] == "trie"
+        assert any(isinstance(pattern, TrieURLResolver) for pattern in patterns) is trie_dispatch
+
+        customer = await _create_customer()
+        client = AsyncClient()
+        response = await client.get(f"/api/customers/{customer.pk}/relationships/computers/")
+        assert response.status_code == 200
+        assert (await client.get("/api/customers/1/unknown/")).status_code == 404
+        assert (await client.put("/api/customers/")).status_code == 405
+
+
+class TestRequestBody:
+    async def test_malformed_body_is_rejected(self):
+        client = AsyncClient()
+        response = await client.post("/api/customers/", data=b'{"data": ', content_type=JSONAPI_CT)
+
+        assert response.status_code == 400
+        assert json.loads(response.content)["errors"][0]["detail"] == "Malformed JSON request body"
+
+    async def test_body_over_max_size_is_rejected(self, settings):
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "MAX_BODY_SIZE": 64}
+        payload = {"data": {"type": "customer", "attributes": {"name": "x" * 100, "email": "a@example.com"}}}
+        client = AsyncClient()
+
+        response = await client.post("/api/customers/", data=json.dumps(payload), content_type=JSONAPI_CT)
+        assert response.status_code == 413
+        assert json.loads(response.content)["errors"][0]["title"] == "Content Too Large"
+
+        response = await client.post("/api/operations", data=json.dumps(payload), content_type="application/json")
+        assert response.status_code == 413
+
+    async def test_atomic_payload_errors_are_reported_by_ninja(self):
+        client = AsyncClient()
+        payload = {"atomic:operations": [{"op": "not-supported", "href": "/customers"}]}
+
+        response = await client.post("/api/operations", data=json.dumps(payload), content_type="application/json")
+        assert response.status_code == 422
+        assert json.loads(response.content)["detail"][0]["loc"][:2] == ["body", "operations_request"]
+
+        response = await client.post("/api/operations", data=b"{", content_type="application/json")
+        assert response.status_code == 400
+
+    async def test_atomic_payload_is_validated_from_bytes(self):
+        customer = await _create_customer()
+        client = AsyncClient()
+        payload = {"atomic:operations": [{"op": "remove", "ref": {"type": "customer", "id": str(customer.pk)}}]}
+
+        response = await client.post("/api/operations", data=json.dumps(payload), content_type="application/json")
+        assert response.status_code == 204
+        assert await sync_to_async(Customer.objects.count)() == 0
+
+
+class TestIndexAdvisor:
+    async def test_collection_filters_and_sorts_are_recorded(self, settings):
+        from django_ninja_jsonapi.index_advisor import get_index_suggestions, index_usage_recorder
+
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "INDEX_ADVISOR": {"ENABLED": True}}
+        index_usage_recorder.reset()
+        client = AsyncClient()
+        response = await client.get("/api/computers/?filter[serial]=SN-001&sort=-id")
+        assert response.status_code == 200
+
+        suggestions = await sync_to_async(get_index_suggestions)()
+        index_usage_recorder.reset()
+        assert [(suggestion.model, suggestion.fields) for suggestion in suggestions] == [(Computer, ("serial", "id"))]
+
+
+class TestQueryAllowlist:
+    async def test_filters_outside_allowlist_are_rejected(self, monkeypatch):
+        from django_ninja_jsonapi.views import QueryField
+        from tests.test_e2e.conftest import GenericView
+
+        await _create_customer("Alice", "a@b.com")
+        monkeypatch.setattr(GenericView, "query_allowlist", {"name": QueryField(operators=("eq",), sortable=True)})
+        client = AsyncClient()
+
+        response = await client.get("/api/customers/?filter[name]=Alice&sort=-name")
+        assert response.status_code == 200
+        assert len(json.loads(response.content)["data"]) == 1
+
+        response = await client.get("/api/customers/?filter[email]=a@b.com")
+        assert response.status_code == 400
+        error = json.loads(response.content)["errors"][0]
+        assert error["detail"] == "Filtering on 'email' is not allowed for resource type 'customer'"
+        assert error["source"] == {"parameter": "filters"}
+
+
+class TestFullTextSearch:
+    async def test_search_filter_and_rank_sort(self, monkeypatch):
+        from django.db import connection
+
+        from django_ninja_jsonapi.data_layers.django_orm.search import FullTextSearch, create_fts5_table
+        from tests.test_e2e.conftest import GenericView
+
+        operation = create_fts5_table("testapp_computer_fts", "testapp_computer", ["serial"])
+
+        def run(statements):
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+        await sync_to_async(run)(operation.sql)
+        try:
+            await _create_computer("laptop blue")
+            await _create_computer("laptop laptop red")
+            await _create_computer("desktop")
+            search = FullTextSearch(fields=("serial",), fts_table="testapp_computer_fts")
+            monkeypatch.setattr(GenericView, "full_text_search", search)
+            client = AsyncClient()
+
+            response = await client.get("/api/computers/?filter[search]=laptop&sort=-rank")
+            assert response.status_code == 200
+            serials = [item["attributes"]["serial"] for item in json.loads(response.content)["data"]]
+            assert serials == ["laptop laptop red", "laptop blue"]
+
+            response = await client.get("/api/computers/?sort=-rank")
+            assert response.status_code == 400
+            assert json.loads(response.content)["errors"][0]["source"] == {"parameter": "sort"}
+        finally:
+            await sync_to_async(run)(operation.reverse_sql)
+
+
+class TestHeavyFields:
+    @pytest.fixture
+    def heavy_email(self, monkeypatch):
+        from tests.test_e2e.conftest import CustomerSchema
+
+        meta = type("JSONAPIMeta", (), {"heavy_fields": ["email"]})
+        monkeypatch.setattr(CustomerSchema, "JSONAPIMeta", meta, raising=False)
+
+    @pytest.fixture
+    def e2e_api(self, heavy_email, e2e_api):
+        # the schema is declared before the API is built
+        return e2e_api
+
+    async def test_heavy_fields_are_deferred_on_lists(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        customer = await _create_customer("Alice", "a@b.com")
+        client = AsyncClient()
+
+        def get(url):
+            with CaptureQueriesContext(connection) as queries:
+                response = async_to_sync(client.get)(url)
+            return json.loads(response.content), [query["sql"] for query in queries]
+
+        body, queries = await sync_to_async(get)("/api/customers/")
+        assert body["data"][0]["attributes"] == {"name": "Alice"}
+        assert len(queries) == 2
+        assert '"email"' not in queries[-1]
+
+        body, _ = await sync_to_async(get)("/api/customers/?fields[customer]=name,email")
+        assert body["data"][0]["attributes"] == {"name": "Alice", "email": "a@b.com"}
+
+        body, _ = await sync_to_async(get)(f"/api/customers/{customer.pk}/")
+        assert body["data"]["attributes"] == {"name": "Alice", "email": "a@b.com"}
+
+    async def test_fragment_cache_version_field_is_always_loaded(self, settings):
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.NINJA_JSONAPI = {
+            **settings.NINJA_JSONAPI,
+            "FRAGMENT_CACHE": {"ENABLED": True, "RESOURCES": {"customer": {"VERSION_FIELD": "email"}}},
+        }
+        cache.clear()
+        await _create_customer("Alice", "a@b.com")
+        await _create_customer("Bob", "b@b.com")
+        client = AsyncClient()
+
+        def get(url):
+            with CaptureQueriesContext(connection) as queries:
+                response = async_to_sync(client.get)(url)
+            return json.loads(response.content), len(queries)
+
+        try:
+            body, query_count = await sync_to_async(get)("/api/customers/?sort=name")
+            assert body["data"][0]["attributes"] == {"name": "Alice", "email": "a@b.com"}
+            assert query_count == 2
+
+            body, query_count = await sync_to_async(get)("/api/customers/?sort=name&fields[customer]=name")
+            assert [item["attributes"] for item in body["data"]] == [{"name": "Alice"}, {"name": "Bob"}]
+            assert query_count == 2
+        finally:
+            cache.clear()
+
+    async def test_trusted_read_leaves_heavy_fields_out(self, monkeypatch):
+        from tests.test_e2e.conftest import GenericView
+
+        await _create_customer("Alice", "a@b.com")
+        monkeypatch.setattr(GenericView, "trusted_read", True)
+        monkeypatch.setattr(GenericView, "_prepare_item_data", None)
+        response = await AsyncClient().get("/api/customers/")
+        assert json.loads(response.content)["data"][0]["attributes"] == {"name": "Alice"}
+
+
+class TestComputedFields:
+    async def test_filter_and_sort_by_computed_field(self, monkeypatch):
+        from django.db.models import Count
+
+        from django_ninja_jsonapi.views import QueryField
+        from tests.test_e2e.conftest import GenericView
+
+        alice = await _create_customer("Alice", "a@b.com")
+        bob = await _create_customer("Bob", "b@b.com")
+        await _create_customer("Carol", "c@b.com")
+        await _create_computer("SN-001", owner=alice)
+        await _create_computer("SN-002", owner=bob)
+        await _create_computer("SN-003", owner=bob)
+        monkeypatch.setattr(GenericView, "computed_fields", {"computer_count": Count("computers")})
+        monkeypatch.setattr(
+            GenericView,
+            "query_allowlist",
+            {"computer_count": QueryField(operators=("gt",), sortable=True)},
+        )
+        client = AsyncClient()
+
+        filters = json.dumps([{"name": "computer_count", "op": "gt", "val": 0}])
+        response = await client.get("/api/customers/", {"filter": filters, "sort": "-computer_count"})
+        assert response.status_code == 200
+        body = json.loads(response.content)
+        assert [item["attributes"]["name"] for item in body["data"]] == ["Bob", "Alice"]
+        assert body["meta"]["count"] == 2
+
+    @pytest.mark.parametrize("filters", ["[1]", '[{"and": 1}]', '[["name"]]'])
+    async def test_malformed_filters_are_bad_requests(self, monkeypatch, filters):
+        from django.db.models import Count
+
+        from tests.test_e2e.conftest import GenericView
+
+        monkeypatch.setattr(GenericView, "computed_fields", {"computer_count": Count("computers")})
+
+        response = await AsyncClient().get("/api/customers/", {"filter": filters})
+
+        assert response.status_code == 400
+
+
+class TestIncludedComputedFields:
+    @pytest.fixture
+    def e2e_api(self, settings):
+        from django.core.cache import cache
+        from django.db.models import Count
+
+        from tests.test_e2e.conftest import GenericView, TagSchema, serve_e2e_api
+
+        class TagCountSchema(TagSchema):
+            computer_count: int
+
+        class TagView(GenericView):
+            computed_fields = {"computer_count": Count("computers")}
+
+        settings.NINJA_JSONAPI = {
+            **settings.NINJA_JSONAPI,
+            "FRAGMENT_CACHE": {"ENABLED": True, "RESOURCES": {"tag": {}}},
+        }
+        cache.clear()
+        yield from serve_e2e_api(settings, "django", schemas={"tag": TagCountSchema}, views={"tag": TagView})
+        cache.clear()
+
+    async def _create_computers(self):
+        work = await sync_to_async(Tag.objects.create)(label="work")
+        home = await sync_to_async(Tag.objects.create)(label="home")
+        alice = await _create_customer("Alice", "a@b.com")
+        for serial, tags in (("SN-001", [work]), ("SN-002", [work, home]), ("SN-003", [work])):
+            computer = await _create_computer(serial, owner=alice)
+            await sync_to_async(computer.tags.set)(tags)
+
+    async def test_included_resources_are_annotated(self):
+        await self._create_computers()
+        client = AsyncClient()
+
+        response = await client.get("/api/customers/", {"include": "computers.tags"})
+        assert response.status_code == 200
+        included = json.loads(response.content)["included"]
+        counts = {
+            item["attributes"]["label"]: item["attributes"]["computer_count"]
+            for item in included
+            if item["type"] == "tag"
+        }
+        assert counts == {"work": 3, "home": 1}
+
+    async def test_included_fragments_match_the_resource(self):
+        await self._create_computers()
+        client = AsyncClient()
+
+        assert (await client.get("/api/customers/", {"include": "computers.tags"})).status_code == 200
+        response = await client.get("/api/tags/", {"sort": "label"})
+        assert [item["attributes"]["computer_count"] for item in json.loads(response.content)["data"]] == [1, 3]
+
+    async def test_computed_fields_are_not_served_from_fragments(self):
+        await self._create_computers()
+        client = AsyncClient()
+        assert (await client.get("/api/tags/", {"sort": "label"})).status_code == 200
+
+        home = await sync_to_async(Tag.objects.get)(label="home")
+        computer = await _create_computer("SN-004")
+        # the tag row isn't written, only the count changes
+        await sync_to_async(computer.tags.add)(home)
+
+        response = await client.get("/api/tags/", {"sort": "label"})
+        assert [item["attributes"]["computer_count"] for item in json.loads(response.content)["data"]] == [2, 3]
+
+
+class TestAggregates:
+    async def _create_computers(self, monkeypatch):
+        from django_ninja_jsonapi.views import QueryField
+        from tests.test_e2e.conftest import GenericView
+
+        alice = await _create_customer("Alice", "a@b.com")
+        bob = await _create_customer("Bob", "b@b.com")
+        await _create_computer("SN-001", owner=alice)
+        await _create_computer("SN-002", owner=bob)
+        await _create_computer("SN-003", owner=bob)
+        monkeypatch.setattr(
+            GenericView,
+            "query_allowlist",
+            {
+                "serial": QueryField(operators=("eq",), aggregates=("count", "max")),
+                "owner.name": QueryField(operators=("eq",)),
+            },
+        )
+
+    async def test_aggregates_in_meta(self, monkeypatch):
+        await self._create_computers(monkeypatch)
+        client = AsyncClient()
+
+        response = await client.get("/api/computers/", {"filter[owner.name]": "Bob", "meta[aggregate]": "count:serial"})
+        assert response.status_code == 200
+        body = json.loads(response.content)
+        assert len(body["data"]) == 2
+        assert body["meta"]["aggregates"] == {"count": {"serial": 2}}
+
+    async def test_zero_page_size_returns_only_aggregates(self, monkeypatch):
+        await self._create_computers(monkeypatch)
+        client = AsyncClient()
+
+        response = await client.get("/api/computers/", {"page[size]": "0", "meta[aggregate]": "max:serial"})
+        assert response.status_code == 200
+        body = json.loads(response.content)
+        assert body["data"] == []
+        assert body["meta"]["count"] == 3
+        assert body["meta"]["aggregates"] == {"max": {"serial": "SN-003"}}
+
+    async def test_aggregates_outside_the_allowlist_are_rejected(self, monkeypatch):
+        await self._create_computers(monkeypatch)
+        client = AsyncClient()
+
+        response = await client.get("/api/computers/", {"meta[aggregate]": "count_by:owner.name"})
+        assert response.status_code == 400
+
+    async def test_aggregates_require_an_allowlist(self):
+        client = AsyncClient()
+
+        response = await client.get("/api/computers/", {"meta[aggregate]": "count:serial"})
+        assert response.status_code == 400
+        body = json.loads(response.content)
+        assert body["errors"][0]["source"]["parameter"] == "meta[aggregate]"
+
+
+class TestCountOnly:
+    async def test_head_list_returns_the_count_header(self):
+        alice = await _create_customer("Alice", "a@b.com")
+        await _create_computer("SN-001", owner=alice)
+        await _create_computer("SN-002")
+        client = AsyncClient()
+
+        resp = await client.head("/api/computers/", {"filter[serial]": "SN-002"})
+        assert resp.status_code == 200
+        assert resp.content == b""
+        assert resp["Content-Type"] == JSONAPI_CT
+        assert resp["X-Total-Count"] == "1"
+
+    async def test_head_detail_checks_existence(self):
+        await _create_computer("SN-001")
+        pk = await _first_computer_pk()
+        client = AsyncClient()
+
+        resp = await client.head(f"/api/computers/{pk}/")
+        assert resp.status_code == 200
+        assert resp.content == b""
+        assert (await client.head(f"/api/computers/{pk + 1}/")).status_code == 404
+
+    async def test_head_requests_are_recorded_in_metrics(self, settings):
+        from django_ninja_jsonapi.metrics import metrics_registry
+
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "METRICS": {"ENABLED": True}}
+        metrics_registry.reset()
+        await _create_computer("SN-001")
+        pk = await _first_computer_pk()
+        client = AsyncClient()
+        assert (await client.head("/api/computers/")).status_code == 200
+        assert (await client.head(f"/api/computers/{pk}/")).status_code == 200
+
+        text = metrics_registry.render()
+        metrics_registry.reset()
+        assert 'jsonapi_requests_total{operation="get_list",resource_type="computer"} 1' in text
+        assert 'jsonapi_requests_total{operation="get",resource_type="computer"} 1' in text
+
+    async def test_zero_page_size_runs_only_the_count(self, settings):
+        settings.MIDDLEWARE = ["django_ninja_jsonapi.diagnostics.JSONAPIDiagnosticsMiddleware"]
+        settings.NINJA_JSONAPI = {
+            **settings.NINJA_JSONAPI,
+            "ALLOW_COUNT_ONLY": True,
+            "DEBUG_META": True,
+            "DIAGNOSTICS": {"ENABLED": True},
+        }
+        await _create_computer("SN-001")
+        await _create_computer("SN-002")
+        client = AsyncClient()
+
+        resp = await client.get("/api/computers/", {"page[size]": "0", "include": "owner"})
+        assert resp.status_code == 200
+        body = json.loads(resp.content)
+        assert body["data"] == []
+        assert body["meta"]["count"] == 2
+        assert body["meta"]["debug"]["queryCount"] == 1
+        assert "next" not in body["links"]
+
+    async def test_zero_page_size_counts_relationship_members(self, settings):
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "ALLOW_COUNT_ONLY": True}
+        customer = await _create_customer()
+        await _create_computer("SN-001", owner=customer)
+        await _create_computer("SN-002", owner=customer)
+        await _create_computer("SN-003")
+        client = AsyncClient()
+
+        resp = await client.get(f"/api/customers/{customer.pk}/relationships/computers/", {"page[size]": "0"})
+        assert resp.status_code == 200
+        body = json.loads(resp.content)
+        assert body["data"] == []
+        assert body["meta"]["count"] == 2
+        assert set(body["links"]) == {"self"}
+
+    async def test_zero_page_size_disables_pagination_without_count_only(self):
+        await _create_computer("SN-001")
+        await _create_computer("SN-002")
+        client = AsyncClient()
+
+        resp = await client.get("/api/computers/", {"page[size]": "0"})
+        assert resp.status_code == 200
+        assert len(json.loads(resp.content)["data"]) == 2
+
+
+class TestWindowCount:
+    @pytest.fixture(autouse=True)
+    def window_count(self, monkeypatch, settings):
+        from django_ninja_jsonapi.data_layers.django_orm.orm import DjangoORMDataLayer
+
+        monkeypatch.setattr(DjangoORMDataLayer, "collection_count_strategy", "window")
+        settings.MIDDLEWARE = ["django_ninja_jsonapi.diagnostics.JSONAPIDiagnosticsMiddleware"]
+        settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "DEBUG_META": True, "DIAGNOSTICS": {"ENABLED": True}}
+
+    async def _create_computers(self):
+        for number in range(5):
+            await _create_computer(f"SN-00{number}")
+
+    async def test_page_and_count_in_one_query(self):
+        await self._create_computers()
+        client = AsyncClient()
+
+        resp = await client.get("/api/computers/", {"page[size]": "2", "page[number]": "2", "sort": "serial"})
+        assert resp.status_code == 200
+        body = json.loads(resp.content)
+        assert [item["attributes"]["serial"] for item in body["data"]] == ["SN-002", "SN-003"]
+        assert "jsonapiWindowCount" not in body["data"][0]["attributes"]
+        assert body["meta"]["count"] == 5
+        assert body["meta"]["total_pages"] == 3
+        assert body["meta"]["debug"]["queryCount"] == 1
+
+    async def test_trusted_read_rows(self, monkeypatch):
+        from tests.test_e2e.conftest import GenericView
+
+        monkeypatch.setattr(GenericView, "trusted_read", True)
+        await self._create_computers()
+        client = AsyncClient()
+
+        resp = await client.get("/api/computers/", {"page[size]": "2"})
+        body = json.loads(resp.content)
+        assert len(body["data"]) == 2
+        assert body["meta"]["count"] == 5
+        assert body["meta"]["debug"]["queryCount"] == 1
+
+    async def test_page_past_the_end_counts_separately(self):
+        await self._create_computers()
+        client = AsyncClient()
+
+        resp = await client.get("/api/computers/", {"page[size]": "2", "page[number]": "4"})
+        body = json.loads(resp.content)
+        assert body["data"] == []
+        assert body["meta"]["count"] == 5
+        assert body["meta"]["debug"]["queryCount"] == 2
+
+    async def test_empty_collection(self):
+        client = AsyncClient()
+
+        resp = await client.get("/api/computers/")
+        body = json.loads(resp.content)
+        assert body["meta"]["count"] == 0
+        assert body["meta"]["debug"]["queryCount"] == 1
@@ -55,6 +55,21 @@ def test_fields_unknown_attribute_raises_invalid_field(monkeypatch):
         _ = QueryStringManager(request).fields
 
 
+class ProfileAttrsSchema(BaseModel):
+    first_name: str
+    last_name: str
+
+
+@override_settings(NINJA_JSONAPI={"INFLECTION": "dasherize"})
+def test_fields_inflected_names_map_to_schema_fields(monkeypatch):
+    monkeypatch.setattr(schemas_storage, "has_resource", lambda resource_type: True)
+    monkeypatch.setattr(schemas_storage, "get_attrs_schema", lambda resource_type, operation_type: ProfileAttrsSchema)
+
+    request = RequestFactory().get("/api/profiles", {"fields[profile]": "first-name,last-name"})
+
+    assert QueryStringManager(request).fields == {"profile": {"first_name", "last_name"}}
+
+
 @override_settings(NINJA_JSONAPI={"MAX_INCLUDE_DEPTH": 1, "MAX_PAGE_SIZE": 100, "ALLOW_DISABLE_PAGINATION": True})
 def test_include_depth_limit_raises_invalid_include():
     request = RequestFactory().get("/api/users", {"include": "posts.author"})
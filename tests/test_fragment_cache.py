@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+
+from django_ninja_jsonapi.fragment_cache import (
+    ALL_FIELDS_KEY,
+    FragmentCache,
+    encode_fragment,
+    get_fieldset_key,
+    get_version_key,
+    invalidate_fragments,
+)
+from django_ninja_jsonapi.storages.models_storage import models_storage
+from tests.testapp.models import Tag
+
+
+@pytest.fixture
+def fragment_cache():
+    models_storage.add_model("tag", Tag, "id", "/tags")
+    cache.clear()
+    yield FragmentCache({"RESOURCES": {"tag": {}}})
+    cache.clear()
+
+
+def test_fieldset_key():
+    assert get_fieldset_key(None) == get_fieldset_key({}) == ALL_FIELDS_KEY
+    assert get_fieldset_key(["label", "id"]) == get_fieldset_key({"id", "label"}) != ALL_FIELDS_KEY
+
+
+@pytest.mark.django_db
+def test_keys_change_when_object_is_saved(fragment_cache):
+    tag = Tag.objects.create(label="python")
+    lookup = ("tag", str(tag.pk), ALL_FIELDS_KEY)
+
+    key = fragment_cache.get_keys({lookup: tag})[lookup]
+    assert fragment_cache.get_keys({lookup: tag})[lookup] == key
+
+    tag.save()
+    assert fragment_cache.get_keys({lookup: tag})[lookup] != key
+
+    cache.delete(get_version_key("tag", str(tag.pk)))
+    assert fragment_cache.get_keys({lookup: tag})[lookup] != key
+
+
+@pytest.mark.django_db
+def test_invalidate_fragments_changes_keys(fragment_cache, settings):
+    settings.NINJA_JSONAPI = {"FRAGMENT_CACHE": {"ENABLED": True, "RESOURCES": {"tag": {}}}}
+    tag = Tag.objects.create(label="python")
+    lookup = ("tag", str(tag.pk), ALL_FIELDS_KEY)
+    key = fragment_cache.get_keys({lookup: tag})[lookup]
+
+    # update() doesn't send post_save
+    Tag.objects.filter(pk=tag.pk).update(label="rust")
+    assert fragment_cache.get_keys({lookup: tag})[lookup] == key
+
+    invalidate_fragments("tag", [tag.pk])
+    assert fragment_cache.get_keys({lookup: tag})[lookup] != key
+
+
+def test_fragments_are_stored_json_ready():
+    item_data = {
+        "id": "1",
+        "type": "tag",
+        "attributes": {"created": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)},
+        "links": {},
+    }
+
+    assert encode_fragment(item_data) == {"id": "1", "type": "tag", "attributes": {"created": "2024-05-01T12:30:00Z"}}
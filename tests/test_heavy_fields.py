@@ -0,0 +1,93 @@
+from typing import Any, Optional
+
+import pytest
+from django.db import models
+from pydantic import BaseModel, create_model
+
+from django_ninja_jsonapi.views.heavy_fields import (
+    build_heavy_fields,
+    create_omit_unset_serializer,
+    get_omittable_attributes,
+)
+from tests.testapp.models import Customer
+
+
+class Article(models.Model):
+    title = models.CharField(max_length=128)
+    body = models.TextField()
+    data = models.JSONField(default=dict)
+    thumbnail = models.BinaryField(null=True)
+    summary = models.TextField()
+
+    class Meta:
+        app_label = "testapp"
+        managed = False
+
+
+def test_auto_defers_text_json_and_binary_attributes():
+    attributes = ("title", "body", "data", "thumbnail", "summary")
+
+    assert build_heavy_fields(Article, "auto", attributes, ()) == ("body", "data", "thumbnail", "summary")
+    # meta fields are always read, columns outside the schema are never touched
+    assert build_heavy_fields(Article, "auto", ("title", "body", "summary"), ("summary",)) == ("body",)
+
+
+def test_declared_heavy_fields():
+    assert build_heavy_fields(Customer, ("email",), ("name", "email"), ()) == ("email",)
+    assert build_heavy_fields(Customer, ("email",), ("name", "email"), ("email",)) == ()
+    assert build_heavy_fields(Customer, (), ("name", "email"), ()) == ()
+
+
+@pytest.mark.parametrize("declared", [("computers",), ("missing",), ("email",)])
+def test_declared_heavy_fields_must_be_column_attributes(declared):
+    with pytest.raises(ValueError, match=f"Heavy field {declared[0]!r} is not a column attribute of Customer"):
+        build_heavy_fields(Customer, declared, ("name", "computers"), ())
+
+
+class ArticleSchema(BaseModel):
+    title: str
+    body: Optional[str]
+    data: dict[str, Any]
+    views: int
+
+    class JSONAPIMeta:
+        heavy_fields = "auto"
+
+
+def test_omittable_attributes(monkeypatch):
+    assert get_omittable_attributes(ArticleSchema, ArticleSchema.model_fields) == ("title", "body", "data")
+    # resolved against the model, only the deferred columns
+    assert get_omittable_attributes(ArticleSchema, ArticleSchema.model_fields, Article) == ("body", "data")
+
+    monkeypatch.setattr(ArticleSchema.JSONAPIMeta, "heavy_fields", ["body", "missing"])
+    assert get_omittable_attributes(ArticleSchema, ArticleSchema.model_fields) == ("body",)
+
+
+def test_omit_unset_serializer_drops_attributes_left_out():
+    attributes = create_model(
+        "ArticleAttributes",
+        title=(str, ...),
+        body=(Optional[str], None),
+        __validators__={"omit_unset": create_omit_unset_serializer(("body",))},
+    )
+
+    assert attributes(title="a").model_dump() == {"title": "a"}
+    assert attributes(title="a", body=None).model_dump() == {"title": "a", "body": None}
+
+
+def test_auto_heavy_fields_of_the_response_schema_follow_the_model():
+    from django_ninja_jsonapi.schema_builder import SchemaBuilder
+    from django_ninja_jsonapi.storages.models_storage import models_storage
+
+    class AutoArticleSchema(BaseModel):
+        title: str
+        body: str
+
+        class JSONAPIMeta:
+            heavy_fields = "auto"
+
+    models_storage.add_model("auto-article", Article, "id", "/articles")
+    attributes = SchemaBuilder("auto-article").create_jsonapi_object_schemas(AutoArticleSchema).attributes_schema
+
+    assert attributes.model_fields["title"].is_required()
+    assert not attributes.model_fields["body"].is_required()
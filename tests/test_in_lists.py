@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+from django.db.models import F, Q
+from django.test.utils import override_settings
+
+from django_ninja_jsonapi.data_layers.django_orm import in_lists
+from django_ninja_jsonapi.data_layers.django_orm.in_lists import ArrayAnyIn, build_in_q
+from django_ninja_jsonapi.data_layers.django_orm.query_building import apply_filters
+from tests.testapp.models import Computer, Customer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def computers():
+    owner = Customer.objects.create(name="Alice", email="a@b.com")
+    return [Computer.objects.create(serial=f"SN-{index}", owner=owner if index % 2 else None) for index in range(6)]
+
+
+def _serials(filters) -> list[str]:
+    return sorted(apply_filters(Computer.objects.all(), filters).values_list("serial", flat=True))
+
+
+@override_settings(NINJA_JSONAPI={"IN_LIST_THRESHOLD": 2})
+def test_large_lists_are_bound_as_one_parameter(computers):
+    ids = [str(computer.pk) for computer in computers[:4]] + ["999", None]
+    queryset = apply_filters(Computer.objects.all(), [{"name": "id", "op": "in", "val": ids}])
+
+    sql, params = queryset.query.sql_with_params()
+    assert "json_each" in sql
+    assert len(params) == 1
+    assert sorted(queryset.values_list("serial", flat=True)) == ["SN-0", "SN-1", "SN-2", "SN-3"]
+
+
+def test_large_lists_match_regular_in_filters(computers, settings):
+    owner_id = computers[1].owner_id
+    filters = [
+        [{"name": "serial", "op": "in", "val": ["SN-1", "SN-2", "SN-5", "nope"]}],
+        [{"name": "serial", "op": "not_in", "val": ["SN-1", "SN-2", "SN-5", "nope"]}],
+        # NULL owners are kept by ``not_in``, like ``exclude(owner__in=...)``
+        [{"name": "owner", "op": "not_in", "val": [owner_id, owner_id + 1, owner_id + 2]}],
+        [{"name": "owner.name", "op": "in", "val": ["Alice", "Bob", "Carol"]}],
+        [{"not": {"name": "id", "op": "in", "val": [computer.pk for computer in computers[:3]]}}],
+    ]
+    expected = [_serials(item) for item in filters]
+
+    settings.NINJA_JSONAPI = {**settings.NINJA_JSONAPI, "IN_LIST_THRESHOLD": 2}
+    assert [_serials(item) for item in filters] == expected
+    assert expected[2] == ["SN-0", "SN-2", "SN-4"]
+
+
+def test_lists_over_the_sqlite_variable_limit(computers):
+    ids = [*range(100_000, 150_000), computers[0].pk]
+
+    assert _serials([{"name": "id", "op": "in", "val": ids}]) == ["SN-0"]
+
+
+@override_settings(NINJA_JSONAPI={"IN_LIST_THRESHOLD": 2})
+def test_invalid_values_fail_when_the_filter_is_added():
+    with pytest.raises(ValueError):
+        apply_filters(Computer.objects.all(), [{"name": "id", "op": "in", "val": ["1", "2", "x"]}])
+
+
+@override_settings(NINJA_JSONAPI={"IN_LIST_THRESHOLD": 2})
+def test_other_databases_use_chunked_in_lists(monkeypatch):
+    monkeypatch.setattr(in_lists, "connections", {"default": SimpleNamespace(vendor="oracle")})
+
+    assert build_in_q("id", [1, 2, 3], negated=True) == ~(Q(id__in=[1, 2]) | Q(id__in=[3]))
+
+
+def test_array_any_sql():
+    queryset = Computer.objects.filter(Q(ArrayAnyIn(F("owner__name"), ["a", "b"], negated=True)))
+
+    sql, params = queryset.query.sql_with_params()
+    assert '(NOT ("testapp_customer"."name" = ANY(%s::varchar(128)[])) OR "testapp_customer"."name" IS NULL)' in sql
+    assert params == (["a", "b"],)
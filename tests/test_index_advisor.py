@@ -0,0 +1,102 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from django_ninja_jsonapi.index_advisor import (
+    IndexUsageRecorder,
+    get_existing_indexes,
+    get_index_suggestions,
+    index_usage_recorder,
+    record_query_usage,
+)
+from django_ninja_jsonapi.querystring import QueryStringManager
+from tests.testapp.models import Computer, Customer
+
+
+@pytest.fixture(autouse=True)
+def reset_recorder():
+    index_usage_recorder.reset()
+    yield
+    index_usage_recorder.reset()
+
+
+def test_existing_indexes():
+    assert get_existing_indexes(Customer) == [("id",), ("email",)]
+    assert get_existing_indexes(Computer) == [("id",), ("owner",)]
+
+
+def test_suggestions_put_equality_before_sort_columns():
+    recorder = IndexUsageRecorder()
+    recorder.record(Computer, "computer", [{"name": "serial", "op": "eq", "val": "a"}], [], 0.02)
+    recorder.record(Computer, "computer", [{"name": "serial", "op": "eq", "val": "b"}], [{"field": "id"}], 0.05)
+    # already indexed
+    recorder.record(Customer, "customer", [{"name": "email", "op": "eq", "val": "a@example.com"}], [], 0.01)
+    # pattern matching can't use a B-tree index
+    recorder.record(Customer, "customer", [{"name": "name", "op": "ilike", "val": "a"}], [], 0.5)
+
+    suggestions = get_index_suggestions(recorder.collect())
+
+    assert len(suggestions) == 1
+    suggestion = suggestions[0]
+    assert suggestion.model is Computer
+    # the (serial) proposal is served by the (serial, id) index
+    assert suggestion.fields == ("serial", "id")
+    assert suggestion.requests == 2
+    assert suggestion.total_seconds == pytest.approx(0.07)
+    assert suggestion.max_seconds == pytest.approx(0.05)
+    assert suggestion.resource_types == ("computer",)
+
+
+def test_suggestions_for_joined_and_range_conditions():
+    recorder = IndexUsageRecorder()
+    recorder.record(Computer, "computer", [{"name": "owner.name", "op": "eq", "val": "a"}], [], 0.1)
+    recorder.record(Customer, "customer", [{"name": "name", "op": "ge", "val": "m"}], [], 0.2)
+    recorder.record(Customer, "customer", [], [{"field": "name", "order": "desc"}], 0.01)
+
+    suggestions = get_index_suggestions(recorder.collect(), min_requests=2)
+
+    assert [(suggestion.model, suggestion.fields, suggestion.requests) for suggestion in suggestions] == [
+        (Customer, ("name",), 3),
+    ]
+    assert suggestions[0].resource_types == ("computer", "customer")
+
+
+def test_usage_is_shared_through_directory(tmp_path):
+    recorder = IndexUsageRecorder()
+    recorder.record(Computer, "computer", [{"name": "serial", "op": "eq", "val": "a"}], [], 0.02)
+    recorder.flush(str(tmp_path))
+
+    usage = IndexUsageRecorder().collect(str(tmp_path))
+    assert [suggestion.fields for suggestion in get_index_suggestions(usage)] == [("serial",)]
+
+
+def test_record_query_usage_only_when_enabled():
+    qs = QueryStringManager(RequestFactory().get("/api/computers/", {"filter[serial]": "a"}))
+
+    record_query_usage(Computer, "computer", qs, 0.01)
+    assert index_usage_recorder.snapshot() == []
+
+    with override_settings(NINJA_JSONAPI={"INDEX_ADVISOR": {"ENABLED": True}}):
+        record_query_usage(Computer, "computer", qs, 0.01)
+    assert index_usage_recorder.snapshot() == [["testapp.Computer", "computer", (("serial", "eq"),), (), 1, 0.01, 0.01]]
+
+
+def test_management_command():
+    index_usage_recorder.record(Computer, "computer", [{"name": "serial", "op": "eq", "val": "a"}], [], 0.02)
+
+    out = StringIO()
+    call_command("jsonapi_index_advice", stdout=out)
+    assert out.getvalue().startswith("testapp.Computer ('serial'): 1 requests, 20.0ms total")
+    assert "models.Index(fields=['serial'], name='testapp_com_serial_" in out.getvalue()
+
+    out = StringIO()
+    call_command("jsonapi_index_advice", "--operations", stdout=out)
+    assert "migrations.AddIndex(" in out.getvalue()
+    assert "model_name='computer'" in out.getvalue()
+
+    out = StringIO()
+    call_command("jsonapi_index_advice", "--min-requests", "2", stdout=out)
+    assert out.getvalue() == "No missing indexes found.\n"
@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import pytest
 from django.test.utils import override_settings
+from pydantic import BaseModel
 
 from django_ninja_jsonapi.inflection import (
     camelize,
     dasherize,
     format_keys,
     get_formatter,
+    get_key_map,
     underscore,
     unformat_keys,
 )
@@ -128,3 +130,41 @@ class TestGetFormatter:
     def test_invalid_inflection_raises(self):
         with pytest.raises(ValueError, match="not a recognised inflection"):
             get_formatter()
+
+
+class TestNestedFormatKeys:
+    def test_nested_dicts_and_lists(self):
+        data = {"shipping_address": {"street_name": "Main", "extra_lines": [{"line_no": 1}]}}
+        result = format_keys(data, camelize, nested=True)
+        assert result == {"shippingAddress": {"streetName": "Main", "extraLines": [{"lineNo": 1}]}}
+
+    def test_shallow_by_default(self):
+        result = format_keys({"shipping_address": {"street_name": "Main"}}, camelize)
+        assert result == {"shippingAddress": {"street_name": "Main"}}
+
+
+class CustomerAttributes(BaseModel):
+    first_name: str
+    HTMLTitle: str
+
+
+class TestKeyMap:
+    def test_reverse_names(self):
+        key_map = get_key_map(CustomerAttributes, dasherize)
+        assert key_map.unformat("first-name") == "first_name"
+        # the reverse map keeps names that underscore() can't restore
+        assert key_map.unformat("HTMLTitle") == "HTMLTitle"
+
+    def test_without_inflection_keys_are_unchanged(self):
+        key_map = get_key_map(CustomerAttributes, None)
+        assert key_map.unformat("first-name") == "first-name"
+
+
+class TestFormatterCache:
+    def test_formatter_is_reset_when_setting_changes(self):
+        with override_settings(NINJA_JSONAPI={"INFLECTION": "dasherize"}):
+            assert get_formatter()("first_name") == "first-name"
+            with override_settings(NINJA_JSONAPI={"INFLECTION": "camelize"}):
+                assert get_formatter()("first_name") == "firstName"
+            assert get_formatter()("first_name") == "first-name"
+        assert get_formatter() is None
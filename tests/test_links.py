@@ -0,0 +1,38 @@
+from django.test import RequestFactory
+
+from django_ninja_jsonapi.links import LinkBuilder
+
+
+def test_absolute_links_use_request_host():
+    request = RequestFactory().get("/api/articles/", {"sort": "-title", "page[size]": "10"})
+    link_builder = LinkBuilder.for_request(request)
+
+    assert LinkBuilder.for_request(request) is link_builder
+    assert link_builder.url("/api/articles/1/") == "http://testserver/api/articles/1/"
+    assert link_builder.self_url == "http://testserver/api/articles/?sort=-title&page%5Bsize%5D=10"
+    assert link_builder.relationship_urls("/api/articles/1/", "author") == {
+        "self": "http://testserver/api/articles/1/relationships/author/",
+        "related": "http://testserver/api/articles/1/author/",
+    }
+
+
+def test_page_urls_replace_and_remove_params():
+    request = RequestFactory().get("/api/articles/", {"sort": "-title", "page[number]": "2", "page[size]": "10"})
+    link_builder = LinkBuilder(request)
+
+    assert link_builder.page_url({"page[number]": 3}) == (
+        "http://testserver/api/articles/?sort=-title&page%5Bnumber%5D=3&page%5Bsize%5D=10"
+    )
+    assert link_builder.page_url({"page[number]": None, "page[size]": None, "sort": None}) == (
+        "http://testserver/api/articles/"
+    )
+
+
+def test_relative_links_and_disabled_relationship_links(settings):
+    settings.NINJA_JSONAPI = {"LINKS": {"RELATIVE": True, "RELATIONSHIP_LINKS": False}}
+    request = RequestFactory().get("/api/articles/")
+    link_builder = LinkBuilder.for_request(request)
+
+    assert link_builder.url("/api/articles/1/") == "/api/articles/1/"
+    assert link_builder.page_url({"page[number]": 1}) == "/api/articles/?page%5Bnumber%5D=1"
+    assert link_builder.relationship_urls("/api/articles/1/", "author") is None
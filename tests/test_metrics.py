@@ -0,0 +1,88 @@
+import os
+
+import pytest
+from django.test import RequestFactory
+
+from django_ninja_jsonapi.metrics import (
+    CONTENT_TYPE,
+    MULTIPROCESS_FILE_PREFIX,
+    MetricsRegistry,
+    finish_request_metrics,
+    get_metrics_config,
+    metrics_registry,
+    metrics_view,
+    start_request_metrics,
+)
+
+LABELS = {"resource_type": "customer", "operation": "get_list"}
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics_registry.reset()
+    yield
+    metrics_registry.reset()
+
+
+def test_render_counters_and_histograms():
+    registry = MetricsRegistry()
+    registry.inc("jsonapi_requests_total", LABELS)
+    registry.inc("jsonapi_requests_total", LABELS)
+    registry.observe("jsonapi_rows", LABELS, 3)
+    registry.observe("jsonapi_rows", LABELS, 2000)
+
+    text = registry.render()
+    assert "# TYPE jsonapi_requests_total counter" in text
+    assert 'jsonapi_requests_total{operation="get_list",resource_type="customer"} 2' in text
+    assert 'jsonapi_rows_bucket{operation="get_list",resource_type="customer",le="1.0"} 0' in text
+    assert 'jsonapi_rows_bucket{operation="get_list",resource_type="customer",le="5.0"} 1' in text
+    assert 'jsonapi_rows_bucket{operation="get_list",resource_type="customer",le="+Inf"} 2' in text
+    assert 'jsonapi_rows_sum{operation="get_list",resource_type="customer"} 2003' in text
+    assert 'jsonapi_rows_count{operation="get_list",resource_type="customer"} 2' in text
+
+
+def test_multiprocess_dir_merges_process_files(settings, tmp_path):
+    settings.NINJA_JSONAPI = {"METRICS": {"ENABLED": True, "MULTIPROCESS_DIR": str(tmp_path)}}
+    other_process = MetricsRegistry()
+    other_process.inc("jsonapi_errors_total", {**LABELS, "status": "400"})
+    other_process.flush()
+    own_file = tmp_path / f"{MULTIPROCESS_FILE_PREFIX}{os.getpid()}.json"
+    os.replace(own_file, tmp_path / f"{MULTIPROCESS_FILE_PREFIX}1.json")
+
+    metrics_registry.inc("jsonapi_errors_total", {**LABELS, "status": "400"})
+
+    text = metrics_registry.render()
+    assert 'jsonapi_errors_total{operation="get_list",resource_type="customer",status="400"} 2' in text
+
+
+def test_request_metrics_are_recorded_once(settings):
+    settings.NINJA_JSONAPI = {"METRICS": {"ENABLED": True}}
+    request = RequestFactory().get("/api/customers/")
+    request_metrics = start_request_metrics(request, resource_type="customer", operation="get_list")
+    request_metrics.rows = 2
+    request_metrics.included = 0
+
+    finish_request_metrics(request, status=200, response_bytes=512)
+    finish_request_metrics(request, status=200, response_bytes=512)
+
+    response = metrics_view(RequestFactory().get("/metrics"))
+    assert response["Content-Type"] == CONTENT_TYPE
+    text = response.content.decode()
+    assert 'jsonapi_requests_total{operation="get_list",resource_type="customer"} 1' in text
+    assert 'jsonapi_response_bytes_sum{operation="get_list",resource_type="customer"} 512' in text
+    assert 'jsonapi_rows_sum{operation="get_list",resource_type="customer"} 2' in text
+
+
+def test_metrics_disabled_by_default():
+    request = RequestFactory().get("/api/customers/")
+    assert start_request_metrics(request, resource_type="customer", operation="get_list") is None
+
+
+def test_config_is_read_once_per_settings_change(settings, tmp_path):
+    settings.NINJA_JSONAPI = {"METRICS": {"ENABLED": True}}
+    config = get_metrics_config()
+    assert config == {"ENABLED": True}
+    assert get_metrics_config() is config
+
+    settings.NINJA_JSONAPI = {"METRICS": {"ENABLED": True, "MULTIPROCESS_DIR": str(tmp_path)}}
+    assert get_metrics_config()["MULTIPROCESS_DIR"] == str(tmp_path)
@@ -0,0 +1,111 @@
+import pytest
+from django.test import RequestFactory
+
+from django_ninja_jsonapi.exceptions import InvalidFilters, InvalidSort
+from django_ninja_jsonapi.querystring import QueryStringManager
+from django_ninja_jsonapi.views import QueryField
+from django_ninja_jsonapi.views.query_allowlist import build_query_allowlist, get_query_allowlist, is_sort_indexed
+from tests.testapp.models import Computer
+
+
+class ComputerView:
+    query_allowlist = {
+        "serial": QueryField(operators=("eq", "in", "ilike"), sortable=True),
+        "owner.name": QueryField(operators=["eq"]),
+        "id": QueryField(sortable=True),
+    }
+
+
+class LargeComputerView(ComputerView):
+    large_resource = True
+
+
+def _validate(view, params: dict):
+    query_params = QueryStringManager(RequestFactory().get("/api/computers", params))
+    allowlist = get_query_allowlist(view, Computer)
+    allowlist.validate("computer", query_params.filters, query_params.sorts)
+
+
+def test_allowed_filters_and_sorts_pass():
+    _validate(
+        ComputerView,
+        {
+            "filter": '[{"or": [{"name": "serial", "op": "ilike", "val": "a"}, {"name": "owner.name", "val": "b"}]}]',
+            "filter[serial]": "SN-1",
+            "sort": "-serial,id",
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    ("params", "detail"),
+    [
+        ({"filter[owner.email]": "a@b.com"}, "Filtering on 'owner.email' is not allowed for resource type 'computer'"),
+        (
+            {"filter": '[{"not": {"name": "owner.name", "op": "ne", "val": "a"}}]'},
+            "Operator 'ne' is not allowed on 'owner.name' for resource type 'computer'",
+        ),
+    ],
+)
+def test_filters_outside_allowlist_are_rejected(params, detail):
+    with pytest.raises(InvalidFilters) as exc_info:
+        _validate(ComputerView, params)
+
+    assert exc_info.value.as_dict["detail"] == detail
+    assert exc_info.value.as_dict["source"] == {"parameter": "filters"}
+
+
+@pytest.mark.parametrize("filters", ["[1]", '[["serial"]]', '[{"and": 1}]', '[{"not": "serial"}]'])
+def test_malformed_filters_are_rejected(filters):
+    with pytest.raises(InvalidFilters, match="Incorrect filter format"):
+        _validate(ComputerView, {"filter": filters})
+
+
+def test_sorts_outside_allowlist_are_rejected():
+    with pytest.raises(InvalidSort, match="Sorting by 'owner.name' is not allowed"):
+        _validate(ComputerView, {"sort": "owner.name"})
+
+
+def test_large_resource_refuses_scans():
+    with pytest.raises(InvalidFilters, match="Operator 'ilike' is not allowed for resource type 'computer'"):
+        _validate(LargeComputerView, {"filter": '[{"name": "serial", "op": "ilike", "val": "a"}]'})
+
+    # ``serial`` has no index, ``id`` is the primary key
+    with pytest.raises(InvalidSort, match="Sorting by 'serial' requires an index"):
+        _validate(LargeComputerView, {"sort": "id,serial"})
+    _validate(LargeComputerView, {"sort": "-id"})
+
+
+def test_large_resource_without_allowlist_checks_indexes_only():
+    class View:
+        large_resource = True
+
+    _validate(View, {"filter[serial]": "a", "sort": "owner,owner.email"})
+    with pytest.raises(InvalidSort):
+        _validate(View, {"sort": "owner.name"})
+
+
+def test_no_declaration_compiles_to_nothing():
+    assert get_query_allowlist(object, Computer) is None
+
+
+def test_allowlist_declarations_are_checked():
+    with pytest.raises(ValueError, match="Unknown filter operators"):
+        QueryField(operators=("contains",))
+
+    with pytest.raises(ValueError, match="'owner.nickname' is not a field of Computer"):
+        build_query_allowlist(Computer, (("owner.nickname", QueryField(operators=("eq",))),), False)
+
+
+def test_sort_index_lookup():
+    assert is_sort_indexed(Computer, "tags") is None
+    assert is_sort_indexed(Computer, "owner.email") is True
+    assert is_sort_indexed(Computer, "serial") is False
+
+
+def test_sort_index_cache_is_bounded_against_client_paths():
+    allowlist = build_query_allowlist(Computer, None, True)
+    for index in range(2000):
+        allowlist.validate("computer", [], [{"field": f"unknown_{index}", "order": "asc"}])
+
+    assert is_sort_indexed.cache_info().currsize <= is_sort_indexed.cache_info().maxsize
@@ -0,0 +1,82 @@
+import pytest
+from django.test import RequestFactory, override_settings
+
+from django_ninja_jsonapi.exceptions import InvalidFilters, InvalidInclude, InvalidSort, QueryCostExceeded
+from django_ninja_jsonapi.query_cost import QueryCostEstimator
+from django_ninja_jsonapi.querystring import QueryStringManager
+from tests.testapp.models import Computer, Customer
+
+
+def _estimator(params: dict, model=Customer, is_collection: bool = True, include_limits=None) -> QueryCostEstimator:
+    request = RequestFactory().get("/api/customers", params)
+    return QueryCostEstimator(
+        query_params=QueryStringManager(request),
+        resource_type="customer",
+        model=model,
+        is_collection=is_collection,
+        include_limits=include_limits,
+    )
+
+
+def test_query_cost_counts_filter_tree_and_to_many_joins():
+    cost = _estimator(
+        {
+            "filter": '[{"or": [{"name": "computers.serial", "op": "eq", "val": "a"}, {"not": {"name": "name"}}]}]',
+            "sort": "-name,computers.tags.label",
+            "page[size]": "10",
+        }
+    ).estimate()
+
+    assert cost.rows == 10
+    assert cost.filter_nodes == 4
+    assert cost.filter_depth == 3
+    assert cost.sorts == 2
+    assert cost.to_many_joins == 3
+    assert cost.total == 10 + 4 * 5 + 2 * 5 + 3 * 25
+
+
+@pytest.mark.parametrize("sort", ["-computers.count", "max:computers.serial", "min:computers.tags.label"])
+def test_query_cost_counts_aggregate_sorts_as_one_to_many_join(sort):
+    cost = _estimator({"sort": sort, "page[size]": "10"}).estimate()
+
+    assert cost.to_many_joins == 1
+
+
+def test_query_cost_detail_reads_count_one_row():
+    cost = _estimator({"page[size]": "10"}, model=Computer, is_collection=False).estimate()
+
+    assert cost.rows == 1
+    assert cost.total == 1
+
+
+@override_settings(NINJA_JSONAPI={"QUERY_COST": {"BUDGET": 30}})
+def test_query_cost_rejects_queries_over_budget():
+    with pytest.raises(QueryCostExceeded) as exc_info:
+        _estimator({"page[size]": "10", "sort": "computers.serial"}).enforce()
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.as_dict["meta"]["queryCost"]["total"] == 10 + 5 + 25
+
+
+@override_settings(NINJA_JSONAPI={"MAX_PAGE_SIZE": 50, "QUERY_COST": {"BUDGET": 40, "MODE": "degrade"}})
+def test_query_cost_degrades_page_size_to_fit_budget():
+    estimator = _estimator({"page[size]": "50", "sort": "name"})
+
+    cost = estimator.enforce()
+
+    assert estimator.query_params.pagination.size == 35
+    assert cost.total == 40
+
+
+@pytest.mark.parametrize(
+    ("config", "params", "exception"),
+    [
+        ({"MAX_INCLUDE_PATHS": 1}, {"include": "computers,computers.tags"}, InvalidInclude),
+        ({"MAX_FILTER_NODES": 1}, {"filter": '[{"and": [{"name": "name"}]}]'}, InvalidFilters),
+        ({"MAX_FILTER_DEPTH": 1}, {"filter": '[{"not": {"name": "name"}}]'}, InvalidFilters),
+        ({"MAX_SORT_FIELDS": 1}, {"sort": "name,email"}, InvalidSort),
+    ],
+)
+def test_query_cost_hard_limits(config, params, exception):
+    with override_settings(NINJA_JSONAPI={"QUERY_COST": config}), pytest.raises(exception):
+        _estimator(params).enforce()
@@ -1,7 +1,7 @@
 from django.test import RequestFactory
 
 from django_ninja_jsonapi.exceptions import BadRequest
-from django_ninja_jsonapi.querystring import QueryStringManager
+from django_ninja_jsonapi.querystring import QueryStringManager, get_filter_leaves
 
 
 def test_querystring_filters_and_sorts_parsing():
@@ -126,3 +126,44 @@ def test_querystring_rejects_repeated_non_filter_param():
         raise AssertionError("Expected BadRequest for repeated page[size]")
     except BadRequest as exc:
         assert exc.as_dict["source"] == {"parameter": "page[size]"}
+
+
+def test_querystring_include_limits_parsing_clamps_to_max():
+    request = RequestFactory().get(
+        "/api/users",
+        {
+            "include": "posts,posts.comments",
+            "page[include.posts.comments]": "500",
+            "page[include.posts]": "5",
+            "page[size]": "10",
+        },
+    )
+
+    manager = QueryStringManager(request)
+
+    assert manager.include_limits == {"posts.comments": 100, "posts": 5}
+    assert manager.pagination.size == 10
+
+
+def test_querystring_invalid_include_limit_raises_bad_request():
+    request = RequestFactory().get("/api/users", {"include": "posts", "page[include.posts]": "0"})
+
+    try:
+        _ = QueryStringManager(request).include_limits
+        raise AssertionError("Expected BadRequest for non-positive include limit")
+    except BadRequest as exc:
+        assert exc.as_dict["source"] == {"parameter": "page[include.posts]"}
+
+
+def test_filter_leaves_of_nested_conditions():
+    filters = [
+        {
+            "or": [
+                {"name": "serial", "op": "eq", "val": "a"},
+                {"not": {"name": "owner.name", "op": "ilike", "val": "b"}},
+            ]
+        },
+        {"name": "id", "op": "gt", "val": 1},
+    ]
+
+    assert get_filter_leaves(filters) == [("serial", "eq"), ("owner.name", "ilike"), ("id", "gt")]
@@ -1,4 +1,5 @@
 import json
+from unittest.mock import patch
 
 import pytest
 from django.test import RequestFactory
@@ -274,3 +275,29 @@ def test_renderer_django_model_fk_none_serialized_as_none():
     result = JSONAPIRenderer._coerce_to_dict(obj)
 
     assert result["author"] is None
+
+
+def test_renderer_reads_model_fields_once_per_model_class():
+    from tests.testapp.models import Customer
+
+    customers = [Customer(id=index, name=f"c{index}", email=f"c{index}@example.com") for index in range(3)]
+    request = RequestFactory().get("/customers/")
+    setattr(request, REQUEST_JSONAPI_CONFIG_ATTR, JSONAPIResourceConfig(resource_type="customer"))
+
+    with patch.object(Customer._meta, "get_fields", wraps=Customer._meta.get_fields) as get_fields:
+        first = _render_payload(request, customers)
+        second = _render_payload(request, customers)
+
+    assert first == second
+    assert [item["attributes"]["name"] for item in first["data"]] == ["c0", "c1", "c2"]
+    assert get_fields.call_count <= 1
+
+
+def test_renderer_inflects_attribute_keys(settings):
+    settings.NINJA_JSONAPI = {"INFLECTION": "camelize"}
+    request = RequestFactory().get("/people/")
+    setattr(request, REQUEST_JSONAPI_CONFIG_ATTR, JSONAPIResourceConfig(resource_type="people"))
+
+    result = _render_payload(request, [{"id": 1, "first_name": "Ada"}, {"id": 2, "first_name": "Alan"}])
+
+    assert [item["attributes"] for item in result["data"]] == [{"firstName": "Ada"}, {"firstName": "Alan"}]
@@ -0,0 +1,53 @@
+import pytest
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from pydantic import BaseModel, ValidationError
+
+from django_ninja_jsonapi.exceptions import BadRequest, RequestEntityTooLarge
+from django_ninja_jsonapi.request_body import parse_json_body, validate_json_body
+
+
+class Payload(BaseModel):
+    name: str
+    tags: list[str] = []
+
+
+def build_request(body: bytes):
+    return RequestFactory().generic(method="POST", path="/api/users", data=body, content_type="application/json")
+
+
+def test_validate_json_body_from_bytes():
+    payload = validate_json_body(build_request(b'{"name": "john", "tags": ["a"]}'), Payload)
+
+    assert payload == Payload(name="john", tags=["a"])
+
+
+def test_validate_json_body_malformed_json_raises_bad_request():
+    with pytest.raises(BadRequest) as exc_info:
+        validate_json_body(build_request(b'{"name": '), Payload)
+
+    assert exc_info.value.as_dict["detail"] == "Malformed JSON request body"
+    assert exc_info.value.as_dict["source"] == {"parameter": "body"}
+
+
+def test_validate_json_body_invalid_payload_raises_validation_error():
+    with pytest.raises(ValidationError):
+        validate_json_body(build_request(b""), Payload)
+
+
+def test_parse_json_body():
+    assert parse_json_body(build_request(b'{"data": null}')) == {"data": None}
+    assert parse_json_body(build_request(b"")) == {}
+
+    with pytest.raises(BadRequest):
+        parse_json_body(build_request(b"\xff"))
+
+
+@override_settings(NINJA_JSONAPI={"MAX_BODY_SIZE": 16})
+def test_body_over_max_size_is_rejected_before_parsing():
+    with pytest.raises(RequestEntityTooLarge) as exc_info:
+        validate_json_body(build_request(b'{"name": "' + b"x" * 32 + b'"}'), Payload)
+
+    assert exc_info.value.status_code == 413
+    assert exc_info.value.as_dict["source"] == {"parameter": "body"}
+    assert parse_json_body(build_request(b'{"name": "x"}')) == {"name": "x"}
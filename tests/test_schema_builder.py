@@ -1,7 +1,10 @@
 import logging
 
+from pydantic import field_validator
+
 from django_ninja_jsonapi.schema_base import BaseModel
-from django_ninja_jsonapi.schema_builder import SchemaBuilder
+from django_ninja_jsonapi.schema_builder import LazyFieldSchemas, SchemaBuilder
+from django_ninja_jsonapi.types_metadata import RelationshipInfo
 
 
 class OutputSchema(BaseModel):
@@ -44,3 +47,54 @@ def test_create_schemas_does_not_warn_when_write_schemas_are_explicit(caplog, mo
     warning_messages = [record.getMessage() for record in caplog.records]
     assert not any("schema_in_post" in message for message in warning_messages)
     assert not any("schema_in_patch" in message for message in warning_messages)
+
+
+class ValidatedSchema(BaseModel):
+    name: str
+    email: str
+
+    @field_validator("email")
+    @classmethod
+    def lower(cls, value: str) -> str:
+        return value.lower()
+
+
+def test_field_schemas_are_built_on_first_use_and_shared():
+    output_dto = SchemaBuilder(resource_type="customer").get_info_from_schema_for_building(
+        base_name="Output",
+        schema=OutputSchema,
+        operation_type="get",
+    )
+    input_dto = SchemaBuilder(resource_type="customer").get_info_from_schema_for_building(
+        base_name="Input",
+        schema=InputSchema,
+        operation_type="create",
+    )
+
+    assert isinstance(output_dto.field_schemas, LazyFieldSchemas)
+    assert output_dto.field_schemas._built == {}
+    assert list(output_dto.field_schemas) == ["name"]
+    assert output_dto.field_schemas["name"] is input_dto.field_schemas["name"]
+    assert output_dto.field_schemas["name"](name="Alice").name == "Alice"
+
+
+def test_field_schemas_with_validators_are_not_shared():
+    dto = SchemaBuilder(resource_type="customer").get_info_from_schema_for_building(
+        base_name="Validated",
+        schema=ValidatedSchema,
+        operation_type="get",
+    )
+
+    assert dto.field_schemas["email"](email="A@B.COM").email == "a@b.com"
+    assert dto.field_schemas["name"] is not dto.field_schemas["email"]
+
+
+def test_relationship_data_schemas_are_shared_per_target_resource_type():
+    to_one = RelationshipInfo(resource_type="user-profile")
+    shared = SchemaBuilder.get_shared_relationship_data_schema(relationship_info=to_one, required=False)
+
+    assert shared.__name__ == "UserProfileOptionalToOneRelationshipDataJSONAPI"
+    assert SchemaBuilder.get_shared_relationship_data_schema(relationship_info=to_one, required=False) is shared
+    assert SchemaBuilder.get_shared_relationship_data_schema(relationship_info=to_one, required=True) is not shared
+    to_many = RelationshipInfo(resource_type="user-profile", many=True)
+    assert SchemaBuilder.get_shared_relationship_data_schema(relationship_info=to_many, required=False) is not shared
@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.db.models import Q
+
+from django_ninja_jsonapi.data_layers.django_orm.query_building import apply_filters, apply_sorts
+from django_ninja_jsonapi.data_layers.django_orm.search import (
+    ContainsSearchBackend,
+    FullTextSearch,
+    annotate_search_rank,
+    create_fts5_table,
+    get_search_values,
+)
+from django_ninja_jsonapi.exceptions import InvalidSort
+from tests.testapp.models import Computer, Customer
+
+FTS_TABLE = "testapp_computer_fts"
+SEARCH = FullTextSearch(fields=("serial",), fts_table=FTS_TABLE)
+
+
+@pytest.fixture
+def fts_table(db):
+    operation = create_fts5_table(FTS_TABLE, Computer._meta.db_table, ["serial"])
+    with connection.cursor() as cursor:
+        for statement in operation.sql:
+            cursor.execute(statement)
+    yield
+    with connection.cursor() as cursor:
+        for statement in operation.reverse_sql:
+            cursor.execute(statement)
+
+
+def _search(filters, sorts=(), search=SEARCH):
+    queryset = apply_filters(Computer.objects.all(), filters, search)
+    queryset = annotate_search_rank(queryset, search, filters, list(sorts))
+    return list(apply_sorts(queryset, list(sorts)).values_list("serial", flat=True))
+
+
+def test_search_values_are_collected_from_filter_tree():
+    filters = [
+        {"name": "search", "val": "a"},
+        {"or": [{"name": "serial", "op": "search", "val": "b"}, {"not": {"name": "search", "op": "eq", "val": "c"}}]},
+        {"name": "search", "op": "ne", "val": "d"},
+        {"name": "serial", "val": "e"},
+    ]
+
+    assert get_search_values(SEARCH, filters) == ["a", "b", "c"]
+
+
+def test_contains_backend_matches_every_term_in_any_field():
+    backend = ContainsSearchBackend(FullTextSearch(fields=("name", "email")), Customer)
+
+    q = backend.condition("ada lovelace")
+
+    assert q == (Q(name__icontains="ada") | Q(email__icontains="ada")) & (
+        Q(name__icontains="lovelace") | Q(email__icontains="lovelace")
+    )
+    assert backend.condition("  ") == Q()
+    with pytest.raises(ValueError, match="not searchable"):
+        backend.condition("ada", "password")
+
+
+def test_fts5_search_and_rank(fts_table):
+    for serial in ("alpha beta", "beta gamma", "alpha beta beta delta", "omega"):
+        Computer.objects.create(serial=serial)
+    Computer.objects.filter(serial="omega").update(serial="omega beta")
+
+    assert sorted(_search([{"name": "search", "val": "beta"}])) == [
+        "alpha beta",
+        "alpha beta beta delta",
+        "beta gamma",
+        "omega beta",
+    ]
+    assert sorted(_search([{"name": "serial", "op": "search", "val": "alpha beta"}])) == [
+        "alpha beta",
+        "alpha beta beta delta",
+    ]
+    # query syntax is matched literally
+    assert _search([{"name": "search", "val": 'alpha" OR "omega'}]) == []
+    assert _search([{"name": "search", "val": "alpha"}], [{"field": "rank", "order": "desc"}]) == [
+        "alpha beta",
+        "alpha beta beta delta",
+    ]
+
+    Computer.objects.filter(serial="omega beta").delete()
+    assert _search([{"name": "search", "val": "omega"}]) == []
+
+
+@pytest.mark.django_db
+def test_rank_sort_needs_a_search_condition_and_backend_support():
+    with pytest.raises(InvalidSort, match="requires a search filter"):
+        _search([{"name": "serial", "val": "a"}], [{"field": "rank", "order": "desc"}])
+
+    with pytest.raises(InvalidSort, match="not supported by the sqlite backend"):
+        _search(
+            [{"name": "search", "val": "a"}], [{"field": "rank", "order": "desc"}], FullTextSearch(fields=("serial",))
+        )
+
+
+def test_postgres_backend_uses_search_vectors():
+    pytest.importorskip("psycopg")
+    from django.contrib.postgres.search import SearchVectorExact
+
+    from django_ninja_jsonapi.data_layers.django_orm.search import PostgresSearchBackend
+
+    backend = PostgresSearchBackend(FullTextSearch(fields=("serial",), vector_field="search_vector"), Computer)
+    (lookup,) = backend.condition("alpha").children
+
+    assert isinstance(lookup, SearchVectorExact)
+    assert lookup.lhs.name == "search_vector"
@@ -0,0 +1,78 @@
+import pytest
+
+from django_ninja_jsonapi.data_layers.django_orm.query_building import apply_sorts
+from django_ninja_jsonapi.exceptions import InvalidSort
+from django_ninja_jsonapi.querystring import parse_sort_field
+from tests.testapp.models import Computer, Customer, Tag
+
+
+@pytest.mark.parametrize(
+    ("field", "expected"),
+    [
+        ("max:computers.serial", ("max", "computers.serial")),
+        ("computers.count", ("count", "computers")),
+        ("owner.name", (None, "owner.name")),
+        ("count", (None, "count")),
+    ],
+)
+def test_parse_sort_field(field, expected):
+    assert parse_sort_field(field) == expected
+
+
+def test_parse_sort_field_rejects_unknown_aggregates():
+    with pytest.raises(InvalidSort, match="Unknown sort aggregate 'median'"):
+        parse_sort_field("median:computers.serial")
+
+
+@pytest.fixture
+def customers(db):
+    alice = Customer.objects.create(name="Alice", email="alice@example.com")
+    bob = Customer.objects.create(name="Bob", email="bob@example.com")
+    Customer.objects.create(name="Carol", email="carol@example.com")
+    dave = Customer.objects.create(name="Dave", email="dave@example.com")
+    tag = Tag.objects.create(label="work")
+    Computer.objects.create(serial="A-1", owner=alice).tags.add(tag)
+    Computer.objects.create(serial="A-2", owner=alice)
+    Computer.objects.create(serial="D-1", owner=dave)
+    Computer.objects.create(serial="B-9", owner=bob).tags.add(tag)
+
+
+def _names(sorts, model=Customer, field="name") -> list[str]:
+    return list(apply_sorts(model.objects.all(), sorts).values_list(field, flat=True))
+
+
+def test_to_many_aggregates(customers):
+    assert _names([{"field": "computers.count", "order": "desc"}]) == ["Alice", "Bob", "Dave", "Carol"]
+    # customers without computers sort last either way
+    assert _names([{"field": "max:computers.serial", "order": "desc"}]) == ["Dave", "Bob", "Alice", "Carol"]
+    assert _names([{"field": "min:computers.serial", "order": "asc"}]) == ["Alice", "Bob", "Dave", "Carol"]
+    assert _names([{"field": "computers.tags.count", "order": "desc"}]) == ["Alice", "Bob", "Carol", "Dave"]
+
+
+def test_aggregate_sorts_do_not_multiply_rows(customers):
+    queryset = apply_sorts(Customer.objects.all(), [{"field": "computers.count", "order": "desc"}])
+
+    assert len(list(queryset)) == 4
+    assert "GROUP BY" not in str(queryset.query).split("ORDER BY")[0].rsplit(")", 1)[-1]
+
+
+def test_to_one_paths_sort_by_the_joined_column(customers):
+    serials = _names([{"field": "owner.name", "order": "desc"}], Computer, "serial")
+
+    assert serials == ["D-1", "B-9", "A-1", "A-2"]
+
+
+def test_to_many_paths_need_an_aggregate(customers):
+    with pytest.raises(InvalidSort, match="e.g. 'max:computers.serial' or 'computers.count'"):
+        _names([{"field": "computers.serial", "order": "asc"}])
+
+    with pytest.raises(InvalidSort, match="needs a to-many relationship"):
+        _names([{"field": "owner.count", "order": "asc"}], Computer, "serial")
+
+
+def test_primary_key_tiebreaker(db):
+    ordering = apply_sorts(Computer.objects.all(), [{"field": "owner.name", "order": "asc"}]).query.order_by
+    assert ordering == ("owner__name", "pk")
+
+    ordering = apply_sorts(Customer.objects.all(), [{"field": "email", "order": "desc"}]).query.order_by
+    assert ordering == ("-email",)
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from pydantic import BaseModel, field_validator
+
+from django_ninja_jsonapi.views.values_rows import ValuesRowPlan, build_values_row_plan
+from tests.testapp.models import Computer, Customer
+
+
+class CustomerAttributes(BaseModel):
+    name: str
+    email: Optional[str] = None
+
+
+class ValidatedCustomerAttributes(BaseModel):
+    name: str
+
+    @field_validator("name")
+    @classmethod
+    def upper(cls, value: str) -> str:
+        return value.upper()
+
+
+class ComputerAttributes(BaseModel):
+    serial: str
+    owner: Optional[int] = None
+
+
+def test_plan_builds_resource_object_from_row():
+    plan = build_values_row_plan(Customer, CustomerAttributes, ("email",), "id")
+    assert plan == ValuesRowPlan(id_column="id", attributes=(("name", str),), meta_fields=("email",))
+    assert plan.columns == ["id", "name", "email"]
+    assert plan.build({"id": 1, "name": 42, "email": "a@b.com"}, "customer") == {
+        "type": "customer",
+        "attributes": {"name": "42"},
+        "links": {},
+        "meta": {"email": "a@b.com"},
+        "id": "1",
+    }
+
+
+def test_no_plan_for_validators_or_non_column_fields():
+    assert build_values_row_plan(Customer, ValidatedCustomerAttributes, (), "id") is None
+    assert build_values_row_plan(Computer, ComputerAttributes, (), "id") is None